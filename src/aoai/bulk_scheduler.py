@@ -0,0 +1,366 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, Mapping, Optional
+
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+RETRY_AFTER_MS_HEADER = "retry-after-ms"
+RETRY_AFTER_HEADER = "retry-after"
+REMAINING_REQUESTS_HEADER = "x-ratelimit-remaining-requests"
+REMAINING_TOKENS_HEADER = "x-ratelimit-remaining-tokens"
+# Errors raised without a response, by the legacy (openai.error) and current openai clients
+TRANSIENT_ERROR_NAMES = frozenset(
+    (
+        "Timeout",
+        "APITimeoutError",
+        "APIConnectionError",
+        "ServiceUnavailableError",
+        "TryAgain",
+        "TimeoutError",
+        "ConnectionError",
+    )
+)
+
+
+def error_headers(error: Exception) -> Mapping[str, str]:
+    """
+    Returns the response headers attached to an API error, with lowercased names. The legacy openai
+    errors carry them as error.headers, newer clients as error.response.headers.
+
+    Args:
+        error (Exception): The error raised by the request.
+
+    Returns:
+        Mapping[str, str]: The headers, empty if there are none.
+    """
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return {}
+    return {str(name).lower(): str(value) for name, value in dict(headers).items()}
+
+
+def error_status(error: Exception) -> Optional[int]:
+    for attribute in ("http_status", "status_code", "status"):
+        status = getattr(error, attribute, None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Checks whether an error is a 429 (rate limit) response, whatever client library raised it.
+    """
+    return error_status(error) == 429 or any(
+        cls.__name__ == "RateLimitError" for cls in type(error).__mro__
+    )
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Rate limits, timeouts, connection failures and server errors are retried; other errors (e.g. a bad
+    request) are not. Timeouts and connection failures carry no HTTP status, so they are recognized by
+    class name, whatever client library raised them.
+    """
+    status = error_status(error)
+    return (
+        is_rate_limit_error(error)
+        or (status is not None and (status == 408 or status >= 500))
+        or any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+    )
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Reads how long to wait before retrying from retry-after-ms or retry-after (in seconds).
+
+    Args:
+        headers (Mapping[str, str]): The response headers, with lowercased names.
+
+    Returns:
+        float: The delay in seconds, or None if the headers do not say.
+    """
+    for header, scale in ((RETRY_AFTER_MS_HEADER, 0.001), (RETRY_AFTER_HEADER, 1.0)):
+        try:
+            return max(float(headers[header]) * scale, 0.0)
+        except (KeyError, ValueError):
+            continue
+    return None
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket refilled continuously at rate_per_minute. acquire blocks until the
+    requested amount is available, and pause stops all grants until a deadline, e.g. a Retry-After.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initializes a new instance of the TokenBucket class.
+
+        Args:
+            rate_per_minute (float): The refill rate.
+            capacity (float, optional): The largest burst. Defaults to a tenth of the per-minute rate,
+                since Azure OpenAI enforces its per-minute quotas over shorter windows.
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive.")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = (
+            capacity if capacity is not None else max(rate_per_minute / 10, 1.0)
+        )
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - max(self._updated_at, self._paused_until)
+        if elapsed > 0:
+            self._tokens = min(
+                self._tokens + elapsed * self.rate_per_second, self.capacity
+            )
+        self._updated_at = max(now, self._updated_at)
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        Takes amount tokens, waiting for them if needed. An amount above the capacity is granted once the
+        bucket is full and still charged in full: the balance goes negative, and later callers wait until
+        the debt has been refilled, so large requests are paced at the refill rate like any other.
+
+        Args:
+            amount (float, optional): The number of tokens. Defaults to 1.
+
+        Returns:
+            float: The time spent waiting, in seconds.
+        """
+        required = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens >= required:
+                    self._tokens -= amount
+                    return waited
+                else:
+                    delay = (required - self._tokens) / self.rate_per_second
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float):
+        """
+        Grants nothing for the next seconds. Overlapping pauses extend to the latest deadline.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + seconds)
+
+    def sync(self, remaining: float):
+        """
+        Lowers the available tokens to what the service reports as remaining.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, max(remaining, 0.0))
+
+
+class RateLimitedScheduler:
+    """
+    Runs a request function (e.g. one chat completion per transcript) over many inputs concurrently,
+    within a tokens-per-minute and a requests-per-minute quota.
+
+    Every request first takes one request and its estimated tokens from two token buckets. Throttled
+    calls are retried: a Retry-After header pauses both buckets, so every worker backs off together;
+    without one the call waits an exponential backoff with full jitter. Remaining-quota headers lower the
+    buckets to what the service reports. Results are yielded in input order as soon as they are ready,
+    and at most max_in_flight requests (plus as many queued inputs) are held at a time.
+    """
+
+    def __init__(
+        self,
+        request: Callable[[str], str],
+        tokens_per_minute: float,
+        requests_per_minute: float,
+        max_in_flight: int = 16,
+        count_tokens: Optional[Callable[[str], int]] = None,
+        completion_tokens: int = 0,
+        max_retries: int = 6,
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0,
+        is_retryable: Callable[[Exception], bool] = is_retryable_error,
+        cached: Optional[Callable[[str], Optional[str]]] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initializes a new instance of the RateLimitedScheduler class.
+
+        Args:
+            request (Callable[[str], str]): Sends one input and returns its result. Must raise on failure.
+            tokens_per_minute (float): The token quota of the deployment.
+            requests_per_minute (float): The request quota of the deployment.
+            max_in_flight (int, optional): The maximum number of concurrent requests. Defaults to 16.
+            count_tokens (Callable[[str], int], optional): Counts the prompt tokens of an input. Defaults to
+                one token per four characters.
+            completion_tokens (int, optional): The tokens reserved per request for the reply, i.e. its
+                max_tokens, which the service counts against the quota. Defaults to 0.
+            max_retries (int, optional): The retries per input before it is reported as failed. Defaults to 6.
+            backoff_seconds (float, optional): The backoff ceiling of the first retry. Defaults to 1.
+            max_backoff_seconds (float, optional): The largest backoff ceiling. Defaults to 60.
+            is_retryable (Callable[[Exception], bool], optional): Decides which errors are retried. Defaults
+                to rate limits, timeouts and server errors.
+            cached (Callable[[str], Optional[str]], optional): Returns a result without a request, e.g. from a
+                ResponseCache, or None. Cached results take no quota.
+            seed (int, optional): Seeds the backoff jitter, for reproducible runs.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        self.request = request
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.requests = TokenBucket(requests_per_minute)
+        self.max_in_flight = max_in_flight
+        self.count_tokens = count_tokens or (lambda text: len(text) // 4 + 1)
+        self.completion_tokens = completion_tokens
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.is_retryable = is_retryable
+        self.cached = cached
+        self._random = random.Random(seed)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "cached": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "throttled": 0,
+            "retries": 0,
+            "tokens": 0,
+            "wait_seconds": 0.0,
+        }
+
+    def _count(self, name: str, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(self.backoff_seconds * 2**attempt, self.max_backoff_seconds)
+        with self._stats_lock:
+            return self._random.uniform(0, ceiling)
+
+    def _adjust(self, headers: Mapping[str, str]):
+        """
+        Applies the rate-limit headers of a throttled response to the buckets.
+        """
+        for header, bucket in (
+            (REMAINING_TOKENS_HEADER, self.tokens),
+            (REMAINING_REQUESTS_HEADER, self.requests),
+        ):
+            try:
+                bucket.sync(float(headers[header]))
+            except (KeyError, ValueError):
+                continue
+
+    def run_one(self, index: int, item: str) -> dict:
+        """
+        Sends one input, retrying throttled and transient failures, and returns its result record.
+
+        Args:
+            index (int): The position of the input.
+            item (str): The input.
+
+        Returns:
+            dict: The index, status ("ok" or "error"), result or error, whether it was cached, the attempts
+            and the elapsed time.
+        """
+        start_time = time.perf_counter()
+        record = {"index": index, "cached": False}
+        if self.cached is not None:
+            result = self.cached(item)
+            if result is not None:
+                self._count("cached")
+                record.update(status="ok", result=result, attempts=0, cached=True)
+                record["elapsed_seconds"] = round(time.perf_counter() - start_time, 6)
+                return record
+
+        tokens = self.count_tokens(item) + self.completion_tokens
+        attempt = 0
+        while True:
+            waited = self.requests.acquire() + self.tokens.acquire(tokens)
+            self._count("wait_seconds", waited)
+            self._count("requests")
+            self._count("tokens", tokens)
+            try:
+                result = self.request(item)
+                self._count("succeeded")
+                record.update(status="ok", result=result, attempts=attempt + 1)
+                break
+            except Exception as e:
+                if attempt >= self.max_retries or not self.is_retryable(e):
+                    logger.error(
+                        f"Request {index} failed after {attempt + 1} attempts: {e}"
+                    )
+                    self._count("failed")
+                    record.update(status="error", error=str(e), attempts=attempt + 1)
+                    break
+                headers = error_headers(e)
+                self._adjust(headers)
+                delay = retry_after_seconds(headers)
+                if is_rate_limit_error(e):
+                    self._count("throttled")
+                if delay is not None:
+                    # The quota is shared, so every worker waits
+                    self.requests.pause(delay)
+                    self.tokens.pause(delay)
+                else:
+                    delay = self._backoff(attempt)
+                    time.sleep(delay)
+                logger.warning(
+                    f"Request {index} throttled or failed ({e}), retrying in {delay:.2f}s."
+                )
+                self._count("retries")
+                attempt += 1
+        record["elapsed_seconds"] = round(time.perf_counter() - start_time, 6)
+        return record
+
+    def map(self, items: Iterable[str]) -> Iterator[dict]:
+        """
+        Runs the request over all inputs, yielding their result records in input order.
+
+        Args:
+            items (Iterable[str]): The inputs. Consumed lazily.
+
+        Yields:
+            dict: The result record of each input, see run_one.
+        """
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for index, item in enumerate(items):
+                if len(pending) >= 2 * self.max_in_flight:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(self.run_one, index, item))
+            while pending:
+                yield pending.popleft().result()
+
+    def get_stats(self) -> dict:
+        """
+        Reports the requests sent, cached, succeeded, failed, throttled and retried, the tokens reserved
+        and the time spent waiting for quota.
+
+        Returns:
+            dict: The scheduler statistics.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        return stats
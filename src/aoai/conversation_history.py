@@ -0,0 +1,238 @@
+import math
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+# Tokens added by the chat format around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+
+
+def get_token_counter(model: str = "gpt-4") -> Callable[[str], int]:
+    """
+    Returns a function that counts the tokens of a text for the given model. Uses tiktoken when it is
+    installed, otherwise an estimate of one token per four characters.
+
+    Args:
+        model (str, optional): The model name used to select the tokenizer. Defaults to "gpt-4".
+
+    Returns:
+        Callable[[str], int]: The token counter.
+    """
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text))
+    except ImportError:
+        logger.info("tiktoken is not installed, estimating token counts.")
+        return lambda text: math.ceil(len(text) / 4)
+
+
+def truncate_summary(previous_summary: str, turns: List[dict]) -> str:
+    """
+    The default summarizer: appends the folded turns to the previous summary as plain text. The
+    ConversationHistory trims the result to its summary budget, keeping the most recent part.
+
+    Args:
+        previous_summary (str): The current rolling summary.
+        turns (List[dict]): The messages being folded into the summary.
+
+    Returns:
+        str: The new summary.
+    """
+    lines = [f"{message['role']}: {message['content']}" for message in turns]
+    return " ".join(filter(None, [previous_summary] + lines))
+
+
+class ConversationHistory:
+    """
+    A conversation history that keeps the prompt sent to the chat model within a fixed token budget.
+
+    The most recent turns are kept verbatim in a sliding window. When the window grows past the budget,
+    the oldest turns are folded into a rolling summary, which is sent as a system message ahead of the
+    window. Token counts are computed once per message when it is added, so building a request costs
+    no tokenization, and the prompt size stays flat however long the conversation runs.
+
+    It can be passed anywhere AzureOpenAIAssistant accepts a conversation_history list.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 2000,
+        max_turns: Optional[int] = None,
+        summary_max_tokens: int = 300,
+        summarizer: Optional[Callable[[str, List[dict]], Optional[str]]] = None,
+        model: str = "gpt-4",
+        fold_ratio: float = 0.75,
+    ):
+        """
+        Initializes a new instance of the ConversationHistory class.
+
+        Args:
+            max_tokens (int, optional): The token budget of the verbatim window. Defaults to 2000.
+            max_turns (int, optional): The maximum number of turns in the window. Unbounded if None.
+            summary_max_tokens (int, optional): The token budget of the rolling summary. Defaults to 300.
+            summarizer (Callable[[str, List[dict]], str], optional): Folds messages into the previous summary,
+                e.g. AzureOpenAIAssistant.summarize_conversation. Defaults to truncate_summary.
+            model (str, optional): The model name used to select the tokenizer. Defaults to "gpt-4".
+            fold_ratio (float, optional): When the window overflows, the oldest turns are folded until it
+                is below this fraction of the budget, so the summarizer runs every few turns rather than on
+                every turn. Defaults to 0.75.
+        """
+        self.max_tokens = max_tokens
+        self.max_turns = max_turns
+        self.summary_max_tokens = summary_max_tokens
+        self.summarizer = summarizer or truncate_summary
+        self.fold_ratio = fold_ratio
+        self.count_tokens = get_token_counter(model)
+
+        # Each turn is (user message, assistant message, token count)
+        self._turns: Deque[Tuple[dict, dict, int]] = deque()
+        self._window_tokens = 0
+        self.summary = ""
+        self._summary_tokens = 0
+        self._stats = {"turns": 0, "folded_turns": 0, "summarizations": 0}
+
+    def _message_tokens(self, message: dict) -> int:
+        return self.count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+    def add_turn(self, prompt: str, response: str):
+        """
+        Appends a prompt and its reply, folding the oldest turns into the summary if the window overflows.
+
+        Args:
+            prompt (str): The user prompt.
+            response (str): The assistant reply.
+        """
+        user_message = {"role": "user", "content": prompt}
+        assistant_message = {"role": "assistant", "content": response}
+        tokens = self._message_tokens(user_message) + self._message_tokens(
+            assistant_message
+        )
+        self._turns.append((user_message, assistant_message, tokens))
+        self._window_tokens += tokens
+        self._stats["turns"] += 1
+
+        if self._window_tokens > self.max_tokens or (
+            self.max_turns is not None and len(self._turns) > self.max_turns
+        ):
+            self._fold()
+
+    def _fold(self):
+        """
+        Moves the oldest turns out of the window and into the rolling summary.
+        """
+        target_tokens = self.max_tokens * self.fold_ratio
+        target_turns = (
+            max(int(self.max_turns * self.fold_ratio), 1)
+            if self.max_turns is not None
+            else None
+        )
+        folded: List[dict] = []
+        while len(self._turns) > 1 and (
+            self._window_tokens > target_tokens
+            or (target_turns is not None and len(self._turns) > target_turns)
+        ):
+            user_message, assistant_message, tokens = self._turns.popleft()
+            self._window_tokens -= tokens
+            folded.extend([user_message, assistant_message])
+        if not folded:
+            return
+
+        summary = self.summarizer(self.summary, folded)
+        if summary is None:
+            logger.warning("Summarization failed, falling back to truncation.")
+            summary = truncate_summary(self.summary, folded)
+        self.summary = self._trim_to_budget(summary, self.summary_max_tokens)
+        self._summary_tokens = self.count_tokens(self.summary)
+        self._stats["folded_turns"] += len(folded) // 2
+        self._stats["summarizations"] += 1
+        logger.info(
+            f"Folded {len(folded) // 2} turns into the summary ({self._summary_tokens} tokens), "
+            f"{len(self._turns)} turns ({self._window_tokens} tokens) kept verbatim."
+        )
+
+    def _trim_to_budget(self, text: str, max_tokens: int) -> str:
+        """
+        Keeps the end of a text so that it fits in max_tokens.
+        """
+        if self.count_tokens(text) <= max_tokens:
+            return text
+        words = text.split()
+        low, high = 0, len(words)
+        # Binary search for the longest suffix of words that fits
+        while low < high:
+            middle = (low + high) // 2
+            if self.count_tokens(" ".join(words[middle:])) <= max_tokens:
+                high = middle
+            else:
+                low = middle + 1
+        return " ".join(words[low:])
+
+    @property
+    def messages(self) -> List[dict]:
+        """
+        The history as chat messages: the summary (if any) followed by the verbatim window.
+        """
+        messages = []
+        if self.summary:
+            messages.append(
+                {"role": "system", "content": SUMMARY_PREFIX + self.summary}
+            )
+        for user_message, assistant_message, _ in self._turns:
+            messages.extend([user_message, assistant_message])
+        return messages
+
+    def build_messages(
+        self, system_message_content: str, latest_prompt: str
+    ) -> List[dict]:
+        """
+        Builds the messages for a chat completion request.
+
+        Args:
+            system_message_content (str): The content of the system message.
+            latest_prompt (str): The latest user prompt.
+
+        Returns:
+            List[dict]: The system message, the history and the latest prompt.
+        """
+        return (
+            [{"role": "system", "content": system_message_content}]
+            + self.messages
+            + [{"role": "user", "content": latest_prompt}]
+        )
+
+    @property
+    def token_count(self) -> int:
+        """
+        The number of tokens the history adds to a request.
+        """
+        summary_tokens = (
+            self._summary_tokens + MESSAGE_OVERHEAD_TOKENS if self.summary else 0
+        )
+        return self._window_tokens + summary_tokens
+
+    def get_stats(self) -> dict:
+        """
+        Reports the number of turns seen, kept and folded, and the current token counts.
+
+        Returns:
+            dict: The history statistics.
+        """
+        return dict(
+            self._stats,
+            window_turns=len(self._turns),
+            window_tokens=self._window_tokens,
+            summary_tokens=self._summary_tokens,
+            history_tokens=self.token_count,
+        )
+
+    def __len__(self) -> int:
+        return len(self._turns)
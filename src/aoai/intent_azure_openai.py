@@ -1,10 +1,18 @@
 import argparse
 import os
-from typing import List, Optional
+import time
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Union
 
 import openai
 from dotenv import load_dotenv
 
+from src.aoai.bulk_scheduler import RateLimitedScheduler
+from src.aoai.conversation_history import (
+    MESSAGE_OVERHEAD_TOKENS,
+    ConversationHistory,
+    get_token_counter,
+)
+from src.aoai.response_cache import ResponseCache
 from src.speech.speech_to_text import SpeechTranscriber
 from utils.ml_logging import get_logger
 
@@ -16,9 +24,26 @@ logger = get_logger()
 
 speech_transcriber = SpeechTranscriber()
 
+SUMMARY_AND_INTENT_SYSTEM_MESSAGE = (
+    "As an AI assistant, you will perform two actions on the following text. "
+    "First, you should provide a concise, professional summary. "
+    "Second, you should analyze and clearly state the primary intent of the text. in this format: \n\n"
+    "---\n\n"
+    "Summary and Intent Classification:"
+)
+
 
 class AzureOpenAIAssistant:
-    def __init__(self):
+    def __init__(self, response_cache: Optional[ResponseCache] = None):
+        """
+        Initializes a new instance of the AzureOpenAIAssistant class.
+
+        Args:
+            response_cache (ResponseCache, optional): A cache of summarize_and_classify_intent responses,
+                keyed by the normalized text and the request settings. No caching if None.
+        """
+        self.response_cache = response_cache
+
         # Load environment variables
         self.speech_key = os.getenv("SPEECH_KEY")
         self.speech_region = os.getenv("SPEECH_REGION")
@@ -90,7 +115,7 @@ class AzureOpenAIAssistant:
 
     def generate_text_with_contextual_history(
         self,
-        conversation_history: List[dict],
+        conversation_history: Union[List[dict], ConversationHistory],
         latest_prompt: str,
         system_message_content: str = "You are an AI assistant that helps people find information. Please be very precise, polite, and concise.",
         temperature: float = 0.7,
@@ -101,7 +126,8 @@ class AzureOpenAIAssistant:
         Generates a text response using Foundation models from OpenAI, considering the conversation history as context and focusing on the latest prompt.
 
         Args:
-            conversation_history (List[dict]): A list of message dictionaries representing the conversation history.
+            conversation_history (Union[List[dict], ConversationHistory]): A list of message dictionaries representing
+                the conversation history, or a token-budgeted ConversationHistory.
             latest_prompt (str): The latest prompt to generate a response for.
             system_message_content (str, optional): The content of the system message. Defaults to "You are an AI assistant that helps people find information. Please be very precise, polite, and concise."
             temperature (float, optional): Controls randomness in the output. Defaults to 0.7.
@@ -111,16 +137,9 @@ class AzureOpenAIAssistant:
             Optional[str]: The generated text response or None if an error occurs.
         """
         try:
-            system_message = {
-                "role": "system",
-                "content": system_message_content,
-            }
-            if not conversation_history or conversation_history[0] != system_message:
-                conversation_history.insert(0, system_message)
-
-            messages_for_api = conversation_history + [
-                {"role": "user", "content": latest_prompt}
-            ]
+            messages_for_api = self._build_chat_messages(
+                conversation_history, latest_prompt, system_message_content
+            )
             logger.info(f"Sending request to OpenAI with prompt: {latest_prompt}")
 
             response = openai.ChatCompletion.create(
@@ -134,14 +153,427 @@ class AzureOpenAIAssistant:
             response_content = response["choices"][0]["message"]["content"]
             logger.info(f"Received response from OpenAI: {response_content}")
 
-            conversation_history.append({"role": "user", "content": latest_prompt})
-            conversation_history.append({"role": "system", "content": response_content})
+            self._append_turn(conversation_history, latest_prompt, response_content)
 
             return response_content
         except Exception as e:
             logger.error(f"Failed to generate text with contextual history: {e}")
             return None
 
+    def generate_text_completion_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.5,
+        max_tokens: int = 100,
+        deployment_completion_name: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Streaming version of generate_text_completion: yields the generated text as it arrives.
+
+        Args:
+            prompt (str): The input text prompt for the model.
+            temperature (float, optional): Controls randomness in the output. Default to 0.5.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 100.
+            deployment_completion_name (str, optional): The name of the AI model deployment to use.
+
+        Yields:
+            str: The text deltas, in order. The stream ends early if an error occurs.
+        """
+        start_time = time.perf_counter()
+        first_token_seconds = None
+        try:
+            completion = openai.Completion.create(
+                prompt=prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                engine=deployment_completion_name or self.deployment_completion_name,
+                stream=True,
+            )
+            for chunk in completion:
+                delta = self._completion_chunk_delta(chunk)
+                if delta:
+                    if first_token_seconds is None:
+                        first_token_seconds = time.perf_counter() - start_time
+                        logger.info(f"First token after {first_token_seconds:.3f}s.")
+                    yield delta
+        except Exception as e:
+            logger.error(f"Failed to stream text completion: {e}")
+
+    async def generate_text_completion_stream_async(
+        self,
+        prompt: str,
+        temperature: float = 0.5,
+        max_tokens: int = 100,
+        deployment_completion_name: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronous version of generate_text_completion_stream, for use in an event loop.
+
+        Args:
+            prompt (str): The input text prompt for the model.
+            temperature (float, optional): Controls randomness in the output. Default to 0.5.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 100.
+            deployment_completion_name (str, optional): The name of the AI model deployment to use.
+
+        Yields:
+            str: The text deltas, in order. The stream ends early if an error occurs.
+        """
+        start_time = time.perf_counter()
+        first_token_seconds = None
+        try:
+            completion = await openai.Completion.acreate(
+                prompt=prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                engine=deployment_completion_name or self.deployment_completion_name,
+                stream=True,
+            )
+            async for chunk in completion:
+                delta = self._completion_chunk_delta(chunk)
+                if delta:
+                    if first_token_seconds is None:
+                        first_token_seconds = time.perf_counter() - start_time
+                        logger.info(f"First token after {first_token_seconds:.3f}s.")
+                    yield delta
+        except Exception as e:
+            logger.error(f"Failed to stream text completion: {e}")
+
+    def generate_text_with_contextual_history_stream(
+        self,
+        conversation_history: Union[List[dict], ConversationHistory],
+        latest_prompt: str,
+        system_message_content: str = (
+            "You are an AI assistant that helps people find information. "
+            "Please be very precise, polite, and concise."
+        ),
+        temperature: float = 0.7,
+        max_tokens: int = 150,
+        seed: int = 42,
+    ) -> Iterator[str]:
+        """
+        Streaming version of generate_text_with_contextual_history: yields the reply as deltas while it is
+        generated, so consumers such as text-to-speech can start before the reply is complete. Once the
+        stream ends, the prompt and the assembled reply are appended to the conversation history.
+
+        Args:
+            conversation_history (Union[List[dict], ConversationHistory]): A list of message dictionaries representing
+                the conversation history, or a token-budgeted ConversationHistory.
+            latest_prompt (str): The latest prompt to generate a response for.
+            system_message_content (str, optional): The content of the system message.
+            temperature (float, optional): Controls randomness in the output. Defaults to 0.7.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 150.
+            seed (int, optional): A random seed for deterministic output. Defaults to 42.
+
+        Yields:
+            str: The reply deltas, in order. The stream ends early if an error occurs, and nothing is
+            appended to the history in that case.
+        """
+        start_time = time.perf_counter()
+        first_token_seconds = None
+        deltas = []
+        try:
+            messages_for_api = self._build_chat_messages(
+                conversation_history, latest_prompt, system_message_content
+            )
+            logger.info(
+                f"Sending streaming request to OpenAI with prompt: {latest_prompt}"
+            )
+
+            response = openai.ChatCompletion.create(
+                engine=self.deployment_chat_name,
+                messages=messages_for_api,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                seed=seed,
+                stream=True,
+            )
+            for chunk in response:
+                delta = self._chat_chunk_delta(chunk)
+                if delta:
+                    if first_token_seconds is None:
+                        first_token_seconds = time.perf_counter() - start_time
+                        logger.info(f"First token after {first_token_seconds:.3f}s.")
+                    deltas.append(delta)
+                    yield delta
+        except Exception as e:
+            logger.error(f"Failed to stream text with contextual history: {e}")
+            return
+
+        response_content = "".join(deltas)
+        logger.info(
+            f"Received streamed response from OpenAI in {time.perf_counter() - start_time:.3f}s: {response_content}"
+        )
+        self._append_turn(conversation_history, latest_prompt, response_content)
+
+    async def generate_text_with_contextual_history_stream_async(
+        self,
+        conversation_history: Union[List[dict], ConversationHistory],
+        latest_prompt: str,
+        system_message_content: str = (
+            "You are an AI assistant that helps people find information. "
+            "Please be very precise, polite, and concise."
+        ),
+        temperature: float = 0.7,
+        max_tokens: int = 150,
+        seed: int = 42,
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronous version of generate_text_with_contextual_history_stream, for use in an event loop.
+
+        Args:
+            conversation_history (Union[List[dict], ConversationHistory]): A list of message dictionaries representing
+                the conversation history, or a token-budgeted ConversationHistory.
+            latest_prompt (str): The latest prompt to generate a response for.
+            system_message_content (str, optional): The content of the system message.
+            temperature (float, optional): Controls randomness in the output. Defaults to 0.7.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 150.
+            seed (int, optional): A random seed for deterministic output. Defaults to 42.
+
+        Yields:
+            str: The reply deltas, in order. The stream ends early if an error occurs, and nothing is
+            appended to the history in that case.
+        """
+        start_time = time.perf_counter()
+        first_token_seconds = None
+        deltas = []
+        try:
+            messages_for_api = self._build_chat_messages(
+                conversation_history, latest_prompt, system_message_content
+            )
+            logger.info(
+                f"Sending streaming request to OpenAI with prompt: {latest_prompt}"
+            )
+
+            response = await openai.ChatCompletion.acreate(
+                engine=self.deployment_chat_name,
+                messages=messages_for_api,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                seed=seed,
+                stream=True,
+            )
+            async for chunk in response:
+                delta = self._chat_chunk_delta(chunk)
+                if delta:
+                    if first_token_seconds is None:
+                        first_token_seconds = time.perf_counter() - start_time
+                        logger.info(f"First token after {first_token_seconds:.3f}s.")
+                    deltas.append(delta)
+                    yield delta
+        except Exception as e:
+            logger.error(f"Failed to stream text with contextual history: {e}")
+            return
+
+        response_content = "".join(deltas)
+        logger.info(
+            f"Received streamed response from OpenAI in {time.perf_counter() - start_time:.3f}s: {response_content}"
+        )
+        self._append_turn(conversation_history, latest_prompt, response_content)
+
+    @staticmethod
+    def _build_chat_messages(
+        conversation_history: Union[List[dict], ConversationHistory],
+        latest_prompt: str,
+        system_message_content: str,
+    ) -> List[dict]:
+        """
+        Ensures the conversation history starts with the system message and returns the messages to send,
+        ending with the latest prompt.
+
+        Args:
+            conversation_history (Union[List[dict], ConversationHistory]): The conversation history. A list is updated
+                in place.
+            latest_prompt (str): The latest prompt.
+            system_message_content (str): The content of the system message.
+
+        Returns:
+            List[dict]: The messages for the chat completion request.
+        """
+        if isinstance(conversation_history, ConversationHistory):
+            return conversation_history.build_messages(
+                system_message_content, latest_prompt
+            )
+
+        system_message = {
+            "role": "system",
+            "content": system_message_content,
+        }
+        if not conversation_history or conversation_history[0] != system_message:
+            conversation_history.insert(0, system_message)
+
+        return conversation_history + [{"role": "user", "content": latest_prompt}]
+
+    @staticmethod
+    def _append_turn(
+        conversation_history: Union[List[dict], ConversationHistory],
+        latest_prompt: str,
+        response_content: str,
+    ):
+        """
+        Appends a prompt and its reply to the conversation history.
+
+        Args:
+            conversation_history (Union[List[dict], ConversationHistory]): The conversation history.
+            latest_prompt (str): The prompt.
+            response_content (str): The reply.
+        """
+        if isinstance(conversation_history, ConversationHistory):
+            conversation_history.add_turn(latest_prompt, response_content)
+            return
+        conversation_history.append({"role": "user", "content": latest_prompt})
+        conversation_history.append({"role": "system", "content": response_content})
+
+    @staticmethod
+    def _completion_chunk_delta(chunk) -> Optional[str]:
+        """
+        Extracts the text delta from a streamed text completion chunk, warning if the content was filtered.
+
+        Args:
+            chunk: A streamed text completion chunk.
+
+        Returns:
+            Optional[str]: The text delta, or None if the chunk carries no text.
+        """
+        if not chunk["choices"]:
+            return None
+        choice = chunk["choices"][0]
+        if choice.get("finish_reason") == "content_filter":
+            logger.warning("The generated content is filtered.")
+        return choice.get("text")
+
+    @staticmethod
+    def _chat_chunk_delta(chunk) -> Optional[str]:
+        """
+        Extracts the content delta from a streamed chat completion chunk.
+
+        Args:
+            chunk: A streamed chat completion chunk.
+
+        Returns:
+            Optional[str]: The content delta, or None if the chunk carries no content.
+        """
+        if not chunk["choices"]:
+            return None
+        return chunk["choices"][0].get("delta", {}).get("content")
+
+    def summarize_conversation(
+        self,
+        previous_summary: str,
+        messages: List[dict],
+        max_tokens: int = 200,
+    ) -> Optional[str]:
+        """
+        Folds conversation turns into a rolling summary. Meant to be used as the summarizer of a
+        ConversationHistory.
+
+        Args:
+            previous_summary (str): The current summary, possibly empty.
+            messages (List[dict]): The messages to fold into the summary.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 200.
+
+        Returns:
+            Optional[str]: The updated summary or None if an error occurs.
+        """
+        transcript = "\n".join(
+            f"{message['role']}: {message['content']}" for message in messages
+        )
+        try:
+            response = openai.ChatCompletion.create(
+                engine=self.deployment_chat_name,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "Update the summary of a conversation with the new turns below. Keep names, "
+                            "numbers, decisions and open questions. Reply with the updated summary only."
+                        ),
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Summary so far: {previous_summary or '(none)'}\n\nNew turns:\n{transcript}",
+                    },
+                ],
+                temperature=0,
+                max_tokens=max_tokens,
+            )
+            return response["choices"][0]["message"]["content"]
+        except Exception as e:
+            logger.error(f"Failed to summarize the conversation: {e}")
+            return None
+
+    def _summary_cache_key(
+        self, text: str, temperature: float, max_tokens: int, seed: int
+    ) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        return self.response_cache.make_key(
+            text,
+            SUMMARY_AND_INTENT_SYSTEM_MESSAGE,
+            self.deployment_chat_name,
+            temperature,
+            seed,
+            max_tokens,
+        )
+
+    def cached_summary_and_intent(
+        self,
+        text: str,
+        temperature: float = 0.7,
+        max_tokens: int = 300,
+        seed: int = 42,
+    ) -> Optional[str]:
+        """
+        Returns the cached summary and intent classification of a text, if the response cache holds one.
+
+        Args:
+            text (str): The text to be summarized and classified.
+            temperature (float, optional): Controls randomness in the output. Defaults to 0.7.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 300.
+            seed (int, optional): A random seed for deterministic output. Defaults to 42.
+
+        Returns:
+            Optional[str]: The cached response, or None if there is no cache or no entry.
+        """
+        cache_key = self._summary_cache_key(text, temperature, max_tokens, seed)
+        if cache_key is None:
+            return None
+        return self.response_cache.get(cache_key)
+
+    def request_summary_and_intent(
+        self,
+        text: str,
+        temperature: float = 0.7,
+        max_tokens: int = 300,
+        seed: int = 42,
+    ) -> str:
+        """
+        Sends one summarization and intent classification request and caches the response. Unlike
+        summarize_and_classify_intent, errors (e.g. rate limits) are raised, so callers can retry them.
+
+        Args:
+            text (str): The text to be summarized and classified.
+            temperature (float, optional): Controls randomness in the output. Defaults to 0.7.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 300.
+            seed (int, optional): A random seed for deterministic output. Defaults to 42.
+
+        Returns:
+            str: The summary and intent classification.
+        """
+        response = openai.ChatCompletion.create(
+            engine=self.deployment_chat_name,
+            messages=self._build_chat_messages(
+                [], text, SUMMARY_AND_INTENT_SYSTEM_MESSAGE
+            ),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            seed=seed,
+        )
+        response_content = response["choices"][0]["message"]["content"]
+        cache_key = self._summary_cache_key(text, temperature, max_tokens, seed)
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response_content)
+        return response_content
+
     def summarize_and_classify_intent(
         self,
         text: str,
@@ -154,43 +586,87 @@ class AzureOpenAIAssistant:
 
         Args:
             text (str): The text to be summarized and classified.
-            conversation_history (List[Dict[str, str]]): The conversation history.
-            system_message_content (str): The system message content.
             temperature (float, optional): Controls randomness in the output. Defaults to 0.7.
             max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 300.
-            seed (int, optional): A random seed for deterministic output. Defaults to None.
+            seed (int, optional): A random seed for deterministic output. Defaults to 42.
 
         Returns:
             Optional[str]: The summary and intent classification or None if an error occurs.
         """
         try:
-            system_message_content = (
-                "As an AI assistant, you will perform two actions on the following text. "
-                "First, you should provide a concise, professional summary. "
-                "Second, you should analyze and clearly state the primary intent of the text. in this format: \n\n"
-                "---\n\n"
-                "Summary and Intent Classification:"
-            )
-
-            response = self.generate_text_with_contextual_history(
-                conversation_history=[],
-                latest_prompt=text,
-                system_message_content=system_message_content,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                seed=seed,
+            cached_response = self.cached_summary_and_intent(
+                text, temperature, max_tokens, seed
+            )
+            if cached_response is not None:
+                logger.info(
+                    "Summarization and intent classification served from cache."
+                )
+                return cached_response
+
+            logger.info(f"Sending request to OpenAI with prompt: {text}")
+            response = self.request_summary_and_intent(
+                text, temperature, max_tokens, seed
             )
-
             logger.info(
                 f"Summarization and intent classification successful. Response: {response}"
             )
-
             return response
 
         except Exception as e:
             logger.error(f"Failed to generate text completion with GPT-4: {e}")
             return None
 
+    def summarize_and_classify_intent_bulk(
+        self,
+        texts: Iterable[str],
+        tokens_per_minute: float,
+        requests_per_minute: float,
+        max_in_flight: int = 16,
+        temperature: float = 0.7,
+        max_tokens: int = 300,
+        seed: int = 42,
+        max_retries: int = 6,
+    ) -> Iterator[dict]:
+        """
+        Summarizes and classifies many texts concurrently within the deployment quota. Requests are paced
+        by token buckets sized from the tokens-per-minute and requests-per-minute quotas, and throttled
+        requests are retried after their Retry-After delay or a jittered backoff. Cached texts take no quota.
+
+        Args:
+            texts (Iterable[str]): The texts, e.g. a day of transcripts. Consumed lazily.
+            tokens_per_minute (float): The token quota of the chat deployment.
+            requests_per_minute (float): The request quota of the chat deployment.
+            max_in_flight (int, optional): The maximum number of concurrent requests. Defaults to 16.
+            temperature (float, optional): Controls randomness in the output. Defaults to 0.7.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 300.
+            seed (int, optional): A random seed for deterministic output. Defaults to 42.
+            max_retries (int, optional): The retries per text before it is reported as failed. Defaults to 6.
+
+        Yields:
+            dict: One record per text, in input order: index, status ("ok" or "error"), result or error,
+            attempts and elapsed_seconds.
+        """
+        count_tokens = get_token_counter()
+        system_tokens = count_tokens(SUMMARY_AND_INTENT_SYSTEM_MESSAGE)
+        scheduler = RateLimitedScheduler(
+            lambda text: self.request_summary_and_intent(
+                text, temperature, max_tokens, seed
+            ),
+            tokens_per_minute=tokens_per_minute,
+            requests_per_minute=requests_per_minute,
+            max_in_flight=max_in_flight,
+            count_tokens=lambda text: system_tokens
+            + count_tokens(text)
+            + 2 * MESSAGE_OVERHEAD_TOKENS,
+            completion_tokens=max_tokens,
+            max_retries=max_retries,
+            cached=lambda text: self.cached_summary_and_intent(
+                text, temperature, max_tokens, seed
+            ),
+        )
+        yield from scheduler.map(texts)
+        logger.info(f"Bulk summarization finished: {scheduler.get_stats()}")
+
 
 def transcribe_summarize_and_gather_intent_from_audio_file() -> Optional[str]:
     """
@@ -199,12 +675,21 @@ def transcribe_summarize_and_gather_intent_from_audio_file() -> Optional[str]:
     Returns:
         str: The response from the assistant, or None if the operation failed.
     """
-    assistant = AzureOpenAIAssistant()
     parser = argparse.ArgumentParser(
         description="Transcribe speech from an audio file and analyze it."
     )
     parser.add_argument("--file", required=True, help="The path to the audio file.")
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="A directory for caching summaries across runs, keyed by the normalized transcript.",
+    )
     args = parser.parse_args()
+    assistant = AzureOpenAIAssistant(
+        response_cache=(
+            ResponseCache(cache_directory=args.cache_dir) if args.cache_dir else None
+        )
+    )
 
     transcription = speech_transcriber.transcribe_speech_from_blob_continuous(
         file_name=args.file, key=assistant.speech_key, region=assistant.speech_region
@@ -0,0 +1,142 @@
+import re
+import threading
+import time
+from typing import Optional
+
+from utils.cache import TieredCache, make_cache_key
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    Normalizes a prompt for cache lookups: lowercased, punctuation removed and whitespace collapsed, so
+    transcripts that differ only in those respects share an entry.
+
+    Args:
+        text (str): The prompt, e.g. a transcript.
+
+    Returns:
+        str: The normalized text.
+    """
+    return " ".join(PUNCTUATION.sub(" ", text.lower()).split())
+
+
+class ResponseCache:
+    """
+    A cache of chat completion responses keyed by the normalized prompt and every setting that changes
+    the response: the system prompt, model, temperature, seed and max_tokens. Entries expire after
+    ttl_seconds and are kept in an in-memory LRU and, optionally, in a size-bounded directory shared
+    by all processes pointing at it.
+
+    Only use it for requests that pass a fixed seed, where the same prompt is expected to produce the
+    same response.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[TieredCache] = None,
+        cache_directory: Optional[str] = None,
+        ttl_seconds: Optional[float] = 24 * 3600,
+        memory_items: int = 4096,
+        disk_bytes: int = 64 * 1024 * 1024,
+    ):
+        """
+        Initializes a new instance of the ResponseCache class.
+
+        Args:
+            cache (TieredCache, optional): The cache to use. Defaults to a new TieredCache built from the arguments below.
+            cache_directory (str, optional): The directory of the disk tier. Memory only if None.
+            ttl_seconds (float, optional): How long a response is served from the cache. Never expires if None.
+                Defaults to one day.
+            memory_items (int, optional): The number of responses kept in memory. Defaults to 4096.
+            disk_bytes (int, optional): The size budget of the disk tier. Defaults to 64 MiB.
+        """
+        self.cache = cache or TieredCache(
+            memory_items=memory_items,
+            disk_directory=cache_directory,
+            disk_bytes=disk_bytes,
+        )
+        self.ttl_seconds = ttl_seconds
+        self._expired = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        text: str,
+        system_prompt: str,
+        model: Optional[str],
+        temperature: float,
+        seed: Optional[int],
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        Builds the cache key of a request.
+
+        Args:
+            text (str): The user prompt. Normalized with normalize_prompt.
+            system_prompt (str): The system message content.
+            model (str, optional): The model or deployment name.
+            temperature (float): The sampling temperature.
+            seed (int, optional): The sampling seed.
+            max_tokens (int, optional): The maximum number of generated tokens.
+
+        Returns:
+            str: The cache key.
+        """
+        return make_cache_key(
+            normalize_prompt(text), system_prompt, model, temperature, seed, max_tokens
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Looks a response up, dropping it if it has expired.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            str: The cached response, or None on a miss.
+        """
+        value = self.cache.get(key)
+        if value is None:
+            return None
+        created_at, _, response = value.partition(b"\n")
+        if (
+            self.ttl_seconds is not None
+            and time.time() - float(created_at) > self.ttl_seconds
+        ):
+            self.cache.delete(key)
+            with self._lock:
+                self._expired += 1
+            return None
+        return response.decode("utf-8")
+
+    def set(self, key: str, response: str):
+        """
+        Stores a response.
+
+        Args:
+            key (str): The cache key.
+            response (str): The response content.
+        """
+        self.cache.set(key, f"{time.time():.3f}\n{response}".encode("utf-8"))
+
+    def clear(self):
+        self.cache.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Reports the cache statistics. Expired entries are counted as hits by the tiers and reported
+        separately under "expired".
+
+        Returns:
+            dict: The cache statistics.
+        """
+        stats = self.cache.get_stats()
+        with self._lock:
+            stats["expired"] = self._expired
+        return stats
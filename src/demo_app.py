@@ -1,27 +1,42 @@
 import os
 import time
 
+from src.aoai.conversation_history import ConversationHistory
 from src.aoai.intent_azure_openai import AzureOpenAIAssistant
 from src.speech.speech_recognizer import SpeechRecognizer
-from src.speech.text_to_speech import SpeechSynthesizer
+from src.speech.text_to_speech import SentenceSpeechPipeline, SpeechSynthesizer
+from utils.cache import TieredCache
 from utils.ml_logging import get_logger
+from utils.tracing import EXPORT_JSONL, tracer
 
 # Set up logger
 logger = get_logger()
 
 az_openai_client = AzureOpenAIAssistant()
-az_speech_recognizer_client = SpeechRecognizer()
-az_speach_synthesizer_client = SpeechSynthesizer()
+az_speech_recognizer_client = SpeechRecognizer(persistent=True)
+az_speach_synthesizer_client = SpeechSynthesizer(
+    cache=TieredCache(disk_directory=os.getenv("SYNTHESIS_CACHE_DIR"))
+)
+speech_pipeline = SentenceSpeechPipeline(az_speach_synthesizer_client)
 
 
 # Load environment variables
 SPEECH_KEY = os.getenv("SPEECH_KEY")
 SPEECH_REGION = os.getenv("SPEECH_REGION")
+# Optional periodic export of per-stage latency percentiles ("jsonl" or "prometheus")
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH")
+TRACE_EXPORT_FORMAT = os.getenv("TRACE_EXPORT_FORMAT", EXPORT_JSONL)
 
 # Define stop words and silence threshold
 STOP_WORDS = ["goodbye", "exit", "stop", "see you later", "bye"]
 SILENCE_THRESHOLD = 20  # in seconds
 
+# Fixed prompts, synthesized once at startup and then played from the cache
+GOODBYE_PROMPT = "Goodbye."
+SILENCE_TIMEOUT_PROMPT = (
+    f"No speech detected for over {SILENCE_THRESHOLD} seconds. Goodbye."
+)
+
 
 def check_for_stopwords(prompt: str) -> bool:
     """
@@ -54,43 +69,76 @@ def main():
     and synthesize speech from the generated text. Stops on specific words or prolonged silence.
     """
     try:
-        conversation_history = []
+        az_speach_synthesizer_client.prewarm_cache(
+            [GOODBYE_PROMPT, SILENCE_TIMEOUT_PROMPT]
+        )
+        az_speech_recognizer_client.warm_up()
+        if TRACE_EXPORT_PATH:
+            tracer.start_periodic_export(
+                TRACE_EXPORT_PATH, export_format=TRACE_EXPORT_FORMAT
+            )
+        conversation_history = ConversationHistory(
+            summarizer=az_openai_client.summarize_conversation
+        )
         last_speech_time = time.time()
 
         while True:
-            prompt = handle_speech_recognition()
-
-            if prompt:
-                last_speech_time = time.time()  # Reset the silence timer
-                logger.info(f"Recognized prompt: {prompt}")
-
-                if check_for_stopwords(prompt):
-                    logger.info("Stop word detected, exiting...")
-                    az_speach_synthesizer_client.synthesize_speech("Goodbye.")
+            with tracer.turn():
+                with tracer.span("stt"):
+                    prompt = handle_speech_recognition()
+
+                if prompt:
+                    last_speech_time = time.time()  # Reset the silence timer
+                    turn_start = time.perf_counter()
+                    logger.info(f"Recognized prompt: {prompt}")
+
+                    if check_for_stopwords(prompt):
+                        logger.info("Stop word detected, exiting...")
+                        az_speach_synthesizer_client.synthesize_speech(GOODBYE_PROMPT)
+                        break
+
+                    # LLM generation and TTS overlap: "respond" covers both, "llm" the token stream
+                    with tracer.span("respond"):
+                        metrics = speech_pipeline.speak(
+                            tracer.trace_iterator(
+                                "llm",
+                                az_openai_client.generate_text_with_contextual_history_stream(
+                                    conversation_history,
+                                    prompt,
+                                ),
+                            ),
+                            turn_start=turn_start,
+                        )
+                    if metrics["time_to_first_audio_seconds"] is not None:
+                        tracer.record(
+                            "tts_first_audio", metrics["time_to_first_audio_seconds"]
+                        )
+
+                    if metrics["text"]:
+                        logger.info(f"Generated response: {metrics['text']}")
+                    else:
+                        logger.warning("No response generated.")
+                elif time.time() - last_speech_time > SILENCE_THRESHOLD:
+                    logger.info(
+                        f"No speech detected for over {SILENCE_THRESHOLD} seconds, exiting..."
+                    )
+                    az_speach_synthesizer_client.synthesize_speech(
+                        SILENCE_TIMEOUT_PROMPT
+                    )
                     break
-
-                response = az_openai_client.generate_text_with_contextual_history(
-                    conversation_history,
-                    prompt,
-                )
-
-                if response:
-                    logger.info(f"Generated response: {response}")
-                    az_speach_synthesizer_client.synthesize_speech(response)
                 else:
-                    logger.warning("No response generated.")
-            elif time.time() - last_speech_time > SILENCE_THRESHOLD:
-                logger.info(
-                    f"No speech detected for over {SILENCE_THRESHOLD} seconds, exiting..."
-                )
-                az_speach_synthesizer_client.synthesize_speech(
-                    f"No speech detected for over {SILENCE_THRESHOLD} seconds. Goodbye."
-                )
-                break
-            else:
-                logger.warning("No prompt recognized.")
+                    logger.warning("No prompt recognized.")
     except Exception as e:
         logger.error(f"An error occurred: {e}")
+    finally:
+        logger.info(
+            f"Recognition latency: {az_speech_recognizer_client.get_latency_stats()}"
+        )
+        az_speech_recognizer_client.close()
+        tracer.stop_periodic_export()
+        logger.info(f"Stage latency: {tracer.snapshot()}")
+        if TRACE_EXPORT_PATH:
+            tracer.export(TRACE_EXPORT_PATH, TRACE_EXPORT_FORMAT)
 
 
 if __name__ == "__main__":
@@ -1,17 +1,142 @@
 import argparse
 import os
+import threading
 import time
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import azure.cognitiveservices.speech as speechsdk
 from dotenv import load_dotenv
 
-from src.speech.utils_audio import log_audio_characteristics
+from src.lenguage.pattern_intents import PatternIntentMatcher
+from src.speech.batch_transcription import collect_audio_items
+from src.speech.speech_to_text import rate_limited_event_logger
+from src.speech.utils_async import await_sdk_future, session_end_future
+from src.speech.utils_audio import get_audio_duration_seconds, log_audio_characteristics
 from utils.ml_logging import get_logger
+from utils.tracing import LatencyHistogram
 
 load_dotenv()
 logger = get_logger()
 
+# Intents added to every recognizer, on top of the caller's intent list
+DEFAULT_MODEL_INTENTS = ("HomeAutomation.TurnOn", "HomeAutomation.TurnOff")
+
+
+class IntentModelRegistry:
+    """
+    Builds the SpeechConfig, the LanguageUnderstandingModel and the full intent list once and shares them
+    between recognizers, so creating a recognizer per file only costs the audio config. Intent lists are
+    cached per distinct caller list. The registry is thread-safe, and nothing is built until first use.
+    """
+
+    def __init__(self, key: str, region: str, app_id: str):
+        """
+        Initializes a new instance of the IntentModelRegistry class.
+
+        Args:
+            key (str): The subscription key for the Speech service.
+            region (str): The region for the Speech service.
+            app_id (str): The app id for the Language Understanding Model.
+        """
+        self.key = key
+        self.region = region
+        self.app_id = app_id
+        self._speech_config = None
+        self._model = None
+        self._intents: Dict[Tuple, List] = {}
+        self._matchers: Dict[Tuple, PatternIntentMatcher] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def speech_config(self) -> speechsdk.SpeechConfig:
+        with self._lock:
+            if self._speech_config is None:
+                self._speech_config = speechsdk.SpeechConfig(
+                    subscription=self.key, region=self.region
+                )
+            return self._speech_config
+
+    @property
+    def model(self):
+        with self._lock:
+            if self._model is None:
+                self._model = speechsdk.intent.LanguageUnderstandingModel(
+                    app_id=self.app_id
+                )
+            return self._model
+
+    def get_intents(self, intents_list: Sequence) -> List:
+        """
+        Returns the intents to add to a recognizer: the model intents followed by intents_list.
+
+        Args:
+            intents_list (Sequence): The caller's intents, e.g. (phrase, intent_id) tuples.
+
+        Returns:
+            List: The full intent list, shared between calls with the same intents_list.
+        """
+        try:
+            cache_key = tuple(intents_list)
+            hash(cache_key)
+        except TypeError:
+            cache_key = None
+        if cache_key is not None:
+            with self._lock:
+                intents = self._intents.get(cache_key)
+            if intents is not None:
+                return intents
+
+        model = self.model
+        intents = [(model, intent_id) for intent_id in DEFAULT_MODEL_INTENTS] + list(
+            intents_list
+        )
+        if cache_key is not None:
+            with self._lock:
+                intents = self._intents.setdefault(cache_key, intents)
+        return intents
+
+    def get_matcher(
+        self, intents_list: Sequence, min_confidence: float = 0.5
+    ) -> PatternIntentMatcher:
+        """
+        Returns the local matcher for the pattern intents of intents_list, compiled once per distinct list.
+        Lists with unhashable entries are compiled on every call.
+
+        Args:
+            intents_list (Sequence): The caller's intents. Only (pattern, intent_id) pairs are compiled.
+            min_confidence (float, optional): The lowest confidence of a local match. Defaults to 0.5.
+
+        Returns:
+            PatternIntentMatcher: The matcher.
+        """
+        try:
+            cache_key = (tuple(intents_list), min_confidence)
+            hash(cache_key)
+        except TypeError:
+            cache_key = None
+        if cache_key is not None:
+            with self._lock:
+                matcher = self._matchers.get(cache_key)
+            if matcher is not None:
+                return matcher
+
+        matcher = PatternIntentMatcher(intents_list, min_confidence)
+        if cache_key is not None:
+            with self._lock:
+                matcher = self._matchers.setdefault(cache_key, matcher)
+        return matcher
+
+    def clear(self):
+        """
+        Drops the cached config, model, intent lists and matchers, e.g. after rotating the key.
+        """
+        with self._lock:
+            self._speech_config = None
+            self._model = None
+            self._intents.clear()
+            self._matchers.clear()
+
 
 class IntentRecognizer:
     """
@@ -30,6 +155,26 @@ class IntentRecognizer:
         self.key = key if key is not None else os.getenv("SPEECH_KEY")
         self.region = region if region is not None else os.getenv("SPEECH_REGION")
         self.app_id = app_id if app_id is not None else os.getenv("INTENT_KEY")
+        self.registry = IntentModelRegistry(self.key, self.region, self.app_id)
+        self._match_stats = {"local_matches": 0, "fallbacks": 0, "unmatched": 0}
+        self._match_stats_lock = threading.Lock()
+
+    @staticmethod
+    def merge_intent_counts(intent_counts: Sequence[dict]) -> dict:
+        """
+        Sums several intent histograms, e.g. the per-file results of a batch.
+
+        Args:
+            intent_counts (Sequence[dict]): Dictionaries with intents as keys and counts as values.
+
+        Returns:
+            dict: The combined counts, with the most frequent intents first.
+        """
+        merged = {}
+        for counts in intent_counts:
+            for intent_id, count in counts.items():
+                merged[intent_id] = merged.get(intent_id, 0) + count
+        return dict(sorted(merged.items(), key=lambda item: item[1], reverse=True))
 
     @staticmethod
     def aggregate_and_determine_intent(recognized_intents: List[dict]) -> dict:
@@ -65,27 +210,207 @@ class IntentRecognizer:
         Args:
             file_name (str): The name of the audio file to transcribe.
             intents_list (List[str]): The list of intents to be recognized.
+
+        Raises:
+            RuntimeError: If the session was canceled with an error.
         """
         logger.info("Starting continuous intent recognition...")
         log_audio_characteristics(file_name)
-        intent_config = speechsdk.SpeechConfig(
-            subscription=self.key, region=self.region
-        )
+        intent_recognizer = self._create_intent_recognizer(file_name, intents_list)
+        recognized_intents, errors = self._connect_intent_callbacks(intent_recognizer)
+
+        done = threading.Event()
+
+        def stop_cb(evt: speechsdk.SessionEventArgs):
+            logger.info(f"CLOSING on {evt}")
+            done.set()
+
+        intent_recognizer.session_stopped.connect(stop_cb)
+        intent_recognizer.canceled.connect(stop_cb)
+
+        # Start continuous intent recognition
+        intent_recognizer.start_continuous_recognition()
+        done.wait()
+
+        # Stop continuous recognition
+        intent_recognizer.stop_continuous_recognition()
+        self._raise_on_cancellation_error(errors)
+
+        # Determine the most prominent intent
+        final_intent = self.aggregate_and_determine_intent(recognized_intents)
+        logger.info(f"Final intent determined: {final_intent}")
+        logger.info("Finished continuous intent recognition.")
+        return final_intent
+
+    async def recognize_intent_continuous_async(
+        self, file_name: str, intents_list: List[str]
+    ) -> dict:
+        """
+        Asynchronous version of recognize_intent_continuous. The end of the session is awaited through a
+        future resolved by the SDK session_stopped/canceled callbacks, so many files can be processed
+        concurrently from a single event loop.
+
+        Args:
+            file_name (str): The name of the audio file to transcribe.
+            intents_list (List[str]): The list of intents to be recognized.
+
+        Returns:
+            dict: A dictionary with intents as keys and their counts as values.
+
+        Raises:
+            RuntimeError: If the session was canceled with an error.
+        """
+        logger.info("Starting continuous intent recognition...")
+        log_audio_characteristics(file_name)
+        intent_recognizer = self._create_intent_recognizer(file_name, intents_list)
+        recognized_intents, errors = self._connect_intent_callbacks(intent_recognizer)
+        session_end = session_end_future(intent_recognizer)
+
+        try:
+            await await_sdk_future(
+                intent_recognizer.start_continuous_recognition_async()
+            )
+            evt = await session_end
+            logger.info(f"CLOSING on {evt}")
+        finally:
+            # Also stop the session when the awaiting task is cancelled
+            await await_sdk_future(
+                intent_recognizer.stop_continuous_recognition_async()
+            )
+        self._raise_on_cancellation_error(errors)
+
+        final_intent = self.aggregate_and_determine_intent(recognized_intents)
+        logger.info(f"Final intent determined: {final_intent}")
+        logger.info("Finished continuous intent recognition.")
+        return final_intent
+
+    def _create_intent_recognizer(self, file_name: str, intents_list: List[str]):
+        """
+        Sets up an intent recognizer for an audio file and adds the intents to be recognized.
+
+        Args:
+            file_name (str): The name of the audio file to transcribe.
+            intents_list (List[str]): The list of intents to be recognized.
+
+        Returns:
+            speechsdk.intent.IntentRecognizer: The configured intent recognizer.
+        """
         audio_config = speechsdk.audio.AudioConfig(filename=file_name)
         intent_recognizer = speechsdk.intent.IntentRecognizer(
-            speech_config=intent_config, audio_config=audio_config
+            speech_config=self.registry.speech_config, audio_config=audio_config
         )
+        intent_recognizer.add_intents(self.registry.get_intents(intents_list))
+        return intent_recognizer
+
+    def recognize_intent_file(self, file_name: str, intents_list: List[str]) -> dict:
+        """
+        Runs continuous intent recognition on one file of a batch and returns its result record.
+
+        Args:
+            file_name (str): The name of the audio file to transcribe.
+            intents_list (List[str]): The list of intents to be recognized.
+
+        Returns:
+            dict: The result record, with the status, intent counts or error, audio duration and elapsed time.
+        """
+        start_time = time.perf_counter()
+        record = {"file": file_name}
+        try:
+            intents = self.recognize_intent_continuous(file_name, intents_list)
+            record.update(
+                status="ok",
+                intents=intents,
+                audio_seconds=get_audio_duration_seconds(file_name),
+            )
+        except Exception as e:
+            logger.error(f"Failed to recognize intent in {file_name}: {e}")
+            record.update(status="error", error=str(e))
+        record["elapsed_seconds"] = round(time.perf_counter() - start_time, 3)
+        return record
+
+    def recognize_intent_batch(
+        self,
+        file_names: Sequence[str],
+        intents_list: List[str],
+        max_workers: int = 4,
+    ) -> dict:
+        """
+        Runs continuous intent recognition over many audio files, at most max_workers sessions at a time.
+        The speech config, model and intent list are built once and shared by every session.
 
-        # Set up the intents to be recognized
-        model = speechsdk.intent.LanguageUnderstandingModel(app_id=self.app_id)
-        intents = [
-            (model, "HomeAutomation.TurnOn"),
-            (model, "HomeAutomation.TurnOff"),
-        ] + intents_list
+        Args:
+            file_names (Sequence[str]): The audio files.
+            intents_list (List[str]): The list of intents to be recognized.
+            max_workers (int, optional): The maximum number of concurrent recognition sessions. Defaults to 4.
 
-        intent_recognizer.add_intents(intents)
+        Returns:
+            dict: The per-file records (in input order), the combined intent counts, the succeeded and
+            failed counts, the per-file latency percentiles, the wall-clock time, the throughput in files
+            per second and the audio processed per wall-clock second.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        # Build the shared config and intents before the workers race for them
+        self.registry.get_intents(intents_list)
+        self.registry.speech_config
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            records = list(
+                executor.map(
+                    lambda file_name: self.recognize_intent_file(
+                        file_name, intents_list
+                    ),
+                    file_names,
+                )
+            )
+        wall_seconds = time.perf_counter() - start_time
+
+        latency = LatencyHistogram(window=max(len(records), 1))
+        succeeded = [record for record in records if record["status"] == "ok"]
+        for record in succeeded:
+            latency.record(record["elapsed_seconds"])
+        audio_seconds = sum(record["audio_seconds"] for record in succeeded)
+        summary = {
+            "files": records,
+            "intents": self.merge_intent_counts(
+                [record["intents"] for record in succeeded]
+            ),
+            "succeeded": len(succeeded),
+            "failed": len(records) - len(succeeded),
+            "latency": latency.snapshot(),
+            "audio_seconds": round(audio_seconds, 3),
+            "wall_seconds": round(wall_seconds, 3),
+            "files_per_second": (
+                round(len(records) / wall_seconds, 2) if wall_seconds else 0.0
+            ),
+            "realtime_factor": (
+                round(audio_seconds / wall_seconds, 2) if wall_seconds else 0.0
+            ),
+        }
+        logger.info(
+            f"Intent batch finished: {summary['succeeded']} succeeded, {summary['failed']} failed "
+            f"in {summary['wall_seconds']}s ({summary['files_per_second']} files/s, "
+            f"{summary['realtime_factor']}x real time). Intents: {summary['intents']}"
+        )
+        return summary
 
+    @staticmethod
+    def _connect_intent_callbacks(
+        intent_recognizer,
+    ) -> Tuple[List[dict], List[str]]:
+        """
+        Connects the logging and intent collection callbacks to the intent recognizer events.
+
+        Args:
+            intent_recognizer (speechsdk.intent.IntentRecognizer): The intent recognizer.
+
+        Returns:
+            Tuple[List[dict], List[str]]: The list recognized intents are appended to as they arrive, and
+            the list the error details of sessions canceled with an error are appended to.
+        """
         recognized_intents = []
+        errors = []
 
         def on_intent_recognized(evt: speechsdk.intent.IntentRecognitionEventArgs):
             recognized_intents.append(
@@ -97,41 +422,113 @@ class IntentRecognizer:
 
         intent_recognizer.recognized.connect(on_intent_recognized)
 
-        done = False
-
-        def stop_cb(evt: speechsdk.SessionEventArgs):
-            logger.info(f"CLOSING on {evt}")
-            nonlocal done
-            done = True
-
         # Connect callbacks to the events
         intent_recognizer.session_started.connect(
             lambda evt: logger.info(f"SESSION_START: {evt}")
         )
-        intent_recognizer.recognizing.connect(
-            lambda evt: logger.info(f"RECOGNIZING: {evt}")
-        )
-        intent_recognizer.canceled.connect(
-            lambda evt: logger.info(
-                f"CANCELED: {evt.cancellation_details} ({evt.reason})"
-            )
-        )
-        intent_recognizer.session_stopped.connect(stop_cb)
-        intent_recognizer.canceled.connect(stop_cb)
+        intent_recognizer.recognizing.connect(rate_limited_event_logger("RECOGNIZING"))
 
-        # Start continuous intent recognition
-        intent_recognizer.start_continuous_recognition()
-        while not done:
-            time.sleep(0.05)
+        def on_canceled(evt):
+            logger.info(f"CANCELED: {evt.cancellation_details} ({evt.reason})")
+            details = evt.cancellation_details
+            if details.reason == speechsdk.CancellationReason.Error:
+                logger.error(f"Error details: {details.error_details}")
+                errors.append(details.error_details)
 
-        # Stop continuous recognition
-        intent_recognizer.stop_continuous_recognition()
+        intent_recognizer.canceled.connect(on_canceled)
+        return recognized_intents, errors
 
-        # Determine the most prominent intent
-        final_intent = self.aggregate_and_determine_intent(recognized_intents)
-        logger.info(f"Final intent determined: {final_intent}")
-        logger.info("Finished continuous intent recognition.")
-        return final_intent
+    @staticmethod
+    def _raise_on_cancellation_error(errors: List[str]):
+        """
+        Raises if the session was canceled with an error, since continuous recognition reports service
+        errors through the canceled event rather than as exceptions.
+
+        Args:
+            errors (List[str]): The error details collected by _connect_intent_callbacks.
+        """
+        if errors:
+            raise RuntimeError(f"Intent recognition canceled: {'; '.join(errors)}")
+
+    def recognize_intent_from_text(
+        self,
+        text: str,
+        intents_list: List[str],
+        fallback: Optional[Callable[[str], Optional[dict]]] = None,
+        min_confidence: float = 0.5,
+    ) -> dict:
+        """
+        Determines the intent of a transcribed utterance, matching the pattern intents of intents_list
+        locally first. The fallback, e.g. a call to the intent service, only runs when no pattern matches
+        with at least min_confidence.
+
+        This module has no text-based client for the intent service (the SDK recognizers take audio), so
+        the fallback must be supplied by the caller; without one, utterances no pattern matches are
+        reported as unmatched and no service call is made or saved.
+
+        Args:
+            text (str): The transcribed utterance.
+            intents_list (List[str]): The list of intents to be recognized, e.g. ("What is the {weather}?",
+                "queryMeteorology").
+            fallback (Callable[[str], Optional[dict]], optional): Returns {"intent_id": ..., "entities": ...}
+                for utterances no pattern matches, or None. Defaults to None.
+            min_confidence (float, optional): The lowest confidence of a local match. Defaults to 0.5.
+
+        Returns:
+            dict: The intent_id (None if unknown), the entities, the confidence and the source
+            ("local", "fallback" or None).
+        """
+        match = self.registry.get_matcher(intents_list, min_confidence).match(text)
+        if match is not None:
+            self._count_match("local_matches")
+            logger.info(
+                f"Matched intent {match.intent_id} locally ({match.confidence}): {match.entities}"
+            )
+            return {
+                "intent_id": match.intent_id,
+                "entities": match.entities,
+                "confidence": match.confidence,
+                "source": "local",
+                "text": text,
+            }
+
+        result = fallback(text) if fallback is not None else None
+        if result and result.get("intent_id"):
+            self._count_match("fallbacks")
+            return {
+                "intent_id": result["intent_id"],
+                "entities": result.get("entities", {}),
+                "confidence": result.get("confidence"),
+                "source": "fallback",
+                "text": text,
+            }
+        self._count_match("unmatched")
+        return {
+            "intent_id": None,
+            "entities": {},
+            "confidence": None,
+            "source": None,
+            "text": text,
+        }
+
+    def _count_match(self, name: str):
+        with self._match_stats_lock:
+            self._match_stats[name] += 1
+
+    def get_match_stats(self) -> dict:
+        """
+        Reports how many utterances were matched locally, sent to the fallback or left unmatched.
+
+        Returns:
+            dict: The counts and the fraction of utterances resolved locally.
+        """
+        with self._match_stats_lock:
+            stats = dict(self._match_stats)
+        total = sum(stats.values())
+        stats["local_ratio"] = (
+            round(stats["local_matches"] / total, 4) if total else 0.0
+        )
+        return stats
 
     def recognize_intent_once_from_file(
         self, file_name: str, intents_list: List[str]
@@ -148,21 +545,7 @@ class IntentRecognizer:
         """
         logger.info("Starting one-shot intent recognition...")
 
-        intent_config = speechsdk.SpeechConfig(
-            subscription=self.key, region=self.region
-        )
-        audio_config = speechsdk.audio.AudioConfig(filename=file_name)
-
-        intent_recognizer = speechsdk.intent.IntentRecognizer(
-            speech_config=intent_config, audio_config=audio_config
-        )
-
-        model = speechsdk.intent.LanguageUnderstandingModel(app_id=self.app_id)
-        intents = [
-            (model, "HomeAutomation.TurnOn"),
-            (model, "HomeAutomation.TurnOff"),
-        ] + intents_list
-        intent_recognizer.add_intents(intents)
+        intent_recognizer = self._create_intent_recognizer(file_name, intents_list)
 
         # Starts intent recognition, and returns after a single utterance is recognized.
         intent_result = intent_recognizer.recognize_once()
@@ -193,14 +576,25 @@ class IntentRecognizer:
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Recognize intent from an audio file.")
-    parser.add_argument("--file", required=True, help="The path to the audio file.")
+    parser = argparse.ArgumentParser(description="Recognize intent from audio files.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="The path to the audio file.")
+    source.add_argument(
+        "--text",
+        help="A transcribed utterance to match against the pattern intents locally.",
+    )
+    source.add_argument(
+        "--input",
+        help="A directory, a glob expression or a manifest file of audio files to process as a batch.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="The number of concurrent recognition sessions for --input.",
+    )
     args = parser.parse_args()
 
-    if not os.path.isfile(args.file):
-        logger.error(f"File {args.file} not found.")
-        return
-
     intent_list = [
         ("What is the {weather}?", "queryMeteorology"),
         ("What is the {date}?", "queryDate"),
@@ -209,6 +603,24 @@ def main():
     # Create an instance of the IntentRecognizer class
     intent_recognizer = IntentRecognizer()
 
+    if args.text:
+        logger.info(
+            intent_recognizer.recognize_intent_from_text(args.text, intent_list)
+        )
+        return
+
+    if args.input:
+        file_names = collect_audio_items(args.input)
+        logger.info(f"Found {len(file_names)} audio files in {args.input}.")
+        intent_recognizer.recognize_intent_batch(
+            file_names, intent_list, max_workers=args.workers
+        )
+        return
+
+    if not os.path.isfile(args.file):
+        logger.error(f"File {args.file} not found.")
+        return
+
     try:
         # Call the recognize_intent_continuous method of the intent_recognizer object
         intent_recognizer.recognize_intent_continuous(args.file, intent_list)
@@ -0,0 +1,162 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+# {entity} slots and [optional words], as in Speech SDK pattern intents
+PATTERN_TOKEN = re.compile(r"\{(\w+)\}|\[([^\]]*)\]")
+TRAILING_PUNCTUATION = ".?!,;: "
+
+
+class PatternMatch(NamedTuple):
+    intent_id: str
+    entities: Dict[str, str]
+    confidence: float
+    pattern: str
+
+
+def normalize_utterance(text: str) -> str:
+    """
+    Lowercases a text, collapses whitespace and strips trailing punctuation, the way patterns are
+    normalized before they are compiled.
+
+    Args:
+        text (str): A recognized utterance or a pattern.
+
+    Returns:
+        str: The normalized text.
+    """
+    return " ".join(text.lower().split()).strip(TRAILING_PUNCTUATION)
+
+
+def compile_pattern(pattern: str, group_prefix: str) -> Tuple[str, List[str], int]:
+    """
+    Translates a pattern intent into a regular expression. "{name}" becomes a named group matching at
+    least one character, "[words]" becomes an optional group and everything else is matched literally,
+    with any run of whitespace matching any run of whitespace. Groups are named after the slot index
+    rather than the entity, so an entity may appear more than once, e.g. "Fly from {city} to {city}".
+
+    Args:
+        pattern (str): The pattern, e.g. "What is the {weather} [like] today?".
+        group_prefix (str): The prefix of the group names, unique per pattern.
+
+    Returns:
+        Tuple[str, List[str], int]: The expression, the entity name of each slot (group
+        f"{group_prefix}{slot index}") and the number of literal characters.
+    """
+
+    def literal(text: str) -> str:
+        return r"\s+".join(re.escape(word) for word in text.split(" "))
+
+    normalized = normalize_utterance(pattern)
+    parts: List[str] = []
+    entities: List[str] = []
+    literal_chars = 0
+    position = 0
+    for token in PATTERN_TOKEN.finditer(normalized):
+        start, end = token.span()
+        text = normalized[position:start]
+        parts.append(literal(text))
+        literal_chars += len(text.replace(" ", ""))
+        entity, optional = token.groups()
+        if entity is not None:
+            parts.append(f"(?P<{group_prefix}{len(entities)}>.+?)")
+            entities.append(entity)
+        else:
+            parts.append(f"(?:{literal(optional.strip())})?")
+        position = end
+    text = normalized[position:]
+    parts.append(literal(text))
+    literal_chars += len(text.replace(" ", ""))
+    # Spaces around an optional or empty slot may collapse
+    expression = "".join(parts).replace(r"\s+(?:", r"\s*(?:")
+    return expression, entities, literal_chars
+
+
+class PatternIntentMatcher:
+    """
+    Matches recognized text against pattern intents such as ("What is the {weather}?", "queryMeteorology")
+    locally, extracting the {entity} slots. All patterns are compiled into one regular expression, so a
+    match is a single pass over the utterance whatever the number of patterns. Patterns with more literal
+    text are tried first, so the most specific pattern wins.
+
+    An entity repeated in a pattern is returned once per occurrence, the later ones numbered from 2: "Fly
+    from {city} to {city}" yields {"city": ..., "city_2": ...}.
+
+    The confidence of a match is the fraction of the utterance matched by the pattern's text rather than
+    by its slots; a pattern that is mostly slots ("{anything}") matches everything but with low confidence.
+    """
+
+    def __init__(
+        self, patterns: Sequence[Tuple[str, str]], min_confidence: float = 0.5
+    ):
+        """
+        Initializes a new instance of the PatternIntentMatcher class.
+
+        Args:
+            patterns (Sequence[Tuple[str, str]]): (pattern, intent_id) pairs. Other intent entries, like
+                (model, intent_id) tuples, are ignored.
+            min_confidence (float, optional): The lowest confidence returned by match. Defaults to 0.5.
+        """
+        self.min_confidence = min_confidence
+        self._patterns: List[Tuple[str, str, List[str], int]] = []
+        branches: List[Tuple[int, str]] = []
+        for pattern, intent_id in patterns:
+            if not isinstance(pattern, str):
+                continue
+            index = len(self._patterns)
+            expression, entities, literal_chars = compile_pattern(pattern, f"p{index}_")
+            self._patterns.append((pattern, intent_id, entities, literal_chars))
+            branches.append((literal_chars, f"(?P<p{index}>{expression})"))
+
+        branches.sort(key=lambda branch: branch[0], reverse=True)
+        self._expression = (
+            re.compile("|".join(expression for _, expression in branches))
+            if branches
+            else None
+        )
+        logger.info(f"Compiled {len(self._patterns)} local pattern intents.")
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def match(self, text: str) -> Optional[PatternMatch]:
+        """
+        Matches an utterance against the patterns.
+
+        Args:
+            text (str): The recognized text.
+
+        Returns:
+            PatternMatch: The intent, its entities and the match confidence, or None if no pattern matches
+            the whole utterance with at least min_confidence.
+        """
+        if self._expression is None:
+            return None
+        normalized = normalize_utterance(text)
+        found = self._expression.fullmatch(normalized)
+        if found is None:
+            return None
+
+        index = int(found.lastgroup[1:])
+        pattern, intent_id, entities, literal_chars = self._patterns[index]
+        slot_values = [
+            found.group(f"p{index}_{slot}").strip() for slot in range(len(entities))
+        ]
+        # Later occurrences of a repeated entity are numbered: "city", "city_2", ...
+        entity_values: Dict[str, str] = {}
+        for slot, (entity, value) in enumerate(zip(entities, slot_values)):
+            occurrence = entities[:slot].count(entity) + 1
+            name = entity if occurrence == 1 else f"{entity}_{occurrence}"
+            entity_values[name] = value
+        total_chars = len(normalized.replace(" ", ""))
+        slot_chars = sum(len(value.replace(" ", "")) for value in slot_values)
+        confidence = round(1.0 - slot_chars / total_chars, 3) if total_chars else 0.0
+        if confidence < self.min_confidence:
+            logger.debug(
+                f"Pattern '{pattern}' matched '{text}' with low confidence {confidence}."
+            )
+            return None
+        return PatternMatch(intent_id, entity_values, confidence, pattern)
@@ -0,0 +1,306 @@
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, List, Optional, Set
+
+from src.speech.speech_to_text import SpeechTranscriber
+from src.speech.transcript_cache import CachedTranscriber
+from src.speech.utils_audio import get_audio_duration_seconds
+from src.speech.utils_transcript import TICKS_PER_SECOND, Transcript
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+MANIFEST_EXTENSIONS = (".txt", ".jsonl", ".lst")
+
+
+def is_blob_url(item: str) -> bool:
+    """
+    Checks whether a batch item refers to a blob in Azure Blob Storage rather than a local file.
+
+    Args:
+        item (str): A local file path or a blob URL.
+
+    Returns:
+        bool: True if the item is a blob URL.
+    """
+    return "blob.core.windows.net" in item
+
+
+def get_transcript_end_seconds(transcript: Transcript) -> Optional[float]:
+    """
+    Returns the end of the last recognized segment of a transcript, as a lower bound of the audio duration
+    when the audio itself cannot be read.
+
+    Args:
+        transcript (Transcript): The transcript with the recognized segments.
+
+    Returns:
+        Optional[float]: The end of the last segment in seconds, or None if no segment was recognized.
+    """
+    if not len(transcript):
+        return None
+    end = max(
+        offset + duration
+        for offset, duration in zip(transcript.offsets, transcript.durations)
+    )
+    return end / TICKS_PER_SECOND
+
+
+def collect_audio_items(source: str, pattern: str = "*.wav") -> List[str]:
+    """
+    Resolves the audio items to transcribe from a directory, a glob or a manifest file.
+
+    A manifest is a text file with one local path or blob URL per line, or a JSONL file whose
+    lines contain a "file_path" or "blob_url" key. Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        source (str): A directory, a glob expression or the path to a manifest file.
+        pattern (str, optional): The file pattern used when source is a directory. Defaults to "*.wav".
+
+    Returns:
+        List[str]: The audio items, in a stable order.
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "**", pattern), recursive=True))
+
+    if os.path.isfile(source) and source.endswith(MANIFEST_EXTENSIONS):
+        items = []
+        with open(source, "r", encoding="utf-8") as manifest:
+            for line in manifest:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("{"):
+                    record = json.loads(line)
+                    line = record.get("file_path") or record.get("blob_url")
+                items.append(line)
+        return items
+
+    return sorted(glob.glob(source, recursive=True))
+
+
+def load_completed_items(output_path: str) -> Set[str]:
+    """
+    Reads the items already transcribed successfully from a results JSONL file, so a restarted
+    batch can skip them. Failed items are not considered completed and will be retried.
+
+    Args:
+        output_path (str): Path to the results JSONL file.
+
+    Returns:
+        Set[str]: The completed items.
+    """
+    completed = set()
+    if not os.path.isfile(output_path):
+        return completed
+
+    with open(output_path, "r", encoding="utf-8") as results:
+        for line in results:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written last line from an interrupted run
+                logger.warning(f"Skipping malformed result line: {line[:80]}")
+                continue
+            if record.get("status") == "ok":
+                completed.add(record["item"])
+    return completed
+
+
+class BatchTranscriptionRunner:
+    """
+    Runs SpeechTranscriber.transcribe_speech_from_file_continuous over many recordings with a bounded
+    number of concurrent sessions, writing each result to a JSONL file as soon as it is available.
+    """
+
+    def __init__(
+        self,
+        transcriber: Optional[SpeechTranscriber] = None,
+        max_workers: int = 4,
+        **transcription_kwargs,
+    ):
+        """
+        Initializes a new instance of the BatchTranscriptionRunner class.
+
+        Args:
+            transcriber (SpeechTranscriber, optional): The transcriber to use. Defaults to a new SpeechTranscriber.
+            max_workers (int, optional): The maximum number of concurrent transcription sessions. Defaults to 4.
+            **transcription_kwargs: Extra keyword arguments for transcribe_speech_from_file_continuous
+                (e.g. language, diarization).
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self.transcriber = transcriber or SpeechTranscriber()
+        self.max_workers = max_workers
+        self.transcription_kwargs = transcription_kwargs
+        self._write_lock = threading.Lock()
+
+    def transcribe_item(self, item: str) -> dict:
+        """
+        Transcribes a single item and returns its result record.
+
+        Args:
+            item (str): A local file path or a blob URL.
+
+        Returns:
+            dict: The result record, with the status, transcript or error, audio duration and elapsed time.
+        """
+        start_time = time.perf_counter()
+        record = {"item": item}
+        try:
+            if is_blob_url(item):
+                # A blob has no local header to read, so its duration is taken from the recognized segments
+                segments = Transcript()
+                transcript = self.transcriber.transcribe_speech_from_file_continuous(
+                    blob_url=item,
+                    **{"transcript": segments, **self.transcription_kwargs},
+                )
+                audio_seconds = get_transcript_end_seconds(segments)
+            else:
+                transcript = self.transcriber.transcribe_speech_from_file_continuous(
+                    file_path=item, **self.transcription_kwargs
+                )
+                audio_seconds = get_audio_duration_seconds(item)
+            if transcript is None:
+                raise RuntimeError("Transcription returned no result.")
+            record.update(
+                status="ok", transcript=transcript, audio_seconds=audio_seconds
+            )
+        except Exception as e:
+            logger.error(f"Failed to transcribe {item}: {e}")
+            record.update(status="error", error=str(e))
+        record["elapsed_seconds"] = round(time.perf_counter() - start_time, 3)
+        return record
+
+    def run(self, items: Iterable[str], output_path: str) -> dict:
+        """
+        Transcribes all items that are not yet completed in output_path, appending one JSON line per item.
+        At most max_workers sessions run at the same time, and no more than twice that many items are
+        queued, so memory stays flat for arbitrarily large batches.
+
+        Args:
+            items (Iterable[str]): Local file paths or blob URLs.
+            output_path (str): Path to the results JSONL file. Existing successful results are skipped.
+
+        Returns:
+            dict: A summary with the processed, succeeded, failed and skipped counts, the total audio
+            and wall-clock durations and the throughput in audio-hours per wall-clock hour.
+        """
+        completed = load_completed_items(output_path)
+        summary = {
+            "processed": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "skipped": 0,
+            "audio_seconds": 0.0,
+        }
+        start_time = time.perf_counter()
+
+        with open(output_path, "a", encoding="utf-8") as output, ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor:
+            pending = set()
+            for item in items:
+                if item in completed:
+                    summary["skipped"] += 1
+                    continue
+                if len(pending) >= 2 * self.max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(done, output, summary)
+                pending.add(executor.submit(self.transcribe_item, item))
+            done, _ = wait(pending)
+            self._collect(done, output, summary)
+
+        wall_seconds = time.perf_counter() - start_time
+        summary["wall_seconds"] = round(wall_seconds, 3)
+        summary["throughput_audio_hours_per_hour"] = (
+            round(summary["audio_seconds"] / wall_seconds, 2) if wall_seconds else 0.0
+        )
+        logger.info(
+            f"Batch finished: {summary['succeeded']} succeeded, {summary['failed']} failed, "
+            f"{summary['skipped']} skipped. {summary['audio_seconds'] / 3600:.2f} audio hours in "
+            f"{wall_seconds / 3600:.2f} wall-clock hours "
+            f"({summary['throughput_audio_hours_per_hour']}x real time)."
+        )
+        return summary
+
+    def _collect(self, done, output, summary: dict):
+        """
+        Writes the records of finished futures to the output file and updates the summary.
+
+        Args:
+            done: The finished futures.
+            output: The open results file.
+            summary (dict): The running batch summary.
+        """
+        for future in done:
+            record = future.result()
+            with self._write_lock:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+            summary["processed"] += 1
+            if record["status"] == "ok":
+                summary["succeeded"] += 1
+                summary["audio_seconds"] += record.get("audio_seconds") or 0.0
+            else:
+                summary["failed"] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Transcribe a batch of audio files concurrently."
+    )
+    parser.add_argument(
+        "--input",
+        required=True,
+        help="A directory, a glob expression or a manifest file (.txt, .lst or .jsonl).",
+    )
+    parser.add_argument(
+        "--output", required=True, help="The path to the results JSONL file."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="The number of concurrent transcription sessions.",
+    )
+    parser.add_argument(
+        "--pattern",
+        default="*.wav",
+        help="The file pattern used when --input is a directory.",
+    )
+    parser.add_argument("--language", default=None, help="The language code.")
+    parser.add_argument(
+        "--diarization", action="store_true", help="Enable speaker diarization."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="A directory for caching transcripts across runs, keyed by audio content.",
+    )
+    args = parser.parse_args()
+
+    items = collect_audio_items(args.input, args.pattern)
+    logger.info(f"Found {len(items)} audio items in {args.input}.")
+
+    transcriber = (
+        CachedTranscriber(cache_directory=args.cache_dir) if args.cache_dir else None
+    )
+    runner = BatchTranscriptionRunner(
+        transcriber=transcriber,
+        max_workers=args.workers,
+        language=args.language,
+        diarization=args.diarization,
+    )
+    runner.run(items, args.output)
+    if transcriber is not None:
+        logger.info(f"Transcript cache: {transcriber.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
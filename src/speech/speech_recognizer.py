@@ -1,5 +1,8 @@
 import os
-from typing import Optional, Tuple
+import statistics
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 
 import azure.cognitiveservices.speech as speechsdk
 from azure.cognitiveservices.speech import SpeechRecognitionResult
@@ -19,7 +22,13 @@ class SpeechRecognizer:
     A class that encapsulates the Azure Cognitive Services Speech SDK functionality for recognizing speech.
     """
 
-    def __init__(self, key: str = None, region: str = None, language: str = "en-US"):
+    def __init__(
+        self,
+        key: str = None,
+        region: str = None,
+        language: str = "en-US",
+        persistent: bool = False,
+    ):
         """
         Initializes a new instance of the SpeechRecognizer class.
 
@@ -27,19 +36,26 @@ class SpeechRecognizer:
             key (str, optional): The subscription key for the Speech service. Defaults to the SPEECH_KEY environment variable.
             region (str, optional): The region for the Speech service. Defaults to the SPEECH_REGION environment variable.
             language (str, optional): The language for the Speech service. Defaults to "en-US".
+            persistent (bool, optional): If True, the configuration and recognizer are built once and the service
+                connection is opened ahead of the first call and kept open between calls. Defaults to False.
         """
         self.key = key if key is not None else os.getenv("SPEECH_KEY")
         self.region = region if region is not None else os.getenv("SPEECH_REGION")
         self.language = language
+        self.persistent = persistent
+        self._speech_recognizer: Optional[speechsdk.SpeechRecognizer] = None
+        self._connection: Optional[speechsdk.Connection] = None
+        self._connected = threading.Event()
+        self._setup_times: Dict[str, List[float]] = {"warm": [], "cold": []}
+        self._latencies: Dict[str, List[float]] = {"warm": [], "cold": []}
+        self._speech_end_at: Optional[float] = None
 
-    def recognize_from_microphone(
-        self,
-    ) -> Tuple[str, Optional[SpeechRecognitionResult]]:
+    def _create_speech_recognizer(self) -> speechsdk.SpeechRecognizer:
         """
-        Recognizes speech from the microphone.
+        Creates a speech recognizer that listens on the default microphone.
 
         Returns:
-            Tuple[str, Optional[SpeechRecognitionResult]]: The recognized text and the result object.
+            speechsdk.SpeechRecognizer: The recognizer.
         """
         speech_config = speechsdk.SpeechConfig(
             subscription=self.key, region=self.region
@@ -50,9 +66,83 @@ class SpeechRecognizer:
         speech_recognizer = speechsdk.SpeechRecognizer(
             speech_config=speech_config, audio_config=audio_config
         )
+        speech_recognizer.speech_end_detected.connect(self._on_speech_end_detected)
+        return speech_recognizer
+
+    def _on_speech_end_detected(self, evt: speechsdk.RecognitionEventArgs):
+        self._speech_end_at = time.perf_counter()
+
+    def warm_up(self) -> speechsdk.SpeechRecognizer:
+        """
+        Builds the persistent recognizer if needed and opens its service connection, so the next
+        recognition does not pay for connection setup. The connection is reopened if the service
+        dropped it, e.g. after an idle timeout.
+
+        Returns:
+            speechsdk.SpeechRecognizer: The persistent recognizer.
+        """
+        if self._speech_recognizer is None:
+            self._speech_recognizer = self._create_speech_recognizer()
+            self._connection = speechsdk.Connection.from_recognizer(
+                self._speech_recognizer
+            )
+            self._connection.connected.connect(lambda evt: self._connected.set())
+            self._connection.disconnected.connect(self._on_disconnected)
+
+        if not self._connected.is_set():
+            start_time = time.perf_counter()
+            self._connection.open(for_continuous_recognition=False)
+            logger.info(
+                f"Opened speech service connection in {time.perf_counter() - start_time:.3f}s."
+            )
+        return self._speech_recognizer
+
+    def _on_disconnected(self, evt: speechsdk.ConnectionEventArgs):
+        self._connected.clear()
+        logger.info("Speech service connection closed.")
+
+    def close(self):
+        """
+        Closes the connection of the persistent recognizer.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connected.clear()
+
+    def recognize_from_microphone(
+        self,
+    ) -> Tuple[str, Optional[SpeechRecognitionResult]]:
+        """
+        Recognizes speech from the microphone.
+
+        Two client wall times are recorded, as warm when the call reused an open connection and as cold
+        otherwise: the setup time, creating the recognizer and opening the connection, which is what a
+        persistent recognizer saves; and the latency from the detected end of speech to the final result,
+        which leaves out the time spent waiting for the user and speaking.
+
+        Returns:
+            Tuple[str, Optional[SpeechRecognitionResult]]: The recognized text and the result object.
+        """
+        start_time = time.perf_counter()
+        if self.persistent:
+            warm = self._connected.is_set()
+            speech_recognizer = self.warm_up()
+        else:
+            warm = False
+            speech_recognizer = self._create_speech_recognizer()
+            # Opened up front, like warm_up does, so the setup time includes the connection
+            speechsdk.Connection.from_recognizer(speech_recognizer).open(
+                for_continuous_recognition=False
+            )
+        setup_seconds = time.perf_counter() - start_time
 
         logger.info("Speak into your microphone.")
+        self._speech_end_at = None
         speech_recognition_result = speech_recognizer.recognize_once_async().get()
+        result_at = time.perf_counter()
+        speech_end_at = self._speech_end_at
+        latency_seconds = result_at - speech_end_at if speech_end_at else None
+        self._record_latency(setup_seconds, latency_seconds, warm)
 
         if speech_recognition_result.reason == speechsdk.ResultReason.RecognizedSpeech:
             logger.info("Recognized: {}".format(speech_recognition_result.text))
@@ -75,3 +165,52 @@ class SpeechRecognizer:
 
         # Return the recognized text and the result object
         return speech_recognition_result.text, speech_recognition_result
+
+    def _record_latency(
+        self, setup_seconds: float, latency_seconds: Optional[float], warm: bool
+    ):
+        """
+        Records the client wall times of a recognition.
+
+        Args:
+            setup_seconds (float): The time spent creating the recognizer and opening the connection.
+            latency_seconds (float, optional): The time from the detected end of speech to the final result.
+                None if no end of speech was detected, e.g. when nothing was said.
+            warm (bool): Whether the recognition reused an open connection.
+        """
+        session = "warm" if warm else "cold"
+        self._setup_times[session].append(setup_seconds)
+        message = f"Recognition setup ({session}): {setup_seconds * 1000:.0f} ms"
+        if latency_seconds is not None:
+            self._latencies[session].append(latency_seconds)
+            message += f", end of speech to result: {latency_seconds * 1000:.0f} ms"
+        logger.info(f"{message}.")
+
+    def get_latency_stats(self) -> dict:
+        """
+        Summarizes the recognition wall times of warm and cold sessions.
+
+        Returns:
+            dict: For "warm" and "cold", the mean and maximum setup time, and the number of results with a
+            detected end of speech with the mean, p50 and maximum latency from it to the result, in seconds.
+        """
+        stats = {}
+        for session, latencies in self._latencies.items():
+            setup_times = self._setup_times[session]
+            stats[session] = {
+                "setup_mean_seconds": (
+                    round(statistics.fmean(setup_times), 3) if setup_times else None
+                ),
+                "setup_max_seconds": (
+                    round(max(setup_times), 3) if setup_times else None
+                ),
+                "count": len(latencies),
+                "mean_seconds": (
+                    round(statistics.fmean(latencies), 3) if latencies else None
+                ),
+                "p50_seconds": (
+                    round(statistics.median(latencies), 3) if latencies else None
+                ),
+                "max_seconds": round(max(latencies), 3) if latencies else None,
+            }
+        return stats
@@ -1,23 +1,53 @@
 import argparse
+import asyncio
+import itertools
+import json
 import os
 import tempfile
+import threading
 import time
 import urllib.parse
-import wave
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple, Union
 
 import azure.cognitiveservices.speech as speechsdk
 import numpy as np
 from azure.cognitiveservices.speech import AudioConfig, SpeechConfig
-from azure.storage.blob import BlobServiceClient
 from dotenv import load_dotenv
 
-from utils.ml_logging import get_logger
+from src.speech.transcript_export import create_exporter
+from src.speech.utils_async import await_sdk_future, session_end_future
+from src.speech.utils_audio import (
+    TARGET_SAMPLE_RATE,
+    WAVE_FORMAT_ALAW,
+    WAVE_FORMAT_MULAW,
+    WAVE_FORMAT_PCM,
+    SpeechRegionMap,
+    detect_speech_regions_in_file,
+    iter_normalized_audio_blocks,
+    iter_trimmed_blocks,
+    parse_wav_header,
+    plan_segment_boundaries,
+    read_wav_layout,
+    write_audio_segments,
+    write_trimmed_audio,
+)
+from src.speech.utils_blob import blob_client_pool
+from src.speech.utils_transcript import (
+    TICKS_PER_SECOND,
+    Transcript,
+    Word,
+    stitch_segment_transcripts,
+)
+from utils.ml_logging import LogRateLimiter, get_logger
 
 load_dotenv()
 
 logger = get_logger()
 
+PACING_REALTIME = "realtime"
+PACING_UNTHROTTLED = "unthrottled"
+
 
 # Callback methods
 def conversation_transcriber_transcribed_cb(evt: speechsdk.SpeechRecognitionEventArgs):
@@ -39,6 +69,103 @@ def conversation_transcriber_transcribing_started_cb(evt: speechsdk.SessionEvent
     logger.info(f"Transcribing event: {evt}")
 
 
+def rate_limited_event_logger(label: str, min_interval_seconds: float = 1.0):
+    """
+    Creates a callback that logs partial recognition results (RECOGNIZING/TRANSCRIBING events) at most
+    once per interval, with the number of skipped partial results. These events fire many times per
+    second on the SDK's callback thread, so logging each one would delay event delivery.
+
+    :param label: The event label used in the log message.
+    :param min_interval_seconds: The minimum time between two logged events.
+    :return: The event callback.
+    """
+    limiter = LogRateLimiter(min_interval_seconds)
+
+    def log_event(evt: speechsdk.SpeechRecognitionEventArgs):
+        allowed, suppressed = limiter.allow()
+        if allowed:
+            logger.info(
+                f"{label}: {evt.result.text} ({suppressed} partial results skipped)"
+            )
+
+    return log_event
+
+
+def recognized_language(result: speechsdk.SpeechRecognitionResult) -> Optional[str]:
+    """
+    Returns the language detected for a recognition result, if source language auto-detection was used.
+
+    :param result: The recognition result.
+    :return: The detected language code, or None.
+    """
+    return (
+        result.properties.get_property(
+            speechsdk.PropertyId.SpeechServiceConnection_AutoDetectSourceLanguageResult
+        )
+        or None
+    )
+
+
+def recognized_words(
+    result: speechsdk.SpeechRecognitionResult,
+) -> Optional[List[Word]]:
+    """
+    Reads the word timings of a recognition result. They are only present when word-level timestamps
+    were requested on the speech configuration.
+
+    :param result: The recognition result.
+    :return: The (word, offset, duration) of each word of the best hypothesis, or None.
+    """
+    try:
+        detail = json.loads(result.json)
+    except (TypeError, ValueError):
+        return None
+    best = detail.get("NBest") or [{}]
+    words = best[0].get("Words")
+    if not words:
+        return None
+    return [(word["Word"], word["Offset"], word["Duration"]) for word in words]
+
+
+def append_recognition_result(
+    transcript: Transcript,
+    result: speechsdk.SpeechRecognitionResult,
+    region_map: Optional[SpeechRegionMap] = None,
+    with_words: bool = False,
+) -> int:
+    """
+    Appends a recognized utterance to a transcript, with its offset, duration, speaker and language.
+
+    :param transcript: The transcript to append to.
+    :param result: The recognition result.
+    :param region_map: Set when the audio holds only the speech regions of a longer recording; used to map offsets back
+        to it.
+    :param with_words: Whether to read the word timings from the detailed result.
+    :return: The offset of the utterance in ticks, in the original recording.
+    """
+    offset = result.offset
+    words = recognized_words(result) if with_words else None
+    if region_map is not None:
+        offset = region_map.to_original_ticks(offset)
+        if words:
+            word_offsets = region_map.to_original_seconds(
+                np.array([word[1] for word in words]) / TICKS_PER_SECOND
+            )
+            words = [
+                (word, int(round(word_offset * TICKS_PER_SECOND)), duration)
+                for (word, _, duration), word_offset in zip(words, word_offsets)
+            ]
+    transcript.append(
+        result.text,
+        offset,
+        result.duration,
+        getattr(result, "speaker_id", None) or None,
+        recognized_language(result),
+        words,
+    )
+    return offset
+
+
 def conversation_transcriber_session_stopped_cb(evt: speechsdk.SessionEventArgs):
     logger.info(f"SessionStopped event: {evt}")
 
@@ -47,13 +174,77 @@ def conversation_transcriber_recognition_canceled_cb(evt: speechsdk.SessionEvent
     logger.info(f"Canceled event: {evt}")
 
 
+class AudioBlockPullCallback(speechsdk.audio.PullAudioInputStreamCallback):
+    """
+    Serves audio blocks to a PullAudioInputStream on demand. The recognizer only asks for more audio
+    when it is ready to process it, which gives natural backpressure without any sleeping: a lazy
+    source such as a blob download is only read as fast as it is recognized.
+
+    read runs on an SDK thread, where an exception would be lost. An error raised by the block source
+    ends the stream instead and is kept, so the caller can re-raise it with raise_if_failed once the
+    session has ended.
+    """
+
+    def __init__(self, blocks: Iterator[Union[np.ndarray, bytes]]):
+        """
+        :param blocks: Iterator over audio blocks in the stream format, e.g. 16 kHz mono int16 arrays
+            from iter_normalized_audio_blocks or the raw chunks of a blob download.
+        """
+        super().__init__()
+        self._blocks = blocks
+        self._pending = memoryview(b"")
+        self.error: Optional[Exception] = None
+
+    def read(self, buffer: memoryview) -> int:
+        """
+        Copies up to len(buffer) bytes of audio into the SDK buffer. Returning 0 ends the stream.
+        """
+        size = buffer.nbytes
+        written = 0
+        while written < size:
+            if not self._pending.nbytes:
+                try:
+                    block = next(self._blocks, None)
+                except Exception as e:
+                    logger.error(f"Failed to read audio for the pull stream: {e}")
+                    self.error = e
+                    self._blocks = iter(())
+                    break
+                if block is None:
+                    break
+                self._pending = memoryview(block).cast("B")
+            end = min(size, written + self._pending.nbytes)
+            n_bytes = end - written
+            buffer[written:end] = self._pending[:n_bytes]
+            self._pending = self._pending[n_bytes:]
+            written = end
+        return written
+
+    def raise_if_failed(self):
+        """
+        Re-raises the error that ended the stream early, if any.
+        """
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        self._pending = memoryview(b"")
+        self._blocks = iter(())
+
+
 class SpeechCoreTranslator:
     """
     A class that serves as the core for handling Azure AI Services Speech SDK functionality.
     It encapsulates the processes involved in translating and transcribing speech.
     """
 
-    def __init__(self):
+    def __init__(self, word_level_timestamps: bool = False):
+        """
+        Parameters:
+        word_level_timestamps (bool): Request detailed results with the timing of each word, which are
+            then kept in the Transcript segments and used by the caption exporters.
+        """
+        self.word_level_timestamps = word_level_timestamps
         self.speech_key = os.getenv("SPEECH_KEY")
         self.speech_region = os.getenv("SPEECH_REGION")
         self.connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
@@ -63,12 +254,19 @@ class SpeechCoreTranslator:
         self.speech_config.set_property(
             speechsdk.PropertyId.SpeechServiceConnection_EnableAudioLogging, "true"
         )
+        if word_level_timestamps:
+            self._request_word_level_timestamps(self.speech_config)
         self.supported_languages = [
             "en-US",  # English (United States)
             "es-ES",  # Spanish (Spain)
             "fr-FR",  # French (France)
         ]
 
+    @staticmethod
+    def _request_word_level_timestamps(speech_config: speechsdk.SpeechConfig):
+        speech_config.output_format = speechsdk.OutputFormat.Detailed
+        speech_config.request_word_level_timestamps()
+
     def add_supported_language(self, language):
         """
         Appends a language to the list of supported languages.
@@ -79,7 +277,8 @@ class SpeechCoreTranslator:
 
     def get_blob_client_from_url(self, blob_url: str):
         """
-        Retrieves a BlobClient object for the specified blob URL.
+        Retrieves a BlobClient object for the specified blob URL. The underlying BlobServiceClient and
+        its keep-alive connections are pooled per connection string and shared across calls.
 
         :param blob_url: The URL of the blob.
         :type blob_url: str
@@ -93,11 +292,8 @@ class SpeechCoreTranslator:
             logger.error("Azure storage connection string is not set.")
             return None
 
-        blob_service_client = BlobServiceClient.from_connection_string(
-            self.connection_string
-        )
-        return blob_service_client.get_blob_client(
-            container=container_name, blob=blob_name
+        return blob_client_pool.get_blob_client(
+            self.connection_string, container_name, blob_name
         )
 
     def transcribe_speech_from_file_continuous(
@@ -109,6 +305,9 @@ class SpeechCoreTranslator:
         auto_detect_supported_languages: Optional[List[str]] = None,
         source_language_config: Optional[speechsdk.SourceLanguageConfig] = None,
         diarization: Optional[bool] = False,
+        stream_blob: Optional[bool] = False,
+        trim_silence: Optional[bool] = False,
+        transcript: Optional[Transcript] = None,
     ) -> str:
         """
         Performs continuous speech recognition with input from an audio file or a blob. The audio source can be either a local file or a blob in Azure Blob Storage. The method supports language auto-detection and speaker diarization.
@@ -120,23 +319,35 @@ class SpeechCoreTranslator:
         :param auto_detect_supported_languages: List of language codes that are supported for auto-detection (e.g., ['en-US', 'fr-FR']). This parameter is optional.
         :param source_language_config: Configuration for source language. This parameter is optional.
         :param diarization: If set to True, the speaker diarization will be performed, which distinguishes different speakers in the audio. This parameter is optional.
+        :param stream_blob: If set to True, blob audio is streamed into the recognizer while it downloads instead of
+            being saved to a temporary file first. This parameter is optional.
+        :param trim_silence: If set to True, only the speech regions found by local voice-activity detection are sent
+            for recognition. Local files only: raises ValueError with blob_url alone. This parameter is optional.
+        :param transcript: A Transcript the recognized segments, with their offsets, speakers and languages, are
+            appended to. This parameter is optional.
         :return: Transcribed text from the audio source.
-        :raises ValueError: If neither file_path nor blob_url is provided, or if both language and auto_detect_source_language are provided.
+        :raises ValueError: If neither file_path nor blob_url is provided, if both language and auto_detect_source_language
+            are provided, or if trim_silence is set without file_path.
         """
         self._validate_inputs(
-            file_path, blob_url, language, auto_detect_source_language
+            file_path, blob_url, language, auto_detect_source_language, trim_silence
         )
 
-        if auto_detect_source_language:
-            auto_detect_source_language_config = (
-                speechsdk.languageconfig.AutoDetectSourceLanguageConfig(
-                    languages=auto_detect_supported_languages
-                    if auto_detect_supported_languages is not None
-                    else self.supported_languages
-                )
+        auto_detect_source_language_config = (
+            self._build_auto_detect_source_language_config(
+                auto_detect_source_language, auto_detect_supported_languages
+            )
+        )
+
+        if file_path and trim_silence:
+            return self._transcribe_trimmed_file(
+                file_path,
+                language,
+                source_language_config,
+                auto_detect_source_language_config,
+                diarization,
+                transcript,
             )
-        else:
-            auto_detect_source_language_config = None
 
         if file_path:
             return self._transcribe_from_file(
@@ -145,6 +356,7 @@ class SpeechCoreTranslator:
                 source_language_config,
                 auto_detect_source_language_config,
                 diarization,
+                transcript=transcript,
             )
 
         return self._transcribe_from_blob(
@@ -153,6 +365,142 @@ class SpeechCoreTranslator:
             source_language_config,
             auto_detect_source_language_config,
             diarization,
+            stream_blob,
+            transcript,
+        )
+
+    async def transcribe_async(
+        self,
+        file_path: Optional[str] = None,
+        blob_url: Optional[str] = None,
+        language: Optional[str] = None,
+        auto_detect_source_language: Optional[bool] = False,
+        auto_detect_supported_languages: Optional[List[str]] = None,
+        source_language_config: Optional[speechsdk.SourceLanguageConfig] = None,
+        diarization: Optional[bool] = False,
+        stream_blob: Optional[bool] = False,
+        trim_silence: Optional[bool] = False,
+        transcript: Optional[Transcript] = None,
+    ) -> Optional[str]:
+        """
+        Asyncio-native counterpart of transcribe_speech_from_file_continuous. Instead of blocking the calling
+        thread until the session ends, completion is signalled by the SDK session_stopped/canceled callbacks
+        through an awaitable future, so a single event loop can drive many transcriptions concurrently.
+
+        :param file_path: Path to the local audio file. This parameter is optional.
+        :param blob_url: URL of the blob containing the audio file. This parameter is optional.
+        :param language: Language code for speech recognition (e.g., 'en-US'). This parameter is optional.
+        :param auto_detect_source_language: If set to True, the source language will be automatically detected from the
+            audio. This parameter is optional.
+        :param auto_detect_supported_languages: List of language codes that are supported for auto-detection (e.g.,
+            ['en-US', 'fr-FR']). This parameter is optional.
+        :param source_language_config: Configuration for source language. This parameter is optional.
+        :param diarization: If set to True, the speaker diarization will be performed. This parameter is optional.
+        :param stream_blob: If set to True, blob audio is streamed into the recognizer while it downloads instead of
+            being saved to a temporary file first. This parameter is optional.
+        :param trim_silence: If set to True, only the speech regions found by local voice-activity detection are sent
+            for recognition. Local files only: raises ValueError with blob_url alone. This parameter is optional.
+        :param transcript: A Transcript the recognized segments, with their offsets, speakers and languages, are
+            appended to. This parameter is optional.
+        :return: Transcribed text from the audio source, or None if blob client could not be created.
+        :raises ValueError: If neither file_path nor blob_url is provided, if both language and auto_detect_source_language
+            are provided, or if trim_silence is set without file_path.
+        """
+        self._validate_inputs(
+            file_path, blob_url, language, auto_detect_source_language, trim_silence
+        )
+        auto_detect_source_language_config = (
+            self._build_auto_detect_source_language_config(
+                auto_detect_source_language, auto_detect_supported_languages
+            )
+        )
+
+        loop = asyncio.get_running_loop()
+        if file_path and trim_silence:
+            trimmed = await loop.run_in_executor(
+                None, self._write_speech_regions, file_path
+            )
+            if trimmed is None:
+                return ""
+            trimmed_path, region_map = trimmed
+            try:
+                return await self._transcribe_async(
+                    speechsdk.AudioConfig(filename=trimmed_path),
+                    language,
+                    source_language_config,
+                    auto_detect_source_language_config,
+                    diarization,
+                    region_map,
+                    transcript,
+                )
+            finally:
+                self._remove_temp_file(trimmed_path)
+
+        if blob_url and not file_path and stream_blob:
+            blob_stream = await loop.run_in_executor(
+                None, self._open_blob_audio_stream, blob_url
+            )
+            if blob_stream is None:
+                return None
+            audio_config, pull_callback = blob_stream
+            try:
+                text = await self._transcribe_async(
+                    audio_config,
+                    language,
+                    source_language_config,
+                    auto_detect_source_language_config,
+                    diarization,
+                    transcript=transcript,
+                )
+                pull_callback.raise_if_failed()
+                return text
+            finally:
+                pull_callback.close()
+
+        temp_file_name = None
+        if file_path:
+            audio_file = os.path.abspath(file_path)
+        else:
+            temp_file_name = await loop.run_in_executor(
+                None, self._download_blob_to_temp_file, blob_url
+            )
+            if temp_file_name is None:
+                return None
+            audio_file = temp_file_name
+
+        try:
+            return await self._transcribe_async(
+                speechsdk.AudioConfig(filename=audio_file),
+                language,
+                source_language_config,
+                auto_detect_source_language_config,
+                diarization,
+                transcript=transcript,
+            )
+        finally:
+            if temp_file_name:
+                self._remove_temp_file(temp_file_name)
+
+    def _build_auto_detect_source_language_config(
+        self,
+        auto_detect_source_language: Optional[bool],
+        auto_detect_supported_languages: Optional[List[str]],
+    ) -> Optional[speechsdk.languageconfig.AutoDetectSourceLanguageConfig]:
+        """
+        Builds the auto-detect source language configuration, if requested.
+
+        :param auto_detect_source_language: Whether the source language should be automatically detected.
+        :param auto_detect_supported_languages: Candidate languages. Defaults to the supported languages.
+        :return: The auto-detect configuration, or None if auto-detection is disabled.
+        """
+        if not auto_detect_source_language:
+            return None
+        return speechsdk.languageconfig.AutoDetectSourceLanguageConfig(
+            languages=(
+                auto_detect_supported_languages
+                if auto_detect_supported_languages is not None
+                else self.supported_languages
+            )
         )
 
     def _transcribe_from_file(
@@ -162,6 +510,8 @@ class SpeechCoreTranslator:
         source_language_config,
         auto_detect_source_language_config,
         diarization: bool = False,
+        region_map: Optional[SpeechRegionMap] = None,
+        transcript: Optional[Transcript] = None,
     ) -> str:
         """
         Helper function to transcribe from a local file.
@@ -170,6 +520,9 @@ class SpeechCoreTranslator:
         :param language: Language code for speech recognition.
         :param source_language_config: Configuration for source language.
         :param auto_detect_source_language_config: Configuration for auto detecting source language.
+        :param region_map: Set when file_path holds only the speech regions of a longer recording; used to map offsets
+            back to it.
+        :param transcript: The Transcript to append the recognized segments to. A new one is used if None.
         :return: Transcribed text.
         """
         # Check if the path is absolute, if not convert it to absolute path
@@ -182,6 +535,8 @@ class SpeechCoreTranslator:
             source_language_config,
             auto_detect_source_language_config,
             diarization,
+            region_map,
+            transcript,
         )
 
     def _transcribe_from_blob(
@@ -191,6 +546,8 @@ class SpeechCoreTranslator:
         source_language_config,
         auto_detect_source_language_config,
         diarization: bool = False,
+        stream_blob: bool = False,
+        transcript: Optional[Transcript] = None,
     ) -> str:
         """
         Helper function to transcribe from a blob.
@@ -199,40 +556,222 @@ class SpeechCoreTranslator:
         :param language: Language code for speech recognition.
         :param source_language_config: Configuration for source language.
         :param auto_detect_source_language_config: Configuration for auto detecting source language.
+        :param stream_blob: Whether to stream the blob into the recognizer instead of downloading it to a temporary file.
+        :param transcript: The Transcript to append the recognized segments to. A new one is used if None.
         :return: Transcribed text, or None if blob client could not be created.
         """
-        blob_client = self.get_blob_client_from_url(blob_url)
-        if blob_client is None:
-            return None
+        if stream_blob:
+            blob_stream = self._open_blob_audio_stream(blob_url)
+            if blob_stream is None:
+                return None
+            audio_config, pull_callback = blob_stream
+            try:
+                text = self._transcribe_continous(
+                    audio_config,
+                    language,
+                    source_language_config,
+                    auto_detect_source_language_config,
+                    diarization,
+                    transcript=transcript,
+                )
+                pull_callback.raise_if_failed()
+                return text
+            finally:
+                pull_callback.close()
 
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            download_stream = blob_client.download_blob()
-            temp_file.write(download_stream.readall())
-            audio_config = speechsdk.AudioConfig(filename=temp_file.name)
+        temp_file_name = self._download_blob_to_temp_file(blob_url)
+        if temp_file_name is None:
+            return None
 
         try:
             result = self._transcribe_continous(
-                audio_config,
+                speechsdk.AudioConfig(filename=temp_file_name),
                 language,
                 source_language_config,
                 auto_detect_source_language_config,
                 diarization,
+                transcript=transcript,
             )
         finally:
-            try:
-                os.remove(temp_file.name)
-                logger.info(f"Deleted temporary file: {temp_file.name}")
-            except OSError as e:
-                logger.warning(f"Error deleting temporary file: {e}")
+            self._remove_temp_file(temp_file_name)
 
         return result
 
+    def _transcribe_trimmed_file(
+        self,
+        file_path: str,
+        language: str,
+        source_language_config,
+        auto_detect_source_language_config,
+        diarization: bool = False,
+        transcript: Optional[Transcript] = None,
+    ) -> str:
+        """
+        Helper function to transcribe only the speech regions of a local file. Voice-activity detection
+        runs locally, the regions are written to a temporary 16 kHz mono WAV file, and that file is
+        transcribed, so silences and holds are never sent to the service.
+
+        :param file_path: Path to the audio file.
+        :param language: Language code for speech recognition.
+        :param source_language_config: Configuration for source language.
+        :param auto_detect_source_language_config: Configuration for auto detecting source language.
+        :param transcript: The Transcript to append the recognized segments to, with offsets in the original recording.
+        :return: Transcribed text.
+        """
+        trimmed = self._write_speech_regions(file_path)
+        if trimmed is None:
+            return ""
+
+        trimmed_path, region_map = trimmed
+        try:
+            return self._transcribe_from_file(
+                trimmed_path,
+                language,
+                source_language_config,
+                auto_detect_source_language_config,
+                diarization,
+                region_map,
+                transcript,
+            )
+        finally:
+            self._remove_temp_file(trimmed_path)
+
+    @staticmethod
+    def _write_speech_regions(
+        file_path: str,
+    ) -> Optional[Tuple[str, SpeechRegionMap]]:
+        """
+        Runs voice-activity detection on a local file and writes its speech regions to a temporary 16 kHz
+        mono WAV file. The caller removes the file.
+
+        :param file_path: Path to the audio file.
+        :return: The path of the temporary file and the region map, or None if no speech was detected.
+        """
+        region_map = detect_speech_regions_in_file(file_path)
+        report = region_map.report()
+        logger.info(
+            f"Dropping {report['dropped_seconds']}s of {report['total_seconds']}s "
+            f"({report['dropped_ratio']:.1%}) of silence from {file_path}."
+        )
+        if not region_map.kept_samples:
+            logger.warning(f"No speech detected in {file_path}.")
+            return None
+
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+            trimmed_path = temp_file.name
+        try:
+            write_trimmed_audio(file_path, trimmed_path, region_map)
+        except Exception:
+            SpeechCoreTranslator._remove_temp_file(trimmed_path)
+            raise
+        return trimmed_path, region_map
+
+    def _download_blob_to_temp_file(self, blob_url: str) -> Optional[str]:
+        """
+        Downloads a blob into a named temporary file.
+
+        :param blob_url: URL of the blob containing the audio file.
+        :return: Path of the temporary file, or None if blob client could not be created.
+        """
+        blob_client = self.get_blob_client_from_url(blob_url)
+        if blob_client is None:
+            return None
+
+        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+            download_stream = blob_client.download_blob()
+            temp_file.write(download_stream.readall())
+
+        return temp_file.name
+
+    def _open_blob_audio_stream(
+        self, blob_url: str
+    ) -> Optional[Tuple[speechsdk.audio.AudioConfig, AudioBlockPullCallback]]:
+        """
+        Starts downloading a blob and prepares a pull stream served chunk by chunk from the download.
+        Only the chunks needed to read the WAV header are fetched before returning; the rest of the
+        download is read when the recognizer asks for more audio, so at most a chunk is held in memory.
+        Blobs without a RIFF header are treated as raw 16 kHz, 16-bit mono PCM.
+
+        :param blob_url: URL of the blob containing the audio file.
+        :return: The audio configuration and the pull callback serving the download, to be closed when
+            the recognition ends, or None if blob client could not be created.
+        :raises ValueError: If the WAV header uses an encoding the stream does not support.
+        """
+        blob_client = self.get_blob_client_from_url(blob_url)
+        if blob_client is None:
+            return None
+
+        chunks = iter(blob_client.download_blob().chunks())
+        header = b""
+        wav_header = None
+        stream_format = None
+        for chunk in chunks:
+            header += chunk
+            try:
+                wav_header = parse_wav_header(header)
+            except ValueError:
+                logger.warning(
+                    f"No WAV header found in {blob_url}, streaming it as raw 16 kHz 16-bit mono PCM."
+                )
+                stream_format = speechsdk.audio.AudioStreamFormat()
+                data_offset = 0
+                break
+            if wav_header is not None:
+                break
+
+        if stream_format is None:
+            if wav_header is None:
+                raise ValueError(f"Incomplete WAV header in blob: {blob_url}")
+            format_tag, framerate, bits_per_sample, n_channels, data_offset = wav_header
+            wave_stream_formats = {
+                WAVE_FORMAT_PCM: speechsdk.AudioStreamWaveFormat.PCM,
+                WAVE_FORMAT_ALAW: speechsdk.AudioStreamWaveFormat.ALAW,
+                WAVE_FORMAT_MULAW: speechsdk.AudioStreamWaveFormat.MULAW,
+            }
+            if format_tag not in wave_stream_formats:
+                raise ValueError(
+                    f"Unsupported WAV format tag {format_tag} for streaming: {blob_url}"
+                )
+            stream_format = speechsdk.audio.AudioStreamFormat(
+                samples_per_second=framerate,
+                bits_per_sample=bits_per_sample,
+                channels=n_channels,
+                wave_stream_format=wave_stream_formats[format_tag],
+            )
+            logger.info(
+                f"Streaming blob audio: {framerate} Hz, {bits_per_sample} bits, {n_channels} channel(s)."
+            )
+
+        pull_callback = AudioBlockPullCallback(
+            itertools.chain([header[data_offset:]], chunks)
+        )
+        stream = speechsdk.audio.PullAudioInputStream(
+            pull_stream_callback=pull_callback, stream_format=stream_format
+        )
+        return speechsdk.audio.AudioConfig(stream=stream), pull_callback
+
+    @staticmethod
+    def _remove_temp_file(temp_file_name: str):
+        """
+        Deletes a temporary file created by _download_blob_to_temp_file.
+
+        :param temp_file_name: Path of the temporary file.
+        """
+        try:
+            os.remove(temp_file_name)
+            logger.info(f"Deleted temporary file: {temp_file_name}")
+        except OSError as e:
+            logger.warning(f"Error deleting temporary file: {e}")
+
     def _transcribe_continous(
         self,
         audio_config,
         language,
         source_language_config,
         auto_detect_source_language_config,
+        diarization: bool = False,
+        region_map: Optional[SpeechRegionMap] = None,
+        transcript: Optional[Transcript] = None,
     ) -> str:
         """
         Core function to handle speech recognition and transcription.
@@ -241,9 +780,78 @@ class SpeechCoreTranslator:
         :param language: Language code for speech recognition.
         :param source_language_config: Configuration for source language.
         :param auto_detect_source_language_config: Configuration for auto detecting source language.
+        :param diarization: Not supported by the plain speech recognizer; accepted for signature parity with
+            SpeechTranscriber.
+        :param region_map: Set when the audio holds only the speech regions of a longer recording; used to map offsets
+            back to it.
+        :param transcript: The Transcript to append the recognized segments to. A new one is used if None.
         :return: Transcribed text.
         """
-        speech_recognizer = speechsdk.SpeechRecognizer(
+        speech_recognizer = self._create_speech_recognizer(
+            audio_config,
+            language,
+            source_language_config,
+            auto_detect_source_language_config,
+        )
+
+        transcript = transcript if transcript is not None else Transcript()
+        self._setup_continuous_recognition(speech_recognizer, transcript, region_map)
+        return transcript.to_text(diarization=False)
+
+    async def _transcribe_async(
+        self,
+        audio_config,
+        language,
+        source_language_config,
+        auto_detect_source_language_config,
+        diarization: bool = False,
+        region_map: Optional[SpeechRegionMap] = None,
+        transcript: Optional[Transcript] = None,
+    ) -> str:
+        """
+        Asynchronous version of _transcribe_continous.
+
+        :param audio_config: Audio configuration object.
+        :param language: Language code for speech recognition.
+        :param source_language_config: Configuration for source language.
+        :param auto_detect_source_language_config: Configuration for auto detecting source language.
+        :param diarization: Not supported by the plain speech recognizer; accepted for signature parity with
+            SpeechTranscriber.
+        :param region_map: Set when the audio holds only the speech regions of a longer recording; used to map offsets
+            back to it.
+        :param transcript: The Transcript to append the recognized segments to. A new one is used if None.
+        :return: Transcribed text.
+        """
+        speech_recognizer = self._create_speech_recognizer(
+            audio_config,
+            language,
+            source_language_config,
+            auto_detect_source_language_config,
+        )
+
+        transcript = transcript if transcript is not None else Transcript()
+        await self._setup_continuous_recognition_async(
+            speech_recognizer, transcript, region_map
+        )
+        return transcript.to_text(diarization=False)
+
+    def _create_speech_recognizer(
+        self,
+        audio_config,
+        language,
+        source_language_config,
+        auto_detect_source_language_config,
+    ) -> speechsdk.SpeechRecognizer:
+        """
+        Creates a speech recognizer bound to the shared speech configuration.
+
+        :param audio_config: Audio configuration object.
+        :param language: Language code for speech recognition.
+        :param source_language_config: Configuration for source language.
+        :param auto_detect_source_language_config: Configuration for auto detecting source language.
+        :return: The speech recognizer.
+        """
+        return speechsdk.SpeechRecognizer(
             speech_config=self.speech_config,
             audio_config=audio_config,
             language=language,
@@ -251,19 +859,20 @@ class SpeechCoreTranslator:
             auto_detect_source_language_config=auto_detect_source_language_config,
         )
 
-        final_text = self._setup_continuous_recognition(speech_recognizer)
-        return final_text.strip()
-
     @staticmethod
     def _validate_inputs(
         file_path: Optional[str],
         blob_url: Optional[str],
         language: Optional[str],
         auto_detect_source_language: Optional[bool],
+        trim_silence: Optional[bool] = False,
     ):
         if not file_path and not blob_url:
             raise ValueError("Either file_path or blob_url must be provided.")
 
+        if trim_silence and not file_path:
+            raise ValueError("trim_silence is only supported for local files.")
+
         if language and auto_detect_source_language:
             raise ValueError(
                 "Only one of language or auto_detect_source_language can be provided."
@@ -278,22 +887,81 @@ class SpeechCoreTranslator:
         language: str = None,
         source_language_config: speechsdk.SourceLanguageConfig = None,
         auto_detect_source_language_config: speechsdk.AutoDetectSourceLanguageConfig = None,
+        pacing: str = PACING_REALTIME,
+        chunk_ms: int = 100,
+        trim_silence: bool = False,
+        transcript: Optional[Transcript] = None,
     ):
         """
-        Recognizes speech from a custom audio source using a push audio stream.
-        Converts stereo audio to mono in real-time before pushing it to the stream.
+        Recognizes speech from a custom audio source using an audio input stream.
+        Normalizes the audio (any channel count, sample width or sample rate) to 16 kHz mono int16
+        before handing it to the stream.
+
+        Two pacing modes are supported:
+        - "realtime": audio is pushed into a PushAudioInputStream at the speed it would be captured live,
+          which is useful to simulate a microphone or a telephony feed.
+        - "unthrottled": audio is served from a PullAudioInputStream as fast as the recognizer asks for it,
+          so the SDK's own consumption provides the backpressure and long files are transcribed much
+          faster than real time.
 
         Args:
             audio_file (str): The name of the audio file to transcribe.
             language (str, optional): The language to use for speech recognition. Defaults to None.
             source_language_config (SourceLanguageConfig, optional): The source language configuration. Defaults to None.
             auto_detect_source_language_config (AutoDetectSourceLanguageConfig, optional): The auto detect source language configuration. Defaults to None.
+            pacing (str, optional): "realtime" or "unthrottled". Defaults to "realtime".
+            chunk_ms (int, optional): The amount of audio handled per chunk, in milliseconds. Defaults to 100.
+            trim_silence (bool, optional): Send only the speech regions found by local voice-activity detection.
+                Defaults to False.
+            transcript (Transcript, optional): The Transcript the recognized segments are appended to. Defaults to a new
+                one.
+
+        Returns:
+            str: The recognized text.
         """
+        if pacing not in (PACING_REALTIME, PACING_UNTHROTTLED):
+            raise ValueError(
+                f"pacing must be '{PACING_REALTIME}' or '{PACING_UNTHROTTLED}'."
+            )
+
+        stream = None
+        pull_callback = None
+        speech_recognizer = None
+        region_map = None
+        transcript = transcript if transcript is not None else Transcript()
         try:
             speech_config = speechsdk.SpeechConfig(
                 subscription=self.speech_key, region=self.speech_region
             )
-            stream = speechsdk.audio.PushAudioInputStream()
+            if self.word_level_timestamps:
+                self._request_word_level_timestamps(speech_config)
+            input_framerate = read_wav_layout(audio_file)[1]
+            blocks = iter_normalized_audio_blocks(
+                audio_file,
+                block_frames=max(input_framerate * chunk_ms // 1000, 1),
+                reuse_buffers=True,
+            )
+            if trim_silence:
+                region_map = detect_speech_regions_in_file(audio_file)
+                blocks = iter_trimmed_blocks(blocks, region_map.regions)
+            # Start reading here, so an unsupported format is raised on this thread rather than on the
+            # SDK thread that pulls the first block
+            first_block = next(blocks, None)
+            if first_block is not None:
+                blocks = itertools.chain([first_block], blocks)
+            stream_format = speechsdk.audio.AudioStreamFormat(
+                samples_per_second=TARGET_SAMPLE_RATE, bits_per_sample=16, channels=1
+            )
+            if pacing == PACING_UNTHROTTLED:
+                pull_callback = AudioBlockPullCallback(blocks)
+                stream = speechsdk.audio.PullAudioInputStream(
+                    pull_stream_callback=pull_callback,
+                    stream_format=stream_format,
+                )
+            else:
+                stream = speechsdk.audio.PushAudioInputStream(
+                    stream_format=stream_format
+                )
             audio_config = speechsdk.audio.AudioConfig(stream=stream)
             speech_recognizer = speechsdk.SpeechRecognizer(
                 speech_config=speech_config,
@@ -303,21 +971,23 @@ class SpeechCoreTranslator:
                 auto_detect_source_language_config=auto_detect_source_language_config,
             )
 
-            done = False
-            wav_fh = wave.open(audio_file, "rb")
-            final_text = ""
+            done = threading.Event()
 
             def update_final_text(evt):
-                nonlocal final_text
-                final_text += " " + evt.result.text
+                if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+                    append_recognition_result(
+                        transcript,
+                        evt.result,
+                        region_map,
+                        self.word_level_timestamps,
+                    )
 
             def stop_cb(evt):
                 logger.info(f"CLOSING on {evt}")
-                nonlocal done
-                done = True
+                done.set()
 
             speech_recognizer.recognizing.connect(
-                lambda evt: logger.info(f"RECOGNIZING: {evt}")
+                rate_limited_event_logger("RECOGNIZING")
             )
             speech_recognizer.recognized.connect(update_final_text)
             speech_recognizer.session_started.connect(
@@ -334,77 +1004,134 @@ class SpeechCoreTranslator:
 
             speech_recognizer.start_continuous_recognition()
 
-            while not done:
-                frames = wav_fh.readframes(wav_fh.getframerate() // 10)
-                if not frames:
-                    break
+            if pacing == PACING_REALTIME:
+                self._push_audio_in_realtime(stream, blocks, done)
 
-                if wav_fh.getnchannels() == 2:
-                    try:
-                        # Interpreting the stereo frame data
-                        stereo_data = np.frombuffer(frames, dtype=np.int16)
-                        logger.info(f"Stereo data shape: {stereo_data.shape}")
-                        # The reshape(-1, 2) method is used to ensure that the stereo data
-                        # is reshaped into a 2-column array (representing left and right channels).
-                        # Then, the mean is calculated across the columns (axis=1) to produce the
-                        # mono audio data.
-                        # Reshaping and averaging to convert to mono
-                        mono_data = (
-                            stereo_data.reshape(-1, 2).mean(axis=1).astype(np.int16)
-                        )
-                        logger.info(f"Mono data shape: {mono_data.shape}")
-                        # Convert mono_data back to bytes
-                        mono_frames = mono_data.tobytes()
-                        stream.write(mono_frames)
-                    except Exception as e:
-                        logger.error(f"Error during stereo to mono conversion: {e}")
-                else:
-                    mono_data = np.frombuffer(frames, dtype=np.int16)
-                    logger.info(f"Mono data shape: {mono_data.shape}")
-                    mono_frames = mono_data.tobytes()
-                    stream.write(mono_frames)
-
-                time.sleep(0.1)
+            # The session stops on its own once the recognizer has consumed the end of the stream
+            done.wait()
+            if pull_callback is not None:
+                pull_callback.raise_if_failed()
         except Exception as e:
             logger.error(f"An error occurred: {e}")
         finally:
-            wav_fh.close()
-            stream.close()
-            speech_recognizer.stop_continuous_recognition()
-            return final_text.strip()
+            if isinstance(stream, speechsdk.audio.PushAudioInputStream):
+                stream.close()
+            if speech_recognizer is not None:
+                speech_recognizer.stop_continuous_recognition()
+            return transcript.to_text(diarization=False)
+
+    @staticmethod
+    def _push_audio_in_realtime(
+        stream: speechsdk.audio.PushAudioInputStream,
+        blocks: Iterator[np.ndarray],
+        done: threading.Event,
+    ):
+        """
+        Writes 16 kHz mono int16 blocks to a push stream at the rate they would be captured live,
+        then closes the stream. Sleeps are scheduled against the audio clock, so the pacing does not
+        drift with the time spent converting and writing each block.
+
+        :param stream: The push stream to write to.
+        :param blocks: The normalized audio blocks.
+        :param done: Set when the recognition session ends early; stops the pushing.
+        """
+        start_time = time.perf_counter()
+        pushed_samples = 0
+        for block in blocks:
+            if done.is_set():
+                break
+            stream.write(block.tobytes())
+            pushed_samples += len(block)
+            delay = (
+                start_time + pushed_samples / TARGET_SAMPLE_RATE - time.perf_counter()
+            )
+            if delay > 0:
+                done.wait(delay)
+        stream.close()
 
-    def _setup_continuous_recognition(self, speech_recognizer) -> str:
+    def _setup_continuous_recognition(
+        self,
+        speech_recognizer,
+        transcript: Transcript,
+        region_map: Optional[SpeechRegionMap] = None,
+    ) -> Transcript:
         """
-        Sets up continuous recognition for the speech recognizer and fetches the final transcribed text.
+        Sets up continuous recognition for the speech recognizer and collects the recognized segments.
 
         :param speech_recognizer: The speech recognizer object.
-        :return: The concatenated string of all recognized texts.
+        :param transcript: The Transcript the recognized segments are appended to.
+        :param region_map: Set when the audio holds only the speech regions of a longer recording; used to map offsets
+            back to it.
+        :return: The transcript.
         """
         logger.info("Setting up continuous recognition...")
-        transcribing_stop = False
-        final_text = ""
+        transcribing_stop = threading.Event()
 
         def update_final_text(evt: speechsdk.SpeechRecognitionEventArgs):
-            nonlocal final_text
             if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                final_text += " " + evt.result.text
-                logger.info(f"Updated final text: {final_text}")
+                append_recognition_result(
+                    transcript, evt.result, region_map, self.word_level_timestamps
+                )
+                logger.info(f"Recognized segment: {evt.result.text}")
 
         def stop_cb(evt: speechsdk.SessionEventArgs):
-            nonlocal transcribing_stop
-            transcribing_stop = True
+            transcribing_stop.set()
             logger.info(f"Stopping recognition on {evt}")
 
         self._setup_recognition_callbacks(speech_recognizer, update_final_text, stop_cb)
 
         logger.info("Starting continuous recognition...")
         speech_recognizer.start_continuous_recognition()
-        while not transcribing_stop:
-            time.sleep(0.02)
+        transcribing_stop.wait()
         logger.info("Stopping continuous recognition...")
         speech_recognizer.stop_continuous_recognition()
 
-        return final_text
+        return transcript
+
+    async def _setup_continuous_recognition_async(
+        self,
+        speech_recognizer,
+        transcript: Transcript,
+        region_map: Optional[SpeechRegionMap] = None,
+    ) -> Transcript:
+        """
+        Asynchronous version of _setup_continuous_recognition. The session end is awaited through a future
+        resolved by the SDK session_stopped/canceled callbacks instead of polling.
+
+        :param speech_recognizer: The speech recognizer object.
+        :param transcript: The Transcript the recognized segments are appended to.
+        :param region_map: Maps offsets in trimmed audio back to the original recording, if set.
+        :return: The transcript.
+        """
+        logger.info("Setting up continuous recognition...")
+
+        def update_final_text(evt: speechsdk.SpeechRecognitionEventArgs):
+            if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+                append_recognition_result(
+                    transcript, evt.result, region_map, self.word_level_timestamps
+                )
+                logger.info(f"Recognized segment: {evt.result.text}")
+
+        def stop_cb(evt: speechsdk.SessionEventArgs):
+            logger.info(f"Stopping recognition on {evt}")
+
+        self._setup_recognition_callbacks(speech_recognizer, update_final_text, stop_cb)
+        session_end = session_end_future(speech_recognizer)
+
+        logger.info("Starting continuous recognition...")
+        try:
+            await await_sdk_future(
+                speech_recognizer.start_continuous_recognition_async()
+            )
+            await session_end
+        finally:
+            # Also stop the session when the awaiting task is cancelled
+            logger.info("Stopping continuous recognition...")
+            await await_sdk_future(
+                speech_recognizer.stop_continuous_recognition_async()
+            )
+
+        return transcript
 
     def _setup_recognition_callbacks(
         self, speech_recognizer, update_final_text, stop_cb
@@ -417,12 +1144,10 @@ class SpeechCoreTranslator:
         :param stop_cb: Callback function for stopping recognition.
         """
         logger.info("Setting up recognition callbacks...")
-        speech_recognizer.recognizing.connect(
-            lambda evt: logger.info(f"RECOGNIZING: {evt}")
-        )
+        speech_recognizer.recognizing.connect(rate_limited_event_logger("RECOGNIZING"))
         speech_recognizer.recognized.connect(
             lambda evt: logger.info(
-                f"RECOGNIZED: {evt.result.text}, Language: {evt.result.language}"
+                f"RECOGNIZED: {evt.result.text}, Language: {recognized_language(evt.result)}"
             )
         )
         speech_recognizer.recognized.connect(update_final_text)
@@ -459,8 +1184,8 @@ class SpeechTranscriber(SpeechCoreTranslator):
     A class that encapsulates the Azure AI Services Speech SDK functionality for transcribing speech.
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, word_level_timestamps: bool = False):
+        super().__init__(word_level_timestamps)
 
     def transcribe_speech_from_file_continuous(
         self,
@@ -471,6 +1196,9 @@ class SpeechTranscriber(SpeechCoreTranslator):
         auto_detect_supported_languages: Optional[List[str]] = None,
         source_language_config: Optional[speechsdk.SourceLanguageConfig] = None,
         diarization: Optional[bool] = False,
+        stream_blob: Optional[bool] = False,
+        trim_silence: Optional[bool] = False,
+        transcript: Optional[Transcript] = None,
     ) -> str:
         """
         ranscribes audio from a given audio configuratio with input from an audio file or a blob.
@@ -485,23 +1213,35 @@ class SpeechTranscriber(SpeechCoreTranslator):
         :param auto_detect_supported_languages: List of language codes that are supported for auto-detection (e.g., ['en-US', 'fr-FR']). This parameter is optional.
         :param source_language_config: Configuration for source language. This parameter is optional.
         :param diarization: If set to True, the speaker diarization will be performed, which distinguishes different speakers in the audio. This parameter is optional.
+        :param stream_blob: If set to True, blob audio is streamed into the recognizer while it downloads instead of
+            being saved to a temporary file first. This parameter is optional.
+        :param trim_silence: If set to True, only the speech regions found by local voice-activity detection are sent
+            for recognition. Local files only: raises ValueError with blob_url alone. This parameter is optional.
+        :param transcript: A Transcript the recognized segments, with their offsets, speakers and languages, are
+            appended to. This parameter is optional.
         :return: Transcribed text from the audio source.
-        :raises ValueError: If neither file_path nor blob_url is provided, or if both language and auto_detect_source_language are provided.
+        :raises ValueError: If neither file_path nor blob_url is provided, if both language and auto_detect_source_language
+            are provided, or if trim_silence is set without file_path.
         """
         self._validate_inputs(
-            file_path, blob_url, language, auto_detect_source_language
+            file_path, blob_url, language, auto_detect_source_language, trim_silence
         )
 
-        if auto_detect_source_language:
-            auto_detect_source_language_config = (
-                speechsdk.languageconfig.AutoDetectSourceLanguageConfig(
-                    languages=auto_detect_supported_languages
-                    if auto_detect_supported_languages is not None
-                    else self.supported_languages
-                )
+        auto_detect_source_language_config = (
+            self._build_auto_detect_source_language_config(
+                auto_detect_source_language, auto_detect_supported_languages
+            )
+        )
+
+        if file_path and trim_silence:
+            return self._transcribe_trimmed_file(
+                file_path,
+                language,
+                source_language_config,
+                auto_detect_source_language_config,
+                diarization,
+                transcript,
             )
-        else:
-            auto_detect_source_language_config = None
 
         if file_path:
             return self._transcribe_from_file(
@@ -510,6 +1250,7 @@ class SpeechTranscriber(SpeechCoreTranslator):
                 source_language_config,
                 auto_detect_source_language_config,
                 diarization,
+                transcript=transcript,
             )
 
         return self._transcribe_from_blob(
@@ -518,8 +1259,166 @@ class SpeechTranscriber(SpeechCoreTranslator):
             source_language_config,
             auto_detect_source_language_config,
             diarization,
+            stream_blob,
+            transcript,
         )
 
+    def transcribe_long_audio_in_segments(
+        self,
+        file_path: str,
+        language: Optional[str] = None,
+        auto_detect_source_language: Optional[bool] = False,
+        auto_detect_supported_languages: Optional[List[str]] = None,
+        source_language_config: Optional[speechsdk.SourceLanguageConfig] = None,
+        diarization: Optional[bool] = False,
+        segment_seconds: float = 300.0,
+        max_segment_seconds: Optional[float] = None,
+        overlap_seconds: float = 3.0,
+        max_workers: int = 4,
+        transcript: Optional[Transcript] = None,
+    ) -> str:
+        """
+        Transcribes a long local recording by cutting it at silences into segments of about segment_seconds
+        and transcribing the segments in parallel sessions, so wall-clock time no longer grows with the
+        length of the recording. Each segment also receives overlap_seconds of audio from its neighbours;
+        the results are stitched back in order with original-recording offsets, speakers are linked across
+        segments through the overlaps, and utterances recognized twice at a join are kept once.
+
+        :param file_path: Path to the local audio file.
+        :param language: Language code for speech recognition (e.g., 'en-US'). This parameter is optional.
+        :param auto_detect_source_language: If set to True, the source language will be automatically detected from the
+            audio. This parameter is optional.
+        :param auto_detect_supported_languages: List of language codes that are supported for auto-detection (e.g.,
+            ['en-US', 'fr-FR']). This parameter is optional.
+        :param source_language_config: Configuration for source language. This parameter is optional.
+        :param diarization: If set to True, the transcribed text will include speaker identification. This parameter is
+            optional.
+        :param segment_seconds: The preferred segment length in seconds.
+        :param max_segment_seconds: The longest allowed segment, used when no silence is found. Defaults to 1.5 times
+            segment_seconds.
+        :param overlap_seconds: The audio shared by neighbouring segments, in seconds.
+        :param max_workers: The maximum number of concurrent transcription sessions.
+        :param transcript: A Transcript the stitched segments, with offsets (and word timings) in the original
+            recording, are appended to. This parameter is optional. Unlike the single-session paths, the
+            segments reach the transcript and its exporters only once every session has finished, since
+            speaker linking and deduplication at the joins need the neighbouring segments.
+        :return: Transcribed text from the audio file.
+        :raises ValueError: If file_path is not provided, or if both language and auto_detect_source_language are provided.
+        """
+        self._validate_inputs(file_path, None, language, auto_detect_source_language)
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+
+        auto_detect_source_language_config = (
+            self._build_auto_detect_source_language_config(
+                auto_detect_source_language, auto_detect_supported_languages
+            )
+        )
+
+        region_map = detect_speech_regions_in_file(file_path)
+        cuts = plan_segment_boundaries(region_map, segment_seconds, max_segment_seconds)
+        overlap = int(overlap_seconds * TARGET_SAMPLE_RATE)
+        segments = np.stack(
+            (
+                np.maximum(cuts[:-1] - overlap, 0),
+                np.minimum(cuts[1:] + overlap, region_map.total_samples),
+            ),
+            axis=1,
+        )
+        logger.info(
+            f"Splitting {file_path} ({region_map.report()['total_seconds']}s) into "
+            f"{len(segments)} segments for {max_workers} parallel sessions."
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            segment_paths = write_audio_segments(
+                file_path,
+                segments,
+                [
+                    os.path.join(temp_dir, f"segment_{index:05d}.wav")
+                    for index in range(len(segments))
+                ],
+            )
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                segment_records = list(
+                    executor.map(
+                        lambda path: self._transcribe_segment_records(
+                            path,
+                            language,
+                            source_language_config,
+                            auto_detect_source_language_config,
+                        ),
+                        segment_paths,
+                    )
+                )
+
+        utterances = stitch_segment_transcripts(
+            [
+                {
+                    "audio_start": start / TARGET_SAMPLE_RATE,
+                    "start": cut_start / TARGET_SAMPLE_RATE,
+                    "end": cut_end / TARGET_SAMPLE_RATE,
+                    "records": records,
+                }
+                for (start, _), cut_start, cut_end, records in zip(
+                    segments, cuts[:-1], cuts[1:], segment_records
+                )
+            ]
+        )
+        transcript = transcript if transcript is not None else Transcript()
+        for utterance in utterances:
+            transcript.append(
+                utterance["text"],
+                int(round(utterance["start"] * TICKS_PER_SECOND)),
+                int(round((utterance["end"] - utterance["start"]) * TICKS_PER_SECOND)),
+                utterance["speaker_id"],
+                utterance.get("language"),
+                utterance.get("words"),
+            )
+        return transcript.to_text(diarization)
+
+    def _transcribe_segment_records(
+        self,
+        file_path: str,
+        language: Optional[str],
+        source_language_config: Optional[speechsdk.SourceLanguageConfig],
+        auto_detect_source_language_config: Optional[SpeechConfig],
+    ) -> List[dict]:
+        """
+        Transcribes one segment of a long recording and returns its utterances with their timing.
+
+        :param file_path: Path to the segment audio file.
+        :param language: The language code for speech recognition (e.g., 'en-US'). If None or empty, the language will
+            not be set.
+        :param source_language_config: The configuration for specifying the source language.
+        :param auto_detect_source_language_config: The configuration for source language auto-detection.
+        :return: The recognized utterances, each with offset and duration in ticks, speaker_id, language, text
+            and words (with word_level_timestamps).
+        """
+        conversation_transcriber = self._create_conversation_transcriber(
+            speechsdk.AudioConfig(filename=os.path.abspath(file_path)),
+            language,
+            source_language_config,
+            auto_detect_source_language_config,
+        )
+        transcript = Transcript()
+
+        def transcribed_cb(evt: speechsdk.SpeechRecognitionEventArgs):
+            if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+                append_recognition_result(
+                    transcript, evt.result, with_words=self.word_level_timestamps
+                )
+
+        conversation_transcriber.transcribed.connect(transcribed_cb)
+        conversation_transcriber.canceled.connect(
+            conversation_transcriber_recognition_canceled_cb
+        )
+        errors = self._collect_cancellation_errors(conversation_transcriber)
+        self._run_transcriber(conversation_transcriber)
+        self._raise_on_cancellation_error(errors)
+        logger.info(f"Transcribed {len(transcript)} utterances from {file_path}.")
+        return transcript.to_records()
+
     def _transcribe_from_file(
         self,
         file_path: str,
@@ -527,6 +1426,8 @@ class SpeechTranscriber(SpeechCoreTranslator):
         source_language_config,
         auto_detect_source_language_config,
         diarization: bool = False,
+        region_map: Optional[SpeechRegionMap] = None,
+        transcript: Optional[Transcript] = None,
     ) -> str:
         """
         Helper function to transcribe from a local file.
@@ -535,6 +1436,9 @@ class SpeechTranscriber(SpeechCoreTranslator):
         :param language: Language code for speech recognition.
         :param source_language_config: Configuration for source language.
         :param auto_detect_source_language_config: Configuration for auto detecting source language.
+        :param region_map: Set when file_path holds only the speech regions of a longer recording; used to map offsets
+            back to it.
+        :param transcript: The Transcript to append the recognized segments to. A new one is used if None.
         :return: Transcribed text.
         """
         # Check if the path is absolute, if not convert it to absolute path
@@ -547,6 +1451,8 @@ class SpeechTranscriber(SpeechCoreTranslator):
             source_language_config,
             auto_detect_source_language_config,
             diarization,
+            region_map,
+            transcript,
         )
 
     def _transcribe_from_blob(
@@ -556,6 +1462,8 @@ class SpeechTranscriber(SpeechCoreTranslator):
         source_language_config,
         auto_detect_source_language_config,
         diarization: bool = False,
+        stream_blob: bool = False,
+        transcript: Optional[Transcript] = None,
     ) -> str:
         """
         Helper function to transcribe from a blob.
@@ -564,31 +1472,44 @@ class SpeechTranscriber(SpeechCoreTranslator):
         :param language: Language code for speech recognition.
         :param source_language_config: Configuration for source language.
         :param auto_detect_source_language_config: Configuration for auto detecting source language.
+        :param stream_blob: Whether to stream the blob into the recognizer instead of downloading it to a temporary file.
+        :param transcript: The Transcript to append the recognized segments to. A new one is used if None.
         :return: Transcribed text, or None if blob client could not be created.
         """
-        blob_client = self.get_blob_client_from_url(blob_url)
-        if blob_client is None:
-            return None
+        if stream_blob:
+            blob_stream = self._open_blob_audio_stream(blob_url)
+            if blob_stream is None:
+                return None
+            audio_config, pull_callback = blob_stream
+            try:
+                text = self._transcribe(
+                    audio_config,
+                    language,
+                    source_language_config,
+                    auto_detect_source_language_config,
+                    diarization,
+                    transcript=transcript,
+                )
+                pull_callback.raise_if_failed()
+                return text
+            finally:
+                pull_callback.close()
 
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            download_stream = blob_client.download_blob()
-            temp_file.write(download_stream.readall())
-            audio_config = speechsdk.AudioConfig(filename=temp_file.name)
+        temp_file_name = self._download_blob_to_temp_file(blob_url)
+        if temp_file_name is None:
+            return None
 
         try:
             result = self._transcribe(
-                audio_config,
+                speechsdk.AudioConfig(filename=temp_file_name),
                 language,
                 source_language_config,
                 auto_detect_source_language_config,
                 diarization,
+                transcript=transcript,
             )
         finally:
-            try:
-                os.remove(temp_file.name)
-                logger.info(f"Deleted temporary file: {temp_file.name}")
-            except OSError as e:
-                logger.warning(f"Error deleting temporary file: {e}")
+            self._remove_temp_file(temp_file_name)
 
         return result
 
@@ -599,6 +1520,8 @@ class SpeechTranscriber(SpeechCoreTranslator):
         source_language_config: Optional[speechsdk.SourceLanguageConfig],
         auto_detect_source_language_config: Optional[SpeechConfig],
         diarization: bool = False,
+        region_map: Optional[SpeechRegionMap] = None,
+        transcript: Optional[Transcript] = None,
     ) -> str:
         """
         Transcribes audio from a given audio configuration. If diarization is enabled, the transcribed text will
@@ -619,15 +1542,137 @@ class SpeechTranscriber(SpeechCoreTranslator):
         :param source_language_config: The configuration for specifying the source language.
         :param auto_detect_source_language_config: The configuration for source language auto-detection.
         :param diarization: Whether to enable diarization. If True, the transcribed text will include speaker identification.
+        :param region_map: Set when the audio holds only the speech regions of a longer recording; used to map offsets
+            back to it.
+        :param transcript: The Transcript to append the recognized segments to. A new one is used if None.
         :return: The transcribed text from the audio source. If diarization is enabled, the text will include speaker identification.
         """
         logger.info("Transcribing with diarization")
 
+        conversation_transcriber = self._create_conversation_transcriber(
+            audio_config,
+            language,
+            source_language_config,
+            auto_detect_source_language_config,
+        )
+        transcript, errors = self._connect_transcriber_callbacks(
+            conversation_transcriber,
+            diarization,
+            region_map,
+            transcript,
+            self.word_level_timestamps,
+        )
+
+        self._run_transcriber(conversation_transcriber)
+        self._raise_on_cancellation_error(errors)
+
+        return transcript.to_text(diarization)
+
+    @staticmethod
+    def _run_transcriber(
+        conversation_transcriber: speechsdk.transcription.ConversationTranscriber,
+    ):
+        """
+        Starts the conversation transcriber and blocks until its session is stopped or canceled.
+
+        :param conversation_transcriber: The conversation transcriber, with its callbacks connected.
+        """
+        transcribing_stop = threading.Event()
+
+        def stop_cb(evt: speechsdk.SessionEventArgs):
+            transcribing_stop.set()
+            logger.info(f"CLOSING on {evt}")
+
+        # Stop transcribing on either session stopped or canceled events
+        conversation_transcriber.session_stopped.connect(stop_cb)
+        conversation_transcriber.canceled.connect(stop_cb)
+
+        # Start transcribing
+        conversation_transcriber.start_transcribing_async()
+
+        # Wait for completion
+        transcribing_stop.wait()
+
+        # Stop transcribing
+        conversation_transcriber.stop_transcribing_async()
+
+    async def _transcribe_async(
+        self,
+        audio_config: AudioConfig,
+        language: Optional[str],
+        source_language_config: Optional[speechsdk.SourceLanguageConfig],
+        auto_detect_source_language_config: Optional[SpeechConfig],
+        diarization: bool = False,
+        region_map: Optional[SpeechRegionMap] = None,
+        transcript: Optional[Transcript] = None,
+    ) -> str:
+        """
+        Asynchronous version of _transcribe. The session end is awaited through a future resolved by the
+        conversation transcriber's session_stopped/canceled callbacks, so no thread is held while waiting.
+
+        :param audio_config: The audio configuration, which specifies the audio source for the transcription.
+        :param language: The language code for speech recognition (e.g., 'en-US'). If None or empty, the language will
+            not be set.
+        :param source_language_config: The configuration for specifying the source language.
+        :param auto_detect_source_language_config: The configuration for source language auto-detection.
+        :param diarization: Whether to enable diarization. If True, the transcribed text will include speaker
+            identification.
+        :param region_map: Set when the audio holds only the speech regions of a longer recording; used to map offsets
+            back to it.
+        :param transcript: The Transcript to append the recognized segments to. A new one is used if None.
+        :return: The transcribed text from the audio source. If diarization is enabled, the text will include speaker
+            identification.
+        """
+        logger.info("Transcribing with diarization")
+
+        conversation_transcriber = self._create_conversation_transcriber(
+            audio_config,
+            language,
+            source_language_config,
+            auto_detect_source_language_config,
+        )
+        transcript, errors = self._connect_transcriber_callbacks(
+            conversation_transcriber,
+            diarization,
+            region_map,
+            transcript,
+            self.word_level_timestamps,
+        )
+        session_end = session_end_future(conversation_transcriber)
+
+        try:
+            await await_sdk_future(conversation_transcriber.start_transcribing_async())
+            evt = await session_end
+            logger.info(f"CLOSING on {evt}")
+        finally:
+            # Also stop the session when the awaiting task is cancelled
+            await await_sdk_future(conversation_transcriber.stop_transcribing_async())
+        self._raise_on_cancellation_error(errors)
+
+        return transcript.to_text(diarization)
+
+    def _create_conversation_transcriber(
+        self,
+        audio_config: AudioConfig,
+        language: Optional[str],
+        source_language_config: Optional[speechsdk.SourceLanguageConfig],
+        auto_detect_source_language_config: Optional[SpeechConfig],
+    ) -> speechsdk.transcription.ConversationTranscriber:
+        """
+        Initializes the conversation transcriber with the given speech configuration, audio configuration,
+        source language configuration, and auto-detect source language configuration.
+
+        :param audio_config: The audio configuration, which specifies the audio source for the transcription.
+        :param language: The language code for speech recognition (e.g., 'en-US'). If None or empty, the language will
+            not be set.
+        :param source_language_config: The configuration for specifying the source language.
+        :param auto_detect_source_language_config: The configuration for source language auto-detection.
+        :return: The conversation transcriber.
+        """
         # Setup the audio configuration using the file path
         if language and language.strip():
             self.speech_config.speech_recognition_language = language
 
-        # Initialize the conversation transcriber
         conversation_transcriber = speechsdk.transcription.ConversationTranscriber(
             speech_config=self.speech_config,
             audio_config=audio_config,
@@ -641,36 +1686,44 @@ class SpeechTranscriber(SpeechCoreTranslator):
         conversation_transcriber.properties.set_property(
             speechsdk.PropertyId.CancellationDetails_ReasonText, "true"
         )
+        return conversation_transcriber
 
-        transcribing_stop = False
-        final_transcript = ""  # Variable to store the final transcript
-
-        if diarization:
-
-            def transcribed_cb(evt: speechsdk.SpeechRecognitionEventArgs):
-                nonlocal final_transcript
-                if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                    final_transcript += (
-                        f"Speaker {evt.result.speaker_id}: {evt.result.text}\n"
-                    )
-                    logger.info(f"Updated final text: {final_transcript}")
-
-        else:
-
-            def transcribed_cb(evt: speechsdk.SpeechRecognitionEventArgs):
-                nonlocal final_transcript
-                if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                    final_transcript += " " + evt.result.text
-                    logger.info(f"Updated final text: {final_transcript}")
+    @staticmethod
+    def _connect_transcriber_callbacks(
+        conversation_transcriber: speechsdk.transcription.ConversationTranscriber,
+        diarization: bool,
+        region_map: Optional[SpeechRegionMap] = None,
+        transcript: Optional[Transcript] = None,
+        with_words: bool = False,
+    ) -> Tuple[Transcript, List[str]]:
+        """
+        Connects the logging and transcript callbacks to the events fired by the conversation transcriber.
+
+        :param conversation_transcriber: The conversation transcriber.
+        :param diarization: Whether the transcript view prefixes each segment with its speaker identification.
+        :param region_map: Set when the audio holds only the speech regions of a longer recording; used to map offsets
+            back to it.
+        :param transcript: The Transcript to append the recognized segments to. A new one is used if None.
+        :param with_words: Whether to keep the word timings of the detailed results.
+        :return: The transcript the segments are appended to as they are recognized, and the list the error details
+            of a canceled session are collected in.
+        """
+        if transcript is None:
+            transcript = Transcript(diarization=diarization)
 
-        def stop_cb(evt: speechsdk.SessionEventArgs):
-            nonlocal transcribing_stop
-            transcribing_stop = True
-            logger.info(f"CLOSING on {evt}")
+        def transcribed_cb(evt: speechsdk.SpeechRecognitionEventArgs):
+            if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+                offset = append_recognition_result(
+                    transcript, evt.result, region_map, with_words
+                )
+                speaker = f"Speaker {evt.result.speaker_id}: " if diarization else ""
+                logger.info(
+                    f"Updated final text at {offset / TICKS_PER_SECOND:.2f}s: "
+                    f"{speaker}{evt.result.text}"
+                )
 
-        # Connect callbacks to the events fired by the conversation transcriber
         conversation_transcriber.transcribing.connect(
-            conversation_transcriber_transcribing_started_cb
+            rate_limited_event_logger("TRANSCRIBING")
         )
         conversation_transcriber.transcribed.connect(transcribed_cb)
         conversation_transcriber.session_started.connect(
@@ -682,25 +1735,45 @@ class SpeechTranscriber(SpeechCoreTranslator):
         conversation_transcriber.canceled.connect(
             conversation_transcriber_recognition_canceled_cb
         )
+        errors = SpeechTranscriber._collect_cancellation_errors(
+            conversation_transcriber
+        )
+        return transcript, errors
 
-        # Stop transcribing on either session stopped or canceled events
-        conversation_transcriber.session_stopped.connect(stop_cb)
-        conversation_transcriber.canceled.connect(stop_cb)
+    @staticmethod
+    def _collect_cancellation_errors(
+        conversation_transcriber: speechsdk.transcription.ConversationTranscriber,
+    ) -> List[str]:
+        """
+        Connects a callback that keeps the error details of a session canceled with an error.
 
-        # Start transcribing
-        conversation_transcriber.start_transcribing_async()
+        :param conversation_transcriber: The conversation transcriber.
+        :return: The list the error details are appended to.
+        """
+        errors = []
 
-        # Wait for completion
-        while not transcribing_stop:
-            time.sleep(0.1)
+        def canceled_cb(
+            evt: speechsdk.transcription.ConversationTranscriptionCanceledEventArgs,
+        ):
+            details = evt.cancellation_details
+            if details.reason == speechsdk.CancellationReason.Error:
+                logger.error(f"Error details: {details.error_details}")
+                errors.append(details.error_details)
 
-        # Stop transcribing
-        conversation_transcriber.stop_transcribing_async()
+        conversation_transcriber.canceled.connect(canceled_cb)
+        return errors
 
-        if diarization:
-            return final_transcript
-        else:
-            return final_transcript.strip()
+    @staticmethod
+    def _raise_on_cancellation_error(errors: List[str]):
+        """
+        Raises if the session was canceled with an error, since continuous transcription reports service errors
+        through the canceled event rather than as exceptions. Without this, a failed session would return its
+        partial transcript as if it had succeeded.
+
+        :param errors: The error details collected by _collect_cancellation_errors.
+        """
+        if errors:
+            raise RuntimeError(f"Transcription canceled: {'; '.join(errors)}")
 
 
 def main():
@@ -708,18 +1781,40 @@ def main():
         description="Transcribe speech from an audio file."
     )
     parser.add_argument("--file", required=True, help="The path to the audio file.")
+    parser.add_argument(
+        "--output",
+        action="append",
+        default=[],
+        help="Stream the transcript to a .jsonl, .srt or .vtt file as it is recognized. Can be repeated.",
+    )
+    parser.add_argument(
+        "--word-timestamps",
+        action="store_true",
+        help="Request word-level timestamps, used to split long captions and included in JSON lines.",
+    )
     args = parser.parse_args()
 
-    transcriber = SpeechTranscriber()
+    transcriber = SpeechTranscriber(word_level_timestamps=args.word_timestamps)
 
     if not os.path.isfile(args.file):
         logger.error(f"File {args.file} not found.")
         return
 
+    exporters = [create_exporter(path) for path in args.output]
+    # When exporting, segments go straight to the files and are not kept in memory
+    transcript = Transcript(exporters=exporters, keep_segments=not exporters)
     try:
-        logger.info(transcriber.transcribe_speech_from_file_continuous(args.file))
+        text = transcriber.transcribe_speech_from_file_continuous(
+            args.file, transcript=transcript
+        )
+        if text:
+            logger.info(text)
+        logger.info(f"Recognized {transcript.appended_segments} segments.")
     except Exception as e:
         logger.error(f"Failed to transcribe audio file: {e}")
+    finally:
+        for exporter in exporters:
+            exporter.close()
 
 
 if __name__ == "__main__":
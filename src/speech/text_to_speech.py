@@ -1,11 +1,19 @@
+import io
 import os
-from typing import Optional
+import queue
+import re
+import threading
+import time
+import wave
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 import azure.cognitiveservices.speech as speechsdk
+import numpy as np
 from azure.cognitiveservices.speech import SpeechConfig, SpeechSynthesisResult
 from azure.cognitiveservices.speech.audio import AudioOutputConfig
 from dotenv import load_dotenv
 
+from utils.cache import TieredCache, make_cache_key
 from utils.ml_logging import get_logger
 
 # Set up logger
@@ -15,33 +23,177 @@ logger = get_logger()
 load_dotenv()
 
 
+def play_wav_bytes(audio_data: bytes) -> bool:
+    """
+    Plays WAV audio on the default output device and waits until playback ends.
+
+    Args:
+        audio_data (bytes): A complete RIFF/WAV file with 16-bit PCM samples.
+
+    Returns:
+        bool: True if the audio was played, False if no playback device is available.
+    """
+    try:
+        import sounddevice
+    except (ImportError, OSError) as e:
+        logger.warning(f"Cannot play cached audio, sounddevice is unavailable: {e}")
+        return False
+
+    with wave.open(io.BytesIO(audio_data), "rb") as wav_file:
+        samples = np.frombuffer(
+            wav_file.readframes(wav_file.getnframes()), dtype=np.int16
+        ).reshape(-1, wav_file.getnchannels())
+        sounddevice.play(samples, wav_file.getframerate())
+    sounddevice.wait()
+    return True
+
+
+class CachedSpeechSynthesisResult:
+    """
+    Stands in for a SpeechSynthesisResult when the audio is served from the synthesis cache.
+    """
+
+    def __init__(self, audio_data: bytes):
+        self.audio_data = audio_data
+        self.reason = speechsdk.ResultReason.SynthesizingAudioCompleted
+        self.cancellation_details = None
+
+
 class SpeechSynthesizer:
-    def __init__(self, key: str = None, region: str = None):
+    def __init__(
+        self,
+        key: str = None,
+        region: str = None,
+        voice_name: str = "en-US-JennyNeural",
+        output_format: speechsdk.SpeechSynthesisOutputFormat = speechsdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm,
+        cache: Optional[TieredCache] = None,
+    ):
+        """
+        Initializes a new instance of the SpeechSynthesizer class.
+
+        Args:
+            key (str, optional): The Azure Speech key. Defaults to the SPEECH_KEY environment variable.
+            region (str, optional): The Azure Speech region. Defaults to the SPEECH_REGION environment variable.
+            voice_name (str, optional): The synthesis voice. Defaults to "en-US-JennyNeural".
+            output_format (speechsdk.SpeechSynthesisOutputFormat, optional): The audio format. Cached audio is played
+                locally, so it should be a RIFF PCM format. Defaults to Riff24Khz16BitMonoPcm.
+            cache (TieredCache, optional): A cache of synthesized audio keyed by text, voice and output format.
+                Every phrase is synthesized by the service if None.
+        """
         self.key = key if key is not None else os.getenv("SPEECH_KEY")
         self.region = region if region is not None else os.getenv("SPEECH_REGION")
+        self.voice_name = voice_name
+        self.output_format = output_format
+        self.cache = cache
         self.synthesizer = self.create_speech_synthesizer()
+        self._silent_synthesizer = None
+        self._local_playback = True
 
-    def create_speech_synthesizer(self) -> speechsdk.SpeechSynthesizer:
+    def create_speech_synthesizer(
+        self, use_default_speaker: bool = True
+    ) -> speechsdk.SpeechSynthesizer:
         """
         Creates a speech synthesizer with the given Azure key and region.
+
+        Args:
+            use_default_speaker (bool, optional): Whether audio is played on the default speaker. If False, the
+                audio is only returned in the result. Defaults to True.
         """
         speech_config = SpeechConfig(subscription=self.key, region=self.region)
-        audio_config = AudioOutputConfig(use_default_speaker=True)
-        speech_config.speech_synthesis_voice_name = "en-US-JennyNeural"
+        audio_config = (
+            AudioOutputConfig(use_default_speaker=True) if use_default_speaker else None
+        )
+        speech_config.speech_synthesis_voice_name = self.voice_name
+        speech_config.set_speech_synthesis_output_format(self.output_format)
 
         return speechsdk.SpeechSynthesizer(
             speech_config=speech_config, audio_config=audio_config
         )
 
-    def synthesize_speech(self, text: str) -> Optional[SpeechSynthesisResult]:
+    def _cache_key(self, text: str) -> str:
+        return make_cache_key(text, self.voice_name, self.output_format.name)
+
+    def prewarm_cache(self, prompts: Iterable[str]) -> int:
+        """
+        Synthesizes known prompts ahead of time so they are served from the cache when first needed.
+        The audio is not played.
+
+        Args:
+            prompts (Iterable[str]): The prompts to synthesize, e.g. fixed greetings and goodbyes.
+
+        Returns:
+            int: The number of prompts that were synthesized, i.e. that were not cached yet.
+        """
+        if self.cache is None:
+            logger.warning("No synthesis cache configured, nothing to pre-warm.")
+            return 0
+
+        warmed = 0
+        for text in prompts:
+            key = self._cache_key(text)
+            if self.cache.get(key) is not None:
+                continue
+            if self._silent_synthesizer is None:
+                self._silent_synthesizer = self.create_speech_synthesizer(
+                    use_default_speaker=False
+                )
+            result = self._speak(self._silent_synthesizer, text)
+            if result is not None:
+                self.cache.set(key, result.audio_data)
+                warmed += 1
+        logger.info(f"Pre-warmed the synthesis cache with {warmed} prompts.")
+        return warmed
+
+    def synthesize_speech(
+        self, text: str, cache_result: bool = True
+    ) -> Optional[SpeechSynthesisResult]:
         """
         Synthesizes speech from the provided text using the Azure Speech SDK.
 
         This method uses the SpeechSynthesizer instance created during the initialization of the class.
         It converts the input text into speech and returns the result as a SpeechSynthesisResult object.
         If the synthesis fails for any reason, it returns None and logs the error details.
+        When a cache is configured and already holds the phrase, the cached audio is played locally and
+        returned as a CachedSpeechSynthesisResult, without a round trip to the service. If local playback
+        is unavailable (no sounddevice or no output device), the phrase is synthesized to the speaker by the
+        service instead, for this and every later call.
+
+        Args:
+            text (str): The text to be converted into speech.
+            cache_result (bool, optional): Whether to add a newly synthesized phrase to the cache. Pass False
+                for one-off text, such as generated replies, so it does not evict the reusable prompts. Phrases
+                already cached are served from the cache either way. Defaults to True.
+
+        Returns:
+            Optional[SpeechSynthesisResult]: The result of the speech synthesis operation, or None if the synthesis failed.
+        """
+        key = self._cache_key(text) if self.cache is not None else None
+        if key is not None:
+            audio_data = self.cache.get(key)
+            if audio_data is not None:
+                if self._local_playback:
+                    logger.info(f"Playing cached speech for text: {text[:30]}...")
+                    if play_wav_bytes(audio_data):
+                        return CachedSpeechSynthesisResult(audio_data)
+                    logger.warning(
+                        "Cached speech cannot be played locally, falling back to the service."
+                    )
+                    self._local_playback = False
+                return self._speak(self.synthesizer, text)
+
+        speech_synthesis_result = self._speak(self.synthesizer, text)
+        if speech_synthesis_result is not None and key is not None and cache_result:
+            self.cache.set(key, speech_synthesis_result.audio_data)
+        return speech_synthesis_result
+
+    def _speak(
+        self, synthesizer: speechsdk.SpeechSynthesizer, text: str
+    ) -> Optional[SpeechSynthesisResult]:
+        """
+        Synthesizes text with the given synthesizer and logs any failure.
 
         Args:
+            synthesizer (speechsdk.SpeechSynthesizer): The synthesizer to use.
             text (str): The text to be converted into speech.
 
         Returns:
@@ -49,7 +201,7 @@ class SpeechSynthesizer:
         """
         try:
             logger.info(f"Synthesizing speech for text: {text[:30]}...")
-            speech_synthesis_result = self.synthesizer.speak_text_async(text).get()
+            speech_synthesis_result = synthesizer.speak_text_async(text).get()
 
             if (
                 speech_synthesis_result.reason
@@ -71,3 +223,149 @@ class SpeechSynthesizer:
         except Exception as e:
             logger.error(f"An error occurred during speech synthesis: {e}")
             return None
+
+
+# A sentence ends at terminal punctuation, optionally followed by closing quotes or brackets, then whitespace
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?\u2026])[\"')\]]*\s+")
+
+
+def split_sentences(text: str, min_chars: int = 12) -> Tuple[List[str], str]:
+    """
+    Splits the complete sentences off the front of a text buffer.
+
+    Args:
+        text (str): The buffered text.
+        min_chars (int, optional): Sentences shorter than this are joined with the next one, so that
+            abbreviations such as "Dr." and very short fragments are not synthesized on their own. Defaults to 12.
+
+    Returns:
+        Tuple[List[str], str]: The complete sentences and the unfinished remainder.
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_BOUNDARY.finditer(text):
+        end = match.end()
+        sentence = text[start:end].strip()
+        if len(sentence) >= min_chars:
+            sentences.append(sentence)
+            start = end
+    return sentences, text[start:]
+
+
+def iter_sentences(chunks: Iterable[str], min_chars: int = 12) -> Iterator[str]:
+    """
+    Re-chunks a stream of text fragments (e.g. streamed model tokens) into sentences, yielding each one
+    as soon as it is complete.
+
+    Args:
+        chunks (Iterable[str]): The text fragments, in order.
+        min_chars (int, optional): The minimum sentence length, see split_sentences. Defaults to 12.
+
+    Yields:
+        str: The sentences, followed by any unterminated remainder.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        sentences, buffer = split_sentences(buffer, min_chars)
+        yield from sentences
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def first_byte_latency_seconds(result) -> float:
+    """
+    Reads the service-side latency until the first audio byte from a synthesis result.
+
+    Args:
+        result: A SpeechSynthesisResult, or a CachedSpeechSynthesisResult (whose latency is zero).
+
+    Returns:
+        float: The latency in seconds, or 0.0 if it is not reported.
+    """
+    properties = getattr(result, "properties", None)
+    if properties is None:
+        return 0.0
+    latency_ms = properties.get_property(
+        speechsdk.PropertyId.SpeechServiceResponse_SynthesisFirstByteLatencyMs
+    )
+    try:
+        return float(latency_ms) / 1000
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class SentenceSpeechPipeline:
+    """
+    Speaks a reply sentence by sentence while the rest of it is still being produced.
+
+    The reply text is consumed on the calling thread and split into sentences, which are queued to a
+    worker thread that synthesizes and plays them in order. Audio for the first sentence therefore
+    starts as soon as that sentence is complete, instead of after the whole reply has been generated
+    and synthesized. Generated sentences rarely repeat, so they are not added to the synthesis cache,
+    but a sentence that is already cached, e.g. a pre-warmed prompt, is played from it.
+    """
+
+    def __init__(self, synthesizer: SpeechSynthesizer, min_sentence_chars: int = 12):
+        """
+        Initializes a new instance of the SentenceSpeechPipeline class.
+
+        Args:
+            synthesizer (SpeechSynthesizer): The synthesizer used for every sentence.
+            min_sentence_chars (int, optional): The minimum sentence length, see split_sentences. Defaults to 12.
+        """
+        self.synthesizer = synthesizer
+        self.min_sentence_chars = min_sentence_chars
+
+    def speak(self, chunks: Iterable[str], turn_start: Optional[float] = None) -> dict:
+        """
+        Speaks a reply given as a stream of text fragments, or as a single-item list with the full reply.
+
+        Args:
+            chunks (Iterable[str]): The reply text fragments, in order.
+            turn_start (float, optional): The time.perf_counter() value the turn started at, e.g. when the
+                user's prompt was recognized. Defaults to the time this method is called.
+
+        Returns:
+            dict: The spoken text, the number of sentences, time_to_first_audio_seconds (None if nothing
+            was spoken) and total_seconds, both measured from turn_start.
+        """
+        turn_start = turn_start if turn_start is not None else time.perf_counter()
+        sentences: "queue.Queue[Optional[str]]" = queue.Queue()
+        metrics = {"sentences": 0, "time_to_first_audio_seconds": None}
+
+        def synthesize_sentences():
+            while True:
+                sentence = sentences.get()
+                if sentence is None:
+                    return
+                submitted = time.perf_counter()
+                result = self.synthesizer.synthesize_speech(
+                    sentence, cache_result=False
+                )
+                if result is None:
+                    continue
+                metrics["sentences"] += 1
+                if metrics["time_to_first_audio_seconds"] is None:
+                    metrics["time_to_first_audio_seconds"] = round(
+                        submitted - turn_start + first_byte_latency_seconds(result), 3
+                    )
+
+        worker = threading.Thread(target=synthesize_sentences, daemon=True)
+        worker.start()
+        spoken = []
+        try:
+            for sentence in iter_sentences(chunks, self.min_sentence_chars):
+                spoken.append(sentence)
+                sentences.put(sentence)
+        finally:
+            sentences.put(None)
+            worker.join()
+
+        metrics["text"] = " ".join(spoken)
+        metrics["total_seconds"] = round(time.perf_counter() - turn_start, 3)
+        logger.info(
+            f"Spoke {metrics['sentences']} sentences, time to first audio: "
+            f"{metrics['time_to_first_audio_seconds']}s, total: {metrics['total_seconds']}s."
+        )
+        return metrics
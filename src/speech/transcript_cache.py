@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import threading
+import urllib.parse
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.speech.speech_to_text import SpeechCoreTranslator, SpeechTranscriber
+from src.speech.utils_transcript import Transcript, TranscriptSegment
+from utils.cache import TieredCache, make_cache_key
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+HASH_CHUNK_BYTES = 1024 * 1024
+# Part of every cache key, so entries written in an older layout are never read back
+CACHE_ENTRY_FORMAT = "text+segments"
+
+
+def hash_audio_file(file_path: str) -> str:
+    """
+    Computes the SHA-256 digest of an audio file's bytes, reading it in chunks.
+
+    Args:
+        file_path (str): Path to the audio file.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as audio_file:
+        for chunk in iter(lambda: audio_file.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _SegmentRecorder:
+    """
+    A transcript exporter that keeps the segments as records, so they can be cached and replayed.
+    """
+
+    def __init__(self):
+        self.records: List[dict] = []
+
+    def write_segment(self, segment: TranscriptSegment):
+        self.records.append(
+            {
+                "offset": segment.offset,
+                "duration": segment.duration,
+                "speaker_id": segment.speaker_id,
+                "language": segment.language,
+                "text": segment.text,
+                "words": segment.words,
+            }
+        )
+
+
+class CachedTranscriber:
+    """
+    A content-addressed cache in front of transcribe_speech_from_file_continuous.
+
+    Entries are keyed by the audio content and by the settings that change the transcript: the
+    transcriber class, language, auto-detect candidates, diarization and silence trimming. Local files
+    are identified by the SHA-256 of their bytes; blobs by their ETag, so a hit costs one metadata
+    request and no download. Transcripts are kept in an in-memory LRU and, optionally, in a
+    size-bounded directory shared across runs.
+
+    Each entry also holds the recognized segments, so a hit replays them into the caller's transcript=
+    argument, and its exporters, just as a transcription would have.
+    """
+
+    def __init__(
+        self,
+        transcriber: Optional[SpeechCoreTranslator] = None,
+        cache: Optional[TieredCache] = None,
+        cache_directory: Optional[str] = None,
+        memory_items: int = 1024,
+        disk_bytes: int = 256 * 1024 * 1024,
+        max_file_digests: int = 4096,
+    ):
+        """
+        Initializes a new instance of the CachedTranscriber class.
+
+        Args:
+            transcriber (SpeechCoreTranslator, optional): The transcriber to cache. Defaults to a new SpeechTranscriber.
+            cache (TieredCache, optional): The cache to use. Defaults to a new TieredCache built from the arguments below.
+            cache_directory (str, optional): The directory of the disk tier. Memory only if None.
+            memory_items (int, optional): The number of transcripts kept in memory. Defaults to 1024.
+            disk_bytes (int, optional): The size budget of the disk tier. Defaults to 256 MiB.
+            max_file_digests (int, optional): The number of local file digests remembered, least recently
+                used first out. Defaults to 4096.
+        """
+        self.transcriber = transcriber or SpeechTranscriber()
+        self.cache = cache or TieredCache(
+            memory_items=memory_items,
+            disk_directory=cache_directory,
+            disk_bytes=disk_bytes,
+        )
+        # Files already hashed in this process, keyed by (path, size, mtime)
+        self._file_digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self.max_file_digests = max_file_digests
+        self._lock = threading.Lock()
+        self._bypassed = 0
+
+    def transcribe_speech_from_file_continuous(
+        self,
+        file_path: Optional[str] = None,
+        blob_url: Optional[str] = None,
+        language: Optional[str] = None,
+        auto_detect_source_language: Optional[bool] = False,
+        auto_detect_supported_languages: Optional[List[str]] = None,
+        source_language_config=None,
+        diarization: Optional[bool] = False,
+        **kwargs,
+    ) -> Optional[str]:
+        """
+        Returns the cached transcript of the audio if there is one, otherwise transcribes it and caches
+        the result. Empty or failed transcriptions are not cached.
+
+        Calls with a source_language_config bypass the cache, since the SDK object cannot be keyed.
+
+        Args:
+            file_path (str, optional): Path to the local audio file.
+            blob_url (str, optional): URL of the blob containing the audio file.
+            language (str, optional): Language code for speech recognition.
+            auto_detect_source_language (bool, optional): Whether the source language is detected automatically.
+            auto_detect_supported_languages (List[str], optional): The candidate languages for auto-detection.
+            source_language_config (speechsdk.SourceLanguageConfig, optional): Configuration for source language.
+            diarization (bool, optional): Whether to include speaker identification.
+            **kwargs: Extra keyword arguments for the transcriber (e.g. stream_blob, trim_silence, transcript).
+
+        Returns:
+            str: The transcript, or None if the transcription failed.
+        """
+        transcription_kwargs = dict(
+            file_path=file_path,
+            blob_url=blob_url,
+            language=language,
+            auto_detect_source_language=auto_detect_source_language,
+            auto_detect_supported_languages=auto_detect_supported_languages,
+            source_language_config=source_language_config,
+            diarization=diarization,
+            **kwargs,
+        )
+        audio_id = None
+        if source_language_config is None:
+            audio_id = self._audio_id(file_path, blob_url)
+        if audio_id is None:
+            with self._lock:
+                self._bypassed += 1
+            return self.transcriber.transcribe_speech_from_file_continuous(
+                **transcription_kwargs
+            )
+
+        if auto_detect_source_language:
+            candidates = sorted(
+                auto_detect_supported_languages
+                if auto_detect_supported_languages is not None
+                else self.transcriber.supported_languages
+            )
+        else:
+            candidates = None
+        key = make_cache_key(
+            audio_id,
+            type(self.transcriber).__name__,
+            language,
+            candidates,
+            bool(diarization),
+            bool(kwargs.get("trim_silence")),
+            # Changes the cached segments, not the text
+            getattr(self.transcriber, "word_level_timestamps", False),
+            CACHE_ENTRY_FORMAT,
+        )
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"Transcript cache hit for {file_path or blob_url}.")
+            entry = json.loads(cached)
+            if kwargs.get("transcript") is not None:
+                self._replay_segments(kwargs["transcript"], entry["segments"])
+            return entry["text"]
+
+        segments = kwargs.get("transcript")
+        if segments is None:
+            segments = transcription_kwargs["transcript"] = Transcript(
+                diarization=bool(diarization)
+            )
+        recorder = _SegmentRecorder()
+        segments.exporters.append(recorder)
+        try:
+            transcript = self.transcriber.transcribe_speech_from_file_continuous(
+                **transcription_kwargs
+            )
+        finally:
+            segments.exporters.remove(recorder)
+        if transcript:
+            entry = {"text": transcript, "segments": recorder.records}
+            self.cache.set(key, json.dumps(entry).encode("utf-8"))
+        return transcript
+
+    @staticmethod
+    def _replay_segments(transcript: Transcript, records: List[dict]):
+        """
+        Appends cached segment records to a transcript, which also hands them to its exporters.
+
+        Args:
+            transcript (Transcript): The caller's transcript.
+            records (List[dict]): The cached segment records.
+        """
+        for record in records:
+            words = record["words"]
+            transcript.append(
+                record["text"],
+                record["offset"],
+                record["duration"],
+                record["speaker_id"],
+                record["language"],
+                [tuple(word) for word in words] if words is not None else None,
+            )
+
+    def _audio_id(
+        self, file_path: Optional[str], blob_url: Optional[str]
+    ) -> Optional[str]:
+        """
+        Identifies the audio content: a content hash for local files, the ETag for blobs.
+
+        Args:
+            file_path (str, optional): Path to the local audio file.
+            blob_url (str, optional): URL of the blob containing the audio file.
+
+        Returns:
+            str: The audio identifier, or None if it could not be determined.
+        """
+        if file_path:
+            try:
+                stat = os.stat(file_path)
+            except OSError as e:
+                logger.warning(f"Cannot hash {file_path}, bypassing the cache: {e}")
+                return None
+            file_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+            with self._lock:
+                digest = self._file_digests.get(file_key)
+                if digest is not None:
+                    self._file_digests.move_to_end(file_key)
+            if digest is None:
+                digest = hash_audio_file(file_path)
+                with self._lock:
+                    self._file_digests[file_key] = digest
+                    while len(self._file_digests) > self.max_file_digests:
+                        self._file_digests.popitem(last=False)
+            return f"sha256:{digest}"
+
+        if blob_url:
+            blob_client = self.transcriber.get_blob_client_from_url(blob_url)
+            if blob_client is None:
+                return None
+            try:
+                etag = blob_client.get_blob_properties().etag
+            except Exception as e:
+                logger.warning(
+                    f"Cannot read the ETag of {blob_url}, bypassing the cache: {e}"
+                )
+                return None
+            # Drop any SAS token so the key does not change when it is rotated
+            parsed_url = urllib.parse.urlparse(blob_url)
+            return f"etag:{parsed_url.netloc}{parsed_url.path}:{etag}"
+
+        return None
+
+    def get_stats(self) -> dict:
+        """
+        Reports the cache statistics, plus the number of calls that bypassed the cache.
+
+        Returns:
+            dict: Hits per tier, misses, hit ratio, tier sizes and bypassed calls.
+        """
+        stats = self.cache.get_stats()
+        with self._lock:
+            stats["bypassed"] = self._bypassed
+        return stats
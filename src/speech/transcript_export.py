@@ -0,0 +1,261 @@
+import abc
+import json
+import os
+import threading
+from typing import List, Optional, Tuple
+
+from src.speech.utils_transcript import TICKS_PER_SECOND, TranscriptSegment
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+EXPORT_JSONL = "jsonl"
+EXPORT_SRT = "srt"
+EXPORT_VTT = "vtt"
+
+# A caption cue: (start, end, text), with start and end in 100-nanosecond ticks
+Cue = Tuple[int, int, str]
+
+
+def format_timestamp(ticks: int, decimal_separator: str = ".") -> str:
+    """
+    Formats an offset in 100-nanosecond ticks as HH:MM:SS.mmm.
+
+    Args:
+        ticks (int): The offset.
+        decimal_separator (str, optional): "," for SRT, "." for WebVTT. Defaults to ".".
+
+    Returns:
+        str: The timestamp.
+    """
+    milliseconds = max(int(round(ticks / 10_000)), 0)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return (
+        f"{hours:02d}:{minutes:02d}:{seconds:02d}{decimal_separator}{milliseconds:03d}"
+    )
+
+
+def split_into_cues(
+    segment: TranscriptSegment, max_chars: int = 84, max_seconds: float = 7.0
+) -> List[Cue]:
+    """
+    Splits a segment into caption cues of at most max_chars characters and max_seconds each, using its
+    word timings. The display text is used when its tokens line up one-to-one with the timed words,
+    otherwise the lexical words are. A segment without word timings is a single cue.
+
+    Args:
+        segment (TranscriptSegment): The recognized segment.
+        max_chars (int, optional): The longest cue text. Defaults to 84.
+        max_seconds (float, optional): The longest cue duration. Defaults to 7.0.
+
+    Returns:
+        List[Cue]: The cues, in order.
+    """
+    if not segment.words:
+        return [(segment.offset, segment.offset + segment.duration, segment.text)]
+
+    tokens = segment.text.split()
+    if len(tokens) != len(segment.words):
+        tokens = [word for word, _, _ in segment.words]
+    max_ticks = int(max_seconds * TICKS_PER_SECOND)
+
+    cues: List[Cue] = []
+    cue_tokens: List[str] = []
+    cue_start = cue_end = 0
+    for token, (_, offset, duration) in zip(tokens, segment.words):
+        if cue_tokens and (
+            len(" ".join(cue_tokens)) + 1 + len(token) > max_chars
+            or offset + duration - cue_start > max_ticks
+        ):
+            cues.append((cue_start, cue_end, " ".join(cue_tokens)))
+            cue_tokens = []
+        if not cue_tokens:
+            cue_start = offset
+        cue_tokens.append(token)
+        cue_end = offset + duration
+    if cue_tokens:
+        cues.append((cue_start, cue_end, " ".join(cue_tokens)))
+    return cues
+
+
+class TranscriptExporter(abc.ABC):
+    """
+    Writes transcript segments to a file as they are recognized. Each segment is formatted and flushed
+    on arrival, so the file can be followed while the session runs and nothing is buffered in memory.
+    Pass instances to Transcript(exporters=[...]).
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The output file. Overwritten if it exists.
+        """
+        self.path = path
+        self.segments_written = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._output = open(path, "w", encoding="utf-8")
+        header = self._header()
+        if header:
+            self._output.write(header)
+
+    def _header(self) -> str:
+        return ""
+
+    @abc.abstractmethod
+    def _format_segment(self, segment: TranscriptSegment) -> str:
+        """
+        Formats one segment as the text appended to the file.
+        """
+
+    def write_segment(self, segment: TranscriptSegment):
+        """
+        Formats a segment and appends it to the file.
+
+        Args:
+            segment (TranscriptSegment): The recognized segment.
+        """
+        with self._lock:
+            if self._output.closed:
+                logger.warning(
+                    f"Dropping a segment recognized after {self.path} was closed."
+                )
+                return
+            self._output.write(self._format_segment(segment))
+            self._output.flush()
+            self.segments_written += 1
+
+    def close(self):
+        with self._lock:
+            if not self._output.closed:
+                self._output.close()
+                logger.info(f"Wrote {self.segments_written} segments to {self.path}.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class JsonLinesExporter(TranscriptExporter):
+    """
+    Writes one JSON object per segment: start and end in seconds, speaker_id, language, text and, when
+    available, the words with their start and end.
+    """
+
+    def _format_segment(self, segment: TranscriptSegment) -> str:
+        record = {
+            "start": round(segment.offset / TICKS_PER_SECOND, 3),
+            "end": round((segment.offset + segment.duration) / TICKS_PER_SECOND, 3),
+            "speaker_id": segment.speaker_id,
+            "language": segment.language,
+            "text": segment.text,
+        }
+        if segment.words:
+            record["words"] = [
+                {
+                    "word": word,
+                    "start": round(offset / TICKS_PER_SECOND, 3),
+                    "end": round((offset + duration) / TICKS_PER_SECOND, 3),
+                }
+                for word, offset, duration in segment.words
+            ]
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+class SrtExporter(TranscriptExporter):
+    """
+    Writes SubRip (SRT) captions. Segments with word timings are split into cues of readable length.
+    """
+
+    def __init__(self, path: str, max_chars: int = 84, max_seconds: float = 7.0):
+        """
+        Args:
+            path (str): The output file. Overwritten if it exists.
+            max_chars (int, optional): The longest cue text. Defaults to 84.
+            max_seconds (float, optional): The longest cue duration. Defaults to 7.0.
+        """
+        self.max_chars = max_chars
+        self.max_seconds = max_seconds
+        self._cue_index = 0
+        super().__init__(path)
+
+    def _format_speaker(self, segment: TranscriptSegment, text: str) -> str:
+        if segment.speaker_id:
+            return f"{segment.speaker_id}: {text}"
+        return text
+
+    def _format_segment(self, segment: TranscriptSegment) -> str:
+        blocks = []
+        for start, end, text in split_into_cues(
+            segment, self.max_chars, self.max_seconds
+        ):
+            self._cue_index += 1
+            blocks.append(
+                f"{self._cue_index}\n"
+                f"{format_timestamp(start, ',')} --> {format_timestamp(end, ',')}\n"
+                f"{self._format_speaker(segment, text)}\n\n"
+            )
+        return "".join(blocks)
+
+
+class WebVttExporter(SrtExporter):
+    """
+    Writes WebVTT captions. Speakers are marked with voice tags.
+    """
+
+    def _header(self) -> str:
+        return "WEBVTT\n\n"
+
+    def _format_speaker(self, segment: TranscriptSegment, text: str) -> str:
+        if segment.speaker_id:
+            return f"<v {segment.speaker_id}>{text}"
+        return text
+
+    def _format_segment(self, segment: TranscriptSegment) -> str:
+        return "".join(
+            f"{format_timestamp(start)} --> {format_timestamp(end)}\n"
+            f"{self._format_speaker(segment, text)}\n\n"
+            for start, end, text in split_into_cues(
+                segment, self.max_chars, self.max_seconds
+            )
+        )
+
+
+EXPORTERS = {
+    EXPORT_JSONL: JsonLinesExporter,
+    EXPORT_SRT: SrtExporter,
+    EXPORT_VTT: WebVttExporter,
+}
+
+
+def create_exporter(
+    path: str, export_format: Optional[str] = None
+) -> TranscriptExporter:
+    """
+    Creates the exporter for a file, inferring the format from its extension if it is not given.
+
+    Args:
+        path (str): The output file.
+        export_format (str, optional): "jsonl", "srt" or "vtt". Inferred from the extension if None.
+
+    Returns:
+        TranscriptExporter: The exporter.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if export_format is None:
+        export_format = os.path.splitext(path)[1].lstrip(".").lower()
+        if export_format == "json":
+            export_format = EXPORT_JSONL
+    if export_format not in EXPORTERS:
+        raise ValueError(
+            f"Unknown transcript export format: {export_format}. "
+            f"Expected one of {', '.join(EXPORTERS)}."
+        )
+    return EXPORTERS[export_format](path)
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Optional
+
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+
+def session_end_future(
+    recognizer, loop: Optional[asyncio.AbstractEventLoop] = None
+) -> asyncio.Future:
+    """
+    Creates an awaitable future that resolves as soon as the recognizer fires its
+    session_stopped or canceled event.
+
+    The Speech SDK fires its events on native worker threads, so the result is handed
+    over to the event loop with call_soon_threadsafe instead of being polled.
+
+    :param recognizer: A SpeechRecognizer, ConversationTranscriber or IntentRecognizer.
+    :param loop: The event loop that owns the future. Defaults to the running loop.
+    :return: A future resolved with the event that ended the session.
+    """
+    loop = loop or asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _resolve(evt):
+        if not future.done():
+            future.set_result(evt)
+
+    def on_session_end(evt):
+        try:
+            loop.call_soon_threadsafe(_resolve, evt)
+        except RuntimeError:
+            # The loop was closed after the session was already awaited.
+            logger.debug(f"Dropped late session end event: {evt}")
+
+    recognizer.session_stopped.connect(on_session_end)
+    recognizer.canceled.connect(on_session_end)
+    return future
+
+
+async def await_sdk_future(sdk_future) -> Any:
+    """
+    Awaits a Speech SDK ResultFuture (e.g. the return value of
+    start_continuous_recognition_async) without blocking the event loop.
+
+    :param sdk_future: The SDK ResultFuture to wait on.
+    :return: The value returned by the future's get() method.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, sdk_future.get)
@@ -1,9 +1,23 @@
+import math
+import struct
 import wave
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from utils.ml_logging import get_logger
 
 logger = get_logger()
 
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_ALAW = 0x0006
+WAVE_FORMAT_MULAW = 0x0007
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Format expected by the Speech service for raw PCM input
+TARGET_SAMPLE_RATE = 16000
+
 
 def check_audio_file(file_path: str) -> bool:
     """
@@ -82,3 +96,768 @@ def log_audio_characteristics(file_path: str):
         # Calculate bytes per second
         bytes_per_second = framerate * sampwidth * n_channels
         logger.info(f"Bytes Per Second: {bytes_per_second}")
+
+
+def parse_wav_header(header: bytes) -> Optional[Tuple[int, int, int, int, int]]:
+    """
+    Parses the RIFF/WAVE header at the start of a byte buffer, without needing the rest of the file.
+    This allows audio to be streamed (e.g. from a blob download) as soon as the header has arrived.
+
+    Parameters:
+    header (bytes): The first bytes of the WAV file.
+
+    Returns:
+    Optional[Tuple[int, int, int, int, int]]: (format_tag, framerate, bits_per_sample, n_channels, data_offset),
+    where data_offset is the position of the first sample byte, or None if more bytes are needed.
+
+    Raises:
+    ValueError: If the buffer does not start with a RIFF/WAVE header.
+    """
+    if len(header) < 12:
+        return None
+    if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise ValueError("Audio data is not a RIFF/WAVE file.")
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(header):
+        chunk_id, chunk_size = struct.unpack_from("<4sI", header, offset)
+        body = offset + 8
+        if chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk found before fmt chunk.")
+            return fmt + (body,)
+        if chunk_id == b"fmt ":
+            if body + 16 > len(header):
+                return None
+            format_tag, n_channels, framerate = struct.unpack_from("<HHI", header, body)
+            (bits_per_sample,) = struct.unpack_from("<H", header, body + 14)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and body + 26 <= len(header):
+                # The actual format tag is the first field of the sub-format GUID
+                (format_tag,) = struct.unpack_from("<H", header, body + 24)
+            fmt = (format_tag, framerate, bits_per_sample, n_channels)
+        # RIFF chunks are word aligned
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+def get_audio_duration_seconds(file_path: str) -> float:
+    """
+    Returns the duration of a WAV file in seconds, read from its header.
+
+    Parameters:
+    file_path (str): Path to the WAV file.
+
+    Returns:
+    float: The duration of the audio in seconds.
+    """
+    with wave.open(file_path, "rb") as wav_file:
+        return wav_file.getnframes() / float(wav_file.getframerate())
+
+
+def read_wav_layout(file_path: str) -> Tuple[int, int, int, int, int, int]:
+    """
+    Reads the layout of a WAV file from its header. Unlike the wave module, this also accepts
+    IEEE float, 24/32-bit and WAVE_FORMAT_EXTENSIBLE files.
+
+    Parameters:
+    file_path (str): Path to the WAV file.
+
+    Returns:
+    Tuple[int, int, int, int, int, int]: (format_tag, framerate, bits_per_sample, n_channels, data_offset, data_size).
+
+    Raises:
+    ValueError: If the file is not a RIFF/WAVE file or its header is truncated.
+    """
+    with open(file_path, "rb") as audio_file:
+        header = b""
+        while True:
+            chunk = audio_file.read(4096)
+            header += chunk
+            wav_header = parse_wav_header(header)
+            if wav_header is not None:
+                break
+            if not chunk:
+                raise ValueError(f"Incomplete WAV header in file: {file_path}")
+
+    data_offset = wav_header[-1]
+    (data_size,) = struct.unpack_from("<I", header, data_offset - 4)
+    return wav_header + (data_size,)
+
+
+def decode_pcm_frames(
+    raw: bytes, bits_per_sample: int, n_channels: int, format_tag: int = WAVE_FORMAT_PCM
+) -> np.ndarray:
+    """
+    Decodes interleaved WAV sample bytes into a float32 array in [-1, 1] with one column per channel.
+    Supports unsigned 8-bit, signed 16/24/32-bit integer and 32/64-bit IEEE float samples.
+
+    Parameters:
+    raw (bytes): Interleaved sample bytes. Trailing bytes of an incomplete frame are ignored.
+    bits_per_sample (int): The sample width in bits.
+    n_channels (int): The number of channels.
+    format_tag (int): The WAV format tag (PCM or IEEE float).
+
+    Returns:
+    np.ndarray: A float32 array of shape (frames, channels).
+    """
+    sample_width = bits_per_sample // 8
+    frame_width = sample_width * n_channels
+    raw = raw[: len(raw) - len(raw) % frame_width]
+
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        dtype = {4: "<f4", 8: "<f8"}[sample_width]
+        samples = np.frombuffer(raw, dtype=dtype).astype(np.float32)
+    elif sample_width == 1:
+        samples = (
+            np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0
+        ) / 128.0
+    elif sample_width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif sample_width == 3:
+        # Place the three little-endian bytes in the top of an int32 so the sign is preserved
+        triplets = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        widened = np.zeros((triplets.shape[0], 4), dtype=np.uint8)
+        widened[:, 1:] = triplets
+        samples = widened.view("<i4").ravel().astype(np.float32) / 2147483648.0
+    elif sample_width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {bits_per_sample} bits")
+
+    return samples.reshape(-1, n_channels)
+
+
+def downmix_to_mono(frames: np.ndarray) -> np.ndarray:
+    """
+    Averages all channels of a (frames, channels) array into a single channel.
+
+    Parameters:
+    frames (np.ndarray): A float array of shape (frames, channels).
+
+    Returns:
+    np.ndarray: A float32 array of shape (frames,).
+    """
+    if frames.shape[1] == 1:
+        return frames[:, 0]
+    return frames.mean(axis=1, dtype=np.float32)
+
+
+def requantize_to_int16(samples: np.ndarray) -> np.ndarray:
+    """
+    Converts float samples in [-1, 1] to int16 with rounding and clipping.
+
+    Parameters:
+    samples (np.ndarray): A float array.
+
+    Returns:
+    np.ndarray: An int16 array.
+    """
+    scaled = np.rint(samples * 32768.0)
+    np.clip(scaled, -32768, 32767, out=scaled)
+    return scaled.astype(np.int16)
+
+
+class PolyphaseResampler:
+    """
+    Streaming rational resampler (upsample by L, low-pass filter, downsample by M) implemented as a
+    polyphase FIR filter bank. Only the output samples that are kept are ever computed, and the filter
+    history is carried between blocks so audio can be converted block by block with the same result
+    as converting the whole signal at once.
+    """
+
+    def __init__(
+        self,
+        input_rate: int,
+        output_rate: int,
+        taps_per_phase: int = 32,
+        rolloff: float = 0.94,
+        kaiser_beta: float = 8.6,
+    ):
+        """
+        Initializes a new instance of the PolyphaseResampler class.
+
+        Parameters:
+        input_rate (int): The input sample rate in Hz.
+        output_rate (int): The output sample rate in Hz.
+        taps_per_phase (int): Filter taps per polyphase branch, scaled up by the decimation ratio. Higher values give a
+            sharper anti-aliasing filter.
+        rolloff (float): Cutoff as a fraction of the lower Nyquist frequency.
+        kaiser_beta (float): Kaiser window shape parameter.
+        """
+        divisor = math.gcd(input_rate, output_rate)
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+        # When decimating, the filter must span proportionally more input samples
+        taps_per_phase *= max(1, -(-self.down // self.up))
+        self.taps_per_phase = taps_per_phase
+
+        n_taps = self.up * taps_per_phase
+        # Center the filter on a whole number of output samples so the group delay can be
+        # removed exactly; the window is kept symmetric around that center.
+        self._delay = int(round((n_taps - 1) / 2.0 / self.down))
+        center = min(self._delay * self.down, n_taps - 1)
+        half_width = min(center, n_taps - 1 - center)
+        cutoff = rolloff * 0.5 / max(self.up, self.down)
+        t = np.arange(n_taps) - center
+        window = np.zeros(n_taps)
+        window_start = center - half_width
+        window_end = center + half_width + 1
+        window[window_start:window_end] = np.kaiser(
+            window_end - window_start, kaiser_beta
+        )
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * t) * window
+        prototype *= self.up / prototype.sum()
+        # phases[p, j] = h[p + j * L]
+        self.phases = prototype.reshape(taps_per_phase, self.up).T.astype(np.float32)
+
+        self._history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        self._consumed = 0
+        self._next_output = 0
+        self._emitted = 0
+
+    @property
+    def is_passthrough(self) -> bool:
+        return self.up == 1 and self.down == 1
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Resamples the next block of a mono signal.
+
+        Parameters:
+        block (np.ndarray): The next input samples (1-D float array).
+
+        Returns:
+        np.ndarray: The output samples that can be computed so far (float32).
+        """
+        block = np.asarray(block, dtype=np.float32)
+        if self.is_passthrough:
+            return block
+
+        buffer = np.concatenate((self._history, block))
+        last_input = self._consumed + len(block) - 1
+        last_output = ((last_input + 1) * self.up - 1) // self.down
+        output_index = np.arange(self._next_output, last_output + 1, dtype=np.int64)
+
+        positions = output_index * self.down
+        input_index = positions // self.up
+        phase = positions - input_index * self.up
+        local = input_index - self._consumed + self.taps_per_phase - 1
+        gather = local[:, None] - np.arange(self.taps_per_phase)[None, :]
+        output = np.einsum("ij,ij->i", buffer[gather], self.phases[phase])
+
+        history_start = len(buffer) - (self.taps_per_phase - 1)
+        self._history = buffer[history_start:]
+        self._consumed += len(block)
+        self._next_output = last_output + 1
+
+        skip = max(self._delay - self._emitted, 0)
+        self._emitted += len(output)
+        return output[skip:]
+
+    def flush(self) -> np.ndarray:
+        """
+        Returns the tail of the signal still held in the filter history, trimmed so that the total
+        output length matches input_length * output_rate / input_rate.
+
+        Returns:
+        np.ndarray: The remaining output samples (float32).
+        """
+        if self.is_passthrough:
+            return np.zeros(0, dtype=np.float32)
+
+        expected = int(math.ceil(self._consumed * self.up / self.down))
+        produced = max(self._emitted - self._delay, 0)
+        tail = self.process(np.zeros(self.taps_per_phase, dtype=np.float32))
+        return tail[: max(expected - produced, 0)]
+
+
+def iter_normalized_audio_blocks(
+    file_path: str,
+    target_sample_rate: int = TARGET_SAMPLE_RATE,
+    block_frames: int = 65536,
+    reuse_buffers: bool = False,
+) -> Iterator[np.ndarray]:
+    """
+    Reads a WAV file block by block and converts it to mono int16 at the target sample rate.
+    Accepts any channel count, 8/16/24/32-bit integer or float samples and any sample rate.
+    Memory use is bounded by the block size, independent of the file length.
+
+    Input that is already mono int16 at the target rate is passed through without conversion.
+
+    Parameters:
+    file_path (str): Path to the WAV file.
+    target_sample_rate (int): The output sample rate. Defaults to 16,000 Hz.
+    block_frames (int): The number of input frames converted per block.
+    reuse_buffers (bool): Read every block into the same preallocated buffer. Pass-through blocks are then
+        views of that buffer and are only valid until the next block is requested. Defaults to False.
+
+    Yields:
+    np.ndarray: Blocks of mono int16 samples.
+    """
+    format_tag, framerate, bits_per_sample, n_channels, data_offset, data_size = (
+        read_wav_layout(file_path)
+    )
+    if format_tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT):
+        raise ValueError(f"Unsupported WAV format tag {format_tag}: {file_path}")
+
+    frame_width = bits_per_sample // 8 * n_channels
+    resampler = PolyphaseResampler(framerate, target_sample_rate)
+    passthrough = (
+        format_tag == WAVE_FORMAT_PCM
+        and bits_per_sample == 16
+        and n_channels == 1
+        and resampler.is_passthrough
+    )
+    read_buffer = bytearray(block_frames * frame_width)
+    read_view = memoryview(read_buffer)
+
+    with open(file_path, "rb") as audio_file:
+        audio_file.seek(data_offset)
+        # Some writers leave the data size at 0 or 0xFFFFFFFF when streaming
+        remaining = data_size if 0 < data_size < 0xFFFFFFFF else None
+        while remaining is None or remaining > 0:
+            if not reuse_buffers:
+                read_buffer = bytearray(block_frames * frame_width)
+                read_view = memoryview(read_buffer)
+            to_read = len(read_buffer)
+            if remaining is not None:
+                to_read = min(to_read, remaining)
+            n_read = audio_file.readinto(read_view[:to_read])
+            if not n_read:
+                break
+            if remaining is not None:
+                remaining -= n_read
+            raw = read_view[: n_read - n_read % frame_width]
+            if passthrough:
+                yield np.frombuffer(raw, dtype="<i2")
+                continue
+            mono = downmix_to_mono(
+                decode_pcm_frames(raw, bits_per_sample, n_channels, format_tag)
+            )
+            resampled = resampler.process(mono)
+            if len(resampled):
+                yield requantize_to_int16(resampled)
+
+    tail = resampler.flush()
+    if len(tail):
+        yield requantize_to_int16(tail)
+
+
+def normalize_audio_file(
+    input_path: str,
+    output_path: str,
+    target_sample_rate: int = TARGET_SAMPLE_RATE,
+    block_frames: int = 65536,
+) -> str:
+    """
+    Converts a WAV file of any layout into a mono int16 WAV file at the target sample rate,
+    which meets the requirements checked by check_audio_file.
+
+    Parameters:
+    input_path (str): Path to the source WAV file.
+    output_path (str): Path to the normalized WAV file to write.
+    target_sample_rate (int): The output sample rate. Defaults to 16,000 Hz.
+    block_frames (int): The number of input frames converted per block.
+
+    Returns:
+    str: The output path.
+    """
+    with wave.open(output_path, "wb") as wav_out:
+        wav_out.setnchannels(1)
+        wav_out.setsampwidth(2)
+        wav_out.setframerate(target_sample_rate)
+        for block in iter_normalized_audio_blocks(
+            input_path, target_sample_rate, block_frames
+        ):
+            wav_out.writeframes(block.tobytes())
+
+    logger.info(f"Normalized {input_path} to {target_sample_rate} Hz mono int16.")
+    return output_path
+
+
+def compute_vad_features(
+    blocks: Iterable[np.ndarray], frame_samples: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes per-frame energy (dBFS) and zero-crossing rate over a stream of int16 blocks.
+    Frames are non-overlapping and the remainder of each block is carried into the next one,
+    so only the frame-level features are kept in memory.
+
+    Parameters:
+    blocks (Iterable[np.ndarray]): Mono int16 blocks, e.g. from iter_normalized_audio_blocks.
+    frame_samples (int): The number of samples per analysis frame.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: The energy in dBFS and the zero-crossing rate of each frame.
+    """
+    energies = []
+    crossings = []
+    carry = np.zeros(0, dtype=np.float32)
+    for block in blocks:
+        samples = np.concatenate((carry, block.astype(np.float32) / 32768.0))
+        n_frames = len(samples) // frame_samples
+        frames_end = n_frames * frame_samples
+        frames = samples[:frames_end].reshape(n_frames, frame_samples)
+        carry = samples[frames_end:]
+        if not n_frames:
+            continue
+        energies.append(10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10))
+        signs = np.signbit(frames)
+        crossings.append(np.mean(signs[:, 1:] != signs[:, :-1], axis=1))
+
+    if not energies:
+        return np.zeros(0), np.zeros(0)
+    return np.concatenate(energies), np.concatenate(crossings)
+
+
+def _runs_to_regions(mask: np.ndarray) -> np.ndarray:
+    """
+    Converts a boolean frame mask into an (n, 2) array of [start, end) frame indices of its True runs.
+    """
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.stack((np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)), axis=1)
+
+
+def _merge_close_regions(regions: np.ndarray, max_gap: int) -> np.ndarray:
+    """
+    Merges consecutive regions separated by at most max_gap frames.
+    """
+    if len(regions) < 2:
+        return regions
+    gaps = regions[1:, 0] - regions[:-1, 1]
+    keep = np.concatenate(([True], gaps > max_gap))
+    starts = regions[keep, 0]
+    ends = regions[np.concatenate((keep[1:], [True])), 1]
+    return np.stack((starts, ends), axis=1)
+
+
+def detect_speech_regions(
+    energy_db: np.ndarray,
+    zero_crossing_rate: np.ndarray,
+    frame_ms: int = 30,
+    margin_db: float = 12.0,
+    threshold_range_db: Tuple[float, float] = (-60.0, -35.0),
+    zcr_threshold: float = 0.25,
+    zcr_margin_db: float = 6.0,
+    min_speech_ms: int = 150,
+    min_silence_ms: int = 500,
+    padding_ms: int = 200,
+) -> np.ndarray:
+    """
+    Finds speech regions from per-frame energy and zero-crossing features.
+
+    A frame is voiced if its energy is above an adaptive threshold (the 10th percentile of the frame
+    energies plus margin_db, clipped to threshold_range_db). Quieter frames with a high zero-crossing
+    rate are also kept, so unvoiced consonants such as fricatives are not cut. Gaps shorter than
+    min_silence_ms are bridged, regions shorter than min_speech_ms are dropped, and padding_ms is kept
+    around each region.
+
+    Parameters:
+    energy_db (np.ndarray): Per-frame energy in dBFS.
+    zero_crossing_rate (np.ndarray): Per-frame zero-crossing rate.
+    frame_ms (int): The frame duration in milliseconds.
+    margin_db (float): How far above the noise floor speech must be.
+    threshold_range_db (Tuple[float, float]): The lowest and highest allowed energy threshold.
+    zcr_threshold (float): The zero-crossing rate above which quieter frames count as unvoiced speech.
+    zcr_margin_db (float): How far below the energy threshold unvoiced frames may be.
+    min_speech_ms (int): The minimum duration of a speech region.
+    min_silence_ms (int): The minimum duration of a silence that splits two regions.
+    padding_ms (int): Audio kept before and after each region.
+
+    Returns:
+    np.ndarray: An (n, 2) int array of [start, end) frame indices.
+    """
+    if not len(energy_db):
+        return np.zeros((0, 2), dtype=np.int64)
+
+    threshold = float(
+        np.clip(np.percentile(energy_db, 10) + margin_db, *threshold_range_db)
+    )
+    voiced = energy_db > threshold
+    unvoiced = (energy_db > threshold - zcr_margin_db) & (
+        zero_crossing_rate > zcr_threshold
+    )
+    regions = _runs_to_regions(voiced | unvoiced)
+
+    regions = _merge_close_regions(regions, min_silence_ms // frame_ms)
+    regions = regions[
+        regions[:, 1] - regions[:, 0] >= max(min_speech_ms // frame_ms, 1)
+    ]
+
+    padding = padding_ms // frame_ms
+    regions = regions + np.array([-padding, padding])
+    np.clip(regions, 0, len(energy_db), out=regions)
+    return _merge_close_regions(regions, 0)
+
+
+class SpeechRegionMap:
+    """
+    Describes which parts of a recording were kept by voice-activity detection, and maps times in the
+    trimmed (speech-only) audio back to times in the original recording.
+    """
+
+    def __init__(self, regions: np.ndarray, sample_rate: int, total_samples: int):
+        """
+        Parameters:
+        regions (np.ndarray): An (n, 2) array of [start, end) sample indices of the kept regions.
+        sample_rate (int): The sample rate the indices refer to.
+        total_samples (int): The length of the original recording in samples.
+        """
+        self.regions = np.asarray(regions, dtype=np.int64).reshape(-1, 2)
+        self.sample_rate = sample_rate
+        self.total_samples = total_samples
+        lengths = self.regions[:, 1] - self.regions[:, 0]
+        self._trimmed_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        self.kept_samples = int(lengths.sum())
+
+    def to_original_seconds(self, trimmed_seconds):
+        """
+        Maps a time (or an array of times) in the trimmed audio to the original recording.
+
+        Parameters:
+        trimmed_seconds (float or np.ndarray): Time(s) in seconds from the start of the trimmed audio.
+
+        Returns:
+        float or np.ndarray: The corresponding time(s) in seconds in the original recording.
+        """
+        if not len(self.regions):
+            return trimmed_seconds
+        trimmed = np.asarray(trimmed_seconds, dtype=np.float64) * self.sample_rate
+        index = np.clip(
+            np.searchsorted(self._trimmed_starts, trimmed, side="right") - 1,
+            0,
+            len(self.regions) - 1,
+        )
+        original = (self.regions[index, 0] + trimmed - self._trimmed_starts[index]) / (
+            self.sample_rate
+        )
+        return float(original) if np.ndim(original) == 0 else original
+
+    def to_original_ticks(self, trimmed_ticks: int) -> int:
+        """
+        Maps a Speech SDK offset (in 100-nanosecond ticks) in the trimmed audio to the original recording.
+
+        Parameters:
+        trimmed_ticks (int): The offset reported by the SDK for the trimmed audio.
+
+        Returns:
+        int: The offset in ticks in the original recording.
+        """
+        return int(round(self.to_original_seconds(trimmed_ticks / 1e7) * 1e7))
+
+    def report(self) -> dict:
+        """
+        Summarizes how much audio was kept and dropped.
+
+        Returns:
+        dict: total_seconds, speech_seconds, dropped_seconds, dropped_ratio and the number of regions.
+        """
+        total_seconds = self.total_samples / self.sample_rate
+        speech_seconds = self.kept_samples / self.sample_rate
+        return {
+            "total_seconds": round(total_seconds, 3),
+            "speech_seconds": round(speech_seconds, 3),
+            "dropped_seconds": round(total_seconds - speech_seconds, 3),
+            "dropped_ratio": (
+                round(1 - speech_seconds / total_seconds, 4) if total_seconds else 0.0
+            ),
+            "regions": len(self.regions),
+        }
+
+
+def detect_speech_regions_in_file(
+    file_path: str, frame_ms: int = 30, **vad_kwargs
+) -> SpeechRegionMap:
+    """
+    Runs voice-activity detection over a WAV file of any layout, on its 16 kHz mono normalization.
+
+    Parameters:
+    file_path (str): Path to the WAV file.
+    frame_ms (int): The analysis frame duration in milliseconds.
+    **vad_kwargs: Extra keyword arguments for detect_speech_regions.
+
+    Returns:
+    SpeechRegionMap: The speech regions, in 16 kHz sample indices.
+    """
+    frame_samples = TARGET_SAMPLE_RATE * frame_ms // 1000
+    total_samples = 0
+
+    def counted_blocks():
+        nonlocal total_samples
+        for block in iter_normalized_audio_blocks(file_path, reuse_buffers=True):
+            total_samples += len(block)
+            yield block
+
+    energy_db, zero_crossing_rate = compute_vad_features(
+        counted_blocks(), frame_samples
+    )
+    regions = detect_speech_regions(
+        energy_db, zero_crossing_rate, frame_ms=frame_ms, **vad_kwargs
+    )
+    regions = np.minimum(regions * frame_samples, total_samples)
+    region_map = SpeechRegionMap(regions, TARGET_SAMPLE_RATE, total_samples)
+    logger.info(f"Voice activity in {file_path}: {region_map.report()}")
+    return region_map
+
+
+def iter_trimmed_blocks(
+    blocks: Iterable[np.ndarray], regions: np.ndarray
+) -> Iterator[np.ndarray]:
+    """
+    Filters a stream of sample blocks down to the given regions.
+
+    Parameters:
+    blocks (Iterable[np.ndarray]): Consecutive sample blocks.
+    regions (np.ndarray): An (n, 2) array of sorted, non-overlapping [start, end) sample indices.
+
+    Yields:
+    np.ndarray: The parts of the blocks that fall inside a region.
+    """
+    region_index = 0
+    position = 0
+    for block in blocks:
+        block_end = position + len(block)
+        while region_index < len(regions) and regions[region_index, 0] < block_end:
+            # Region bounds relative to the block
+            start = max(regions[region_index, 0], position) - position
+            end = min(regions[region_index, 1], block_end) - position
+            if end > start:
+                yield block[start:end]
+            if regions[region_index, 1] > block_end:
+                break
+            region_index += 1
+        position = block_end
+        if region_index >= len(regions):
+            break
+
+
+def write_trimmed_audio(
+    file_path: str, output_path: str, region_map: SpeechRegionMap
+) -> str:
+    """
+    Writes only the speech regions of a WAV file to a 16 kHz mono int16 WAV file.
+
+    Parameters:
+    file_path (str): Path to the source WAV file.
+    output_path (str): Path to the trimmed WAV file to write.
+    region_map (SpeechRegionMap): The regions to keep.
+
+    Returns:
+    str: The output path.
+    """
+    with wave.open(output_path, "wb") as wav_out:
+        wav_out.setnchannels(1)
+        wav_out.setsampwidth(2)
+        wav_out.setframerate(TARGET_SAMPLE_RATE)
+        for block in iter_trimmed_blocks(
+            iter_normalized_audio_blocks(file_path, reuse_buffers=True),
+            region_map.regions,
+        ):
+            wav_out.writeframes(block.tobytes())
+    return output_path
+
+
+def plan_segment_boundaries(
+    region_map: SpeechRegionMap,
+    target_seconds: float,
+    max_seconds: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Chooses where to cut a long recording into segments of about target_seconds. Cuts are placed in the
+    middle of the silences between speech regions, picking the silence closest to the target length;
+    only when no silence falls within max_seconds is a segment cut at max_seconds, inside speech.
+
+    Parameters:
+    region_map (SpeechRegionMap): The speech regions of the recording.
+    target_seconds (float): The preferred segment length.
+    max_seconds (float, optional): The longest allowed segment. Defaults to 1.5 times target_seconds.
+
+    Returns:
+    np.ndarray: The cut points in samples, starting with 0 and ending with the recording length.
+    """
+    if target_seconds <= 0:
+        raise ValueError("target_seconds must be positive.")
+    max_seconds = max_seconds or 1.5 * target_seconds
+    if max_seconds < target_seconds:
+        raise ValueError("max_seconds must not be shorter than target_seconds.")
+
+    rate = region_map.sample_rate
+    total = region_map.total_samples
+    target = int(target_seconds * rate)
+    longest = int(max_seconds * rate)
+    minimum = target // 2
+
+    regions = region_map.regions
+    candidates = (regions[1:, 0] + regions[:-1, 1]) // 2 if len(regions) > 1 else []
+    candidates = np.asarray(candidates, dtype=np.int64)
+
+    cuts = [0]
+    while total - cuts[-1] > longest:
+        start = cuts[-1]
+        in_range = candidates[
+            (candidates >= start + minimum) & (candidates <= start + longest)
+        ]
+        if len(in_range):
+            cut = int(in_range[np.argmin(np.abs(in_range - (start + target)))])
+        else:
+            cut = start + longest
+        cuts.append(cut)
+    cuts.append(total)
+    return np.asarray(cuts, dtype=np.int64)
+
+
+def write_audio_segments(
+    file_path: str, segments: np.ndarray, output_paths: List[str]
+) -> List[str]:
+    """
+    Writes possibly overlapping ranges of a WAV file to separate 16 kHz mono int16 WAV files,
+    reading and normalizing the source only once.
+
+    Parameters:
+    file_path (str): Path to the source WAV file.
+    segments (np.ndarray): An (n, 2) array of [start, end) sample indices, sorted by start.
+    output_paths (List[str]): One output path per segment.
+
+    Returns:
+    List[str]: The output paths.
+    """
+    if len(segments) != len(output_paths):
+        raise ValueError("Expected one output path per segment.")
+
+    writers = {}
+    next_segment = 0
+    position = 0
+    try:
+        for block in iter_normalized_audio_blocks(file_path, reuse_buffers=True):
+            block_end = position + len(block)
+            while (
+                next_segment < len(segments) and segments[next_segment][0] < block_end
+            ):
+                wav_out = wave.open(output_paths[next_segment], "wb")
+                wav_out.setnchannels(1)
+                wav_out.setsampwidth(2)
+                wav_out.setframerate(TARGET_SAMPLE_RATE)
+                writers[next_segment] = wav_out
+                next_segment += 1
+            for index in list(writers):
+                start, end = segments[index]
+                # Segment bounds relative to the block
+                lo = max(start, position) - position
+                hi = min(end, block_end) - position
+                if hi > lo:
+                    writers[index].writeframes(block[lo:hi].tobytes())
+                if end <= block_end:
+                    writers.pop(index).close()
+            position = block_end
+    finally:
+        for wav_out in writers.values():
+            wav_out.close()
+
+    # Segments starting past the end of the audio are written empty
+    for index in range(next_segment, len(segments)):
+        with wave.open(output_paths[index], "wb") as wav_out:
+            wav_out.setnchannels(1)
+            wav_out.setsampwidth(2)
+            wav_out.setframerate(TARGET_SAMPLE_RATE)
+    return output_paths
@@ -0,0 +1,171 @@
+import threading
+from typing import Dict, Tuple
+
+import requests
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobClient, BlobServiceClient, ContainerClient
+from requests.adapters import HTTPAdapter
+
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+
+class BlobServiceClientPool:
+    """
+    A thread-safe cache of long-lived BlobServiceClient objects, one per connection string.
+
+    Each service client owns a requests session whose keep-alive connection pool is shared by every
+    container and blob client derived from it, so the connection string is parsed and the HTTP
+    transport is set up only once per storage account instead of once per blob.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 32):
+        """
+        Initializes a new instance of the BlobServiceClientPool class.
+
+        Args:
+            pool_connections (int, optional): The number of host connection pools to cache per session. Defaults to 10.
+            pool_maxsize (int, optional): The maximum number of keep-alive connections per host. Defaults to 32.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self._service_clients: Dict[str, BlobServiceClient] = {}
+        self._adapters: Dict[str, HTTPAdapter] = {}
+        self._container_clients: Dict[Tuple[str, str], ContainerClient] = {}
+        self._stats = {
+            "service_clients_created": 0,
+            "service_clients_reused": 0,
+            "container_clients_created": 0,
+            "container_clients_reused": 0,
+        }
+
+    def get_service_client(self, connection_string: str) -> BlobServiceClient:
+        """
+        Returns the pooled BlobServiceClient for a connection string, creating it on first use.
+
+        Args:
+            connection_string (str): The Azure Storage connection string.
+
+        Returns:
+            BlobServiceClient: The shared service client.
+        """
+        with self._lock:
+            service_client = self._service_clients.get(connection_string)
+            if service_client is not None:
+                self._stats["service_clients_reused"] += 1
+                return service_client
+
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            service_client = BlobServiceClient.from_connection_string(
+                connection_string,
+                transport=RequestsTransport(session=session, session_owner=False),
+            )
+            self._service_clients[connection_string] = service_client
+            self._adapters[connection_string] = adapter
+            self._stats["service_clients_created"] += 1
+            logger.info(
+                f"Created pooled BlobServiceClient for account {service_client.account_name}."
+            )
+            return service_client
+
+    def get_container_client(
+        self, connection_string: str, container_name: str
+    ) -> ContainerClient:
+        """
+        Returns the cached ContainerClient for a container, creating it on first use.
+
+        Args:
+            connection_string (str): The Azure Storage connection string.
+            container_name (str): The name of the container.
+
+        Returns:
+            ContainerClient: The shared container client.
+        """
+        key = (connection_string, container_name)
+        with self._lock:
+            container_client = self._container_clients.get(key)
+            if container_client is not None:
+                self._stats["container_clients_reused"] += 1
+                return container_client
+
+        service_client = self.get_service_client(connection_string)
+        with self._lock:
+            container_client = self._container_clients.get(key)
+            if container_client is None:
+                container_client = service_client.get_container_client(container_name)
+                self._container_clients[key] = container_client
+                self._stats["container_clients_created"] += 1
+            else:
+                self._stats["container_clients_reused"] += 1
+            return container_client
+
+    def get_blob_client(
+        self, connection_string: str, container_name: str, blob_name: str
+    ) -> BlobClient:
+        """
+        Returns a BlobClient that shares the pooled transport of its container.
+
+        Args:
+            connection_string (str): The Azure Storage connection string.
+            container_name (str): The name of the container.
+            blob_name (str): The name of the blob.
+
+        Returns:
+            BlobClient: A client for the blob.
+        """
+        return self.get_container_client(
+            connection_string, container_name
+        ).get_blob_client(blob_name)
+
+    def get_stats(self) -> dict:
+        """
+        Reports how many clients and HTTP connections were created versus reused.
+
+        HTTP connection counts are read from the urllib3 connection pools behind each session:
+        every request that did not need a new connection was served from a kept-alive one.
+
+        Returns:
+            dict: The client counters plus connections_created, connection_requests and connections_reused.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            connections_created = 0
+            connection_requests = 0
+            for adapter in self._adapters.values():
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    connections_created += pool.num_connections
+                    connection_requests += pool.num_requests
+
+        stats["connections_created"] = connections_created
+        stats["connection_requests"] = connection_requests
+        stats["connections_reused"] = max(connection_requests - connections_created, 0)
+        return stats
+
+    def close(self):
+        """
+        Closes all pooled service clients and their connections.
+        """
+        with self._lock:
+            for service_client in self._service_clients.values():
+                service_client.close()
+            for adapter in self._adapters.values():
+                adapter.close()
+            self._service_clients.clear()
+            self._adapters.clear()
+            self._container_clients.clear()
+
+
+# Process-wide pool shared by all translators and transcribers
+blob_client_pool = BlobServiceClientPool()
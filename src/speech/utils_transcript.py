@@ -0,0 +1,398 @@
+import re
+from array import array
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+TICKS_PER_SECOND = 10_000_000
+UNKNOWN_SPEAKER = "Unknown"
+
+# A recognized word: (text, offset, duration), with offset and duration in 100-nanosecond ticks
+Word = Tuple[str, int, int]
+
+
+class TranscriptSegment:
+    """
+    One recognized utterance: offset and duration in 100-nanosecond ticks, speaker, language, text and,
+    when word-level timestamps were requested, the timing of each word.
+    """
+
+    __slots__ = ("offset", "duration", "speaker_id", "language", "text", "words")
+
+    def __init__(
+        self,
+        offset: int,
+        duration: int,
+        speaker_id: Optional[str],
+        language: Optional[str],
+        text: str,
+        words: Optional[List[Word]] = None,
+    ):
+        self.offset = offset
+        self.duration = duration
+        self.speaker_id = speaker_id
+        self.language = language
+        self.text = text
+        self.words = words
+
+    def __repr__(self) -> str:
+        return (
+            f"TranscriptSegment(offset={self.offset}, duration={self.duration}, "
+            f"speaker_id={self.speaker_id!r}, language={self.language!r}, text={self.text!r})"
+        )
+
+
+class Transcript:
+    """
+    The utterances of a transcription, stored column-wise: offsets and durations in integer arrays and
+    speakers, languages and texts in lists. Appending a segment is O(1) and copies no earlier text; the
+    transcript string is only built when it is asked for, and is a view of the segments.
+
+    Exporters (see transcript_export) receive each segment as it is appended. With keep_segments=False
+    the segments are only handed to the exporters and not stored, so memory stays flat however long
+    the recording is.
+    """
+
+    def __init__(
+        self,
+        diarization: bool = False,
+        exporters: Optional[Iterable] = None,
+        keep_segments: bool = True,
+    ):
+        """
+        Args:
+            diarization (bool, optional): Whether the string view prefixes each segment with its speaker.
+                Defaults to False.
+            exporters (Iterable, optional): Objects with a write_segment(TranscriptSegment) method, called
+                for every appended segment.
+            keep_segments (bool, optional): Whether to store the segments. If False, the string view
+                stays empty. Defaults to True.
+        """
+        self.diarization = diarization
+        self.exporters = list(exporters or [])
+        self.keep_segments = keep_segments
+        self.appended_segments = 0
+        self.offsets = array("q")
+        self.durations = array("q")
+        self.speaker_ids: List[Optional[str]] = []
+        self.languages: List[Optional[str]] = []
+        self.texts: List[str] = []
+        self.words: List[Optional[List[Word]]] = []
+        self._text_view = (0, None, "")
+
+    def append(
+        self,
+        text: str,
+        offset: int = 0,
+        duration: int = 0,
+        speaker_id: Optional[str] = None,
+        language: Optional[str] = None,
+        words: Optional[List[Word]] = None,
+    ):
+        """
+        Appends one recognized utterance and hands it to the exporters.
+
+        Args:
+            text (str): The recognized text.
+            offset (int, optional): The start of the utterance in 100-nanosecond ticks. Defaults to 0.
+            duration (int, optional): The length of the utterance in 100-nanosecond ticks. Defaults to 0.
+            speaker_id (str, optional): The speaker, if diarization identified one.
+            language (str, optional): The recognized or detected language.
+            words (List[Word], optional): The (text, offset, duration) of each word, if requested.
+        """
+        self.appended_segments += 1
+        if self.exporters:
+            segment = TranscriptSegment(
+                offset, duration, speaker_id, language, text, words
+            )
+            for exporter in self.exporters:
+                exporter.write_segment(segment)
+        if not self.keep_segments:
+            return
+        self.offsets.append(offset)
+        self.durations.append(duration)
+        self.speaker_ids.append(speaker_id)
+        self.languages.append(language)
+        self.texts.append(text)
+        self.words.append(words)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, index: int) -> TranscriptSegment:
+        return TranscriptSegment(
+            self.offsets[index],
+            self.durations[index],
+            self.speaker_ids[index],
+            self.languages[index],
+            self.texts[index],
+            self.words[index],
+        )
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        for index in range(len(self.texts)):
+            yield self[index]
+
+    def to_text(self, diarization: Optional[bool] = None) -> str:
+        """
+        Joins the segments into the transcript string. The result is reused until a segment is appended.
+
+        Args:
+            diarization (bool, optional): Whether to prefix each segment with "Speaker <id>: " and end it
+                with a newline. Defaults to the transcript's own setting.
+
+        Returns:
+            str: The transcript.
+        """
+        if diarization is None:
+            diarization = self.diarization
+        count, cached_diarization, text = self._text_view
+        if count == len(self.texts) and cached_diarization == diarization:
+            return text
+        if diarization:
+            text = "".join(
+                f"Speaker {speaker_id}: {segment_text}\n"
+                for speaker_id, segment_text in zip(self.speaker_ids, self.texts)
+            )
+        else:
+            text = " ".join(self.texts).strip()
+        self._text_view = (len(self.texts), diarization, text)
+        return text
+
+    @property
+    def text(self) -> str:
+        return self.to_text()
+
+    def __str__(self) -> str:
+        return self.to_text()
+
+    def to_records(self) -> List[dict]:
+        """
+        Returns the segments as dicts with "offset", "duration", "speaker_id", "language", "text" and
+        "words" (None without word timings), e.g. for stitch_segment_transcripts.
+
+        Returns:
+            List[dict]: The segment records, in recognition order.
+        """
+        return [
+            {
+                "offset": offset,
+                "duration": duration,
+                "speaker_id": speaker_id,
+                "language": language,
+                "text": text,
+                "words": words,
+            }
+            for offset, duration, speaker_id, language, text, words in zip(
+                self.offsets,
+                self.durations,
+                self.speaker_ids,
+                self.languages,
+                self.texts,
+                self.words,
+            )
+        ]
+
+
+def normalize_for_comparison(text: str) -> str:
+    """
+    Lower-cases a recognized phrase and strips its punctuation, so that the same words recognized in two
+    overlapping sessions compare equal.
+
+    Args:
+        text (str): The recognized text.
+
+    Returns:
+        str: The normalized text.
+    """
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _texts_match(first: str, second: str, min_ratio: float = 0.6) -> bool:
+    """
+    Checks whether two phrases are the same utterance, allowing for one of them to be cut off at a
+    segment edge.
+    """
+    first, second = normalize_for_comparison(first), normalize_for_comparison(second)
+    if not first or not second:
+        return False
+    if first in second or second in first:
+        return True
+    return SequenceMatcher(None, first, second).ratio() >= min_ratio
+
+
+def _time_overlap(first: dict, second: dict) -> float:
+    """
+    Returns the overlap of two utterances as a fraction of the shorter one.
+    """
+    overlap = min(first["end"], second["end"]) - max(first["start"], second["start"])
+    shorter = min(first["end"] - first["start"], second["end"] - second["start"])
+    if overlap <= 0:
+        return 0.0
+    return overlap / shorter if shorter > 0 else 1.0
+
+
+def _to_original_time(segment: dict) -> List[dict]:
+    """
+    Converts the utterances of one segment from session-relative ticks to seconds in the original recording.
+    Word timings stay in ticks, shifted to the original recording.
+    """
+    utterances = []
+    shift = int(round(segment["audio_start"] * TICKS_PER_SECOND))
+    for record in segment["records"]:
+        start = segment["audio_start"] + record["offset"] / TICKS_PER_SECOND
+        words = record.get("words")
+        utterances.append(
+            {
+                "start": start,
+                "end": start + record.get("duration", 0) / TICKS_PER_SECOND,
+                "speaker_id": record.get("speaker_id") or UNKNOWN_SPEAKER,
+                "language": record.get("language"),
+                "text": record["text"],
+                "words": (
+                    [
+                        (word, offset + shift, duration)
+                        for word, offset, duration in words
+                    ]
+                    if words
+                    else None
+                ),
+            }
+        )
+    return utterances
+
+
+def _link_speakers(
+    previous: List[dict], current: List[dict], overlap_threshold: float
+) -> Dict[str, str]:
+    """
+    Maps the session-local speaker ids of a segment to the global ids of the previous segment, by voting
+    over the utterances both sessions recognized in the audio they share.
+    """
+    votes = defaultdict(Counter)
+    for utterance in current:
+        if utterance["speaker_id"] == UNKNOWN_SPEAKER:
+            continue
+        for earlier in previous:
+            if earlier["speaker_id"] == UNKNOWN_SPEAKER:
+                continue
+            if _time_overlap(earlier, utterance) >= overlap_threshold and _texts_match(
+                earlier["text"], utterance["text"]
+            ):
+                votes[utterance["speaker_id"]][earlier["speaker_id"]] += 1
+
+    mapping = {}
+    taken = set()
+    # Assign the strongest links first so two local speakers never claim the same global one
+    ranked = sorted(
+        (
+            (count, local, global_id)
+            for local, counter in votes.items()
+            for global_id, count in counter.items()
+        ),
+        reverse=True,
+    )
+    for _, local, global_id in ranked:
+        if local not in mapping and global_id not in taken:
+            mapping[local] = global_id
+            taken.add(global_id)
+    return mapping
+
+
+def stitch_segment_transcripts(
+    segments: List[dict], overlap_threshold: float = 0.5
+) -> List[dict]:
+    """
+    Stitches the utterances of segments transcribed in separate sessions back into one transcript.
+
+    Each segment is a dict with:
+        - "audio_start": where the segment audio starts in the original recording, in seconds.
+        - "start" / "end": the part of the recording the segment owns, in seconds. Owned ranges are
+          contiguous; the audio of a segment may extend past them into its neighbours (the overlap).
+        - "records": the recognized utterances, each with "offset" and "duration" in 100-nanosecond
+          ticks relative to the segment audio, "text" and an optional "speaker_id".
+
+    Utterances are shifted to original-recording time and kept only by the segment that owns their
+    midpoint, so an utterance heard by both sessions in the overlap appears once. An utterance cut off at a
+    segment edge is replaced by the complete version the neighbouring session recognized, if any.
+    Speaker ids are session-local, so each segment's speakers are linked to the previous segment's
+    through the utterances both sessions recognized in the overlap; speakers that cannot be linked are
+    given new ids.
+
+    Args:
+        segments (List[dict]): The segment results, in recording order.
+        overlap_threshold (float, optional): The time overlap, as a fraction of the shorter utterance,
+            above which two utterances are considered the same. Defaults to 0.5.
+
+    Returns:
+        List[dict]: The utterances in order, each with "start" and "end" in seconds, "speaker_id" and "text".
+    """
+    global_speakers = set()
+    segment_utterances: List[List[dict]] = []
+
+    for index, segment in enumerate(segments):
+        utterances = _to_original_time(segment)
+
+        if index == 0:
+            mapping = {}
+        else:
+            mapping = _link_speakers(
+                segment_utterances[-1], utterances, overlap_threshold
+            )
+        for local in sorted({u["speaker_id"] for u in utterances}):
+            if local == UNKNOWN_SPEAKER or local in mapping:
+                continue
+            global_id = local
+            if index > 0:
+                number = len(global_speakers) + 1
+                while f"Guest-{number}" in global_speakers:
+                    number += 1
+                global_id = f"Guest-{number}"
+            mapping[local] = global_id
+            global_speakers.add(global_id)
+        mapping[UNKNOWN_SPEAKER] = UNKNOWN_SPEAKER
+        for utterance in utterances:
+            utterance["speaker_id"] = mapping[utterance["speaker_id"]]
+        segment_utterances.append(utterances)
+
+    stitched: List[dict] = []
+    for index, (segment, utterances) in enumerate(zip(segments, segment_utterances)):
+        # The previous, current and next segments
+        window_start, window_end = max(index - 1, 0), index + 2
+        neighbours = segment_utterances[window_start:window_end]
+        for utterance in utterances:
+            midpoint = (utterance["start"] + utterance["end"]) / 2
+            if not segment["start"] <= midpoint < segment["end"]:
+                continue
+            # A phrase cut off at a segment edge is replaced by the more complete version
+            # recognized by the neighbouring session
+            best = utterance
+            for candidate in (u for group in neighbours for u in group):
+                if (
+                    len(candidate["text"]) > len(best["text"])
+                    and _time_overlap(candidate, utterance) >= overlap_threshold
+                    and _texts_match(candidate["text"], utterance["text"])
+                ):
+                    best = candidate
+            if stitched and (
+                stitched[-1] is best
+                or (
+                    _time_overlap(stitched[-1], best) >= overlap_threshold
+                    and _texts_match(stitched[-1]["text"], best["text"])
+                )
+            ):
+                if len(best["text"]) > len(stitched[-1]["text"]):
+                    stitched[-1] = best
+                continue
+            stitched.append(best)
+
+    stitched.sort(key=lambda utterance: utterance["start"])
+    logger.info(
+        f"Stitched {len(stitched)} utterances from {len(segments)} segments "
+        f"with {len(global_speakers)} speakers."
+    )
+    return stitched
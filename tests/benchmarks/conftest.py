@@ -0,0 +1,108 @@
+"""
+Micro-benchmarks with regression thresholds. They are skipped unless RUN_BENCHMARKS=1 is set:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/benchmarks
+
+BENCHMARK_THRESHOLD_SCALE multiplies every threshold (e.g. 2 on a slow machine), and
+BENCHMARK_RESULTS names a JSON lines file the measurements are appended to.
+"""
+
+import json
+import os
+import statistics
+import time
+from typing import Callable, Optional
+
+import pytest
+
+from tests.benchmarks.synthetic_data import build_synthetic_pdf, write_synthetic_wav
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+
+def pytest_collection_modifyitems(items):
+    if os.getenv("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="Benchmarks only run with RUN_BENCHMARKS=1.")
+    for item in items:
+        if "benchmarks" in item.nodeid:
+            item.add_marker(skip)
+
+
+class BenchmarkRunner:
+    """
+    Times a function over several rounds after a warm-up call, logs the statistics and fails when the
+    median exceeds the threshold.
+    """
+
+    def __init__(
+        self, threshold_scale: float = 1.0, results_path: Optional[str] = None
+    ):
+        self.threshold_scale = threshold_scale
+        self.results_path = results_path
+
+    def __call__(
+        self,
+        name: str,
+        function: Callable[[], object],
+        threshold_seconds: float,
+        rounds: int = 5,
+    ) -> dict:
+        function()
+        timings = []
+        for _ in range(rounds):
+            start_time = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start_time)
+
+        threshold = threshold_seconds * self.threshold_scale
+        stats = {
+            "name": name,
+            "rounds": rounds,
+            "min_seconds": round(min(timings), 6),
+            "median_seconds": round(statistics.median(timings), 6),
+            "max_seconds": round(max(timings), 6),
+            "threshold_seconds": threshold,
+        }
+        logger.info(f"Benchmark {name}: {stats}")
+        if self.results_path:
+            with open(self.results_path, "a", encoding="utf-8") as results:
+                results.write(json.dumps(dict(stats, timestamp=time.time())) + "\n")
+        assert stats["median_seconds"] <= threshold, (
+            f"{name} took {stats['median_seconds']:.4f}s (median of {rounds}), "
+            f"above its {threshold:.4f}s threshold."
+        )
+        return stats
+
+
+@pytest.fixture(scope="session")
+def benchmark() -> BenchmarkRunner:
+    return BenchmarkRunner(
+        float(os.getenv("BENCHMARK_THRESHOLD_SCALE", "1.0")),
+        os.getenv("BENCHMARK_RESULTS"),
+    )
+
+
+@pytest.fixture(scope="session")
+def stereo_wav(tmp_path_factory) -> str:
+    """
+    One minute of 44.1 kHz stereo audio, which needs downmixing and resampling.
+    """
+    path = tmp_path_factory.mktemp("audio") / "stereo_44k.wav"
+    return write_synthetic_wav(str(path), 60.0, sample_rate=44100, n_channels=2)
+
+
+@pytest.fixture(scope="session")
+def mono_wav(tmp_path_factory) -> str:
+    path = tmp_path_factory.mktemp("audio") / "mono_16k.wav"
+    return write_synthetic_wav(str(path), 10.0)
+
+
+@pytest.fixture(scope="session")
+def pdf_bytes() -> bytes:
+    paragraph = (
+        "The customer called about a blocked card and asked for the limit to be raised. "
+        "The agent verified the identity of the caller and unblocked the card. "
+    )
+    return build_synthetic_pdf([paragraph * 12 for _ in range(30)])
@@ -0,0 +1,95 @@
+import textwrap
+import wave
+from typing import List
+
+import numpy as np
+
+
+def write_synthetic_wav(
+    file_path: str,
+    seconds: float,
+    sample_rate: int = 16000,
+    n_channels: int = 1,
+    seed: int = 0,
+) -> str:
+    """
+    Writes a 16-bit WAV file of tone bursts separated by low-level noise, a rough stand-in for speech
+    and pauses.
+
+    Parameters:
+    file_path (str): The output path.
+    seconds (float): The length of the audio.
+    sample_rate (int): The sample rate.
+    n_channels (int): The number of channels.
+    seed (int): Seeds the noise.
+
+    Returns:
+    str: The output path.
+    """
+    generator = np.random.default_rng(seed)
+    n_frames = int(seconds * sample_rate)
+    time_axis = np.arange(n_frames) / sample_rate
+    # One second of tone, then half a second of noise
+    bursts = (time_axis % 1.5) < 1.0
+    signal = np.where(
+        bursts,
+        0.4 * np.sin(2 * np.pi * 220 * time_axis),
+        0.01 * generator.standard_normal(n_frames),
+    )
+    frames = np.repeat(signal[:, None], n_channels, axis=1)
+    with wave.open(file_path, "wb") as wav_file:
+        wav_file.setnchannels(n_channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes((frames * 32767).astype("<i2").tobytes())
+    return file_path
+
+
+def _escape_pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_synthetic_pdf(pages: List[str], title: str = "Synthetic document") -> bytes:
+    """
+    Builds a minimal PDF with one page of Helvetica text per entry, without any PDF library.
+
+    Parameters:
+    pages (List[str]): The text of each page.
+    title (str): The document title, stored in the document information.
+
+    Returns:
+    bytes: The PDF file.
+    """
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{5 + 2 * index} 0 R" for index in range(len(pages))),
+            len(pages),
+        ),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        f"<< /Title ({_escape_pdf_text(title)}) /Producer (benchmarks) >>",
+    ]
+    for index, text in enumerate(pages):
+        lines = " ".join(
+            f"({_escape_pdf_text(line)}) Tj T*" for line in textwrap.wrap(text, 90)
+        )
+        stream = f"BT /F1 11 Tf 14 TL 72 760 Td {lines} ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {6 + 2 * index} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R /Info 4 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+    return bytes(pdf)
@@ -0,0 +1,92 @@
+import numpy as np
+
+from src.lenguage.intent_from_lenguage import IntentRecognizer
+from src.speech.speech_to_text import SpeechCoreTranslator
+from src.speech.utils_audio import (
+    check_audio_file,
+    iter_normalized_audio_blocks,
+    log_audio_characteristics,
+)
+from src.speech.utils_transcript import Transcript
+from utils.fake_backends import FakeSpeechBackend
+from utils.pdf_data_extractor import PDFHelper
+
+
+def test_stereo_to_mono_conversion(benchmark, stereo_wav):
+    def convert():
+        return sum(
+            len(block)
+            for block in iter_normalized_audio_blocks(
+                stereo_wav, block_frames=4410, reuse_buffers=True
+            )
+        )
+
+    assert convert() == 60 * 16000
+    benchmark("stereo_to_mono_60s", convert, threshold_seconds=1.0)
+
+
+def test_header_probing(benchmark, mono_wav):
+    def probe():
+        for _ in range(100):
+            check_audio_file(mono_wav)
+            log_audio_characteristics(mono_wav)
+
+    benchmark("header_probing_x100", probe, threshold_seconds=0.25)
+
+
+def test_transcript_accumulation(benchmark):
+    texts = [f"This is recognized segment number {index}." for index in range(20000)]
+
+    def accumulate():
+        transcript = Transcript()
+        for index, text in enumerate(texts):
+            transcript.append(text, index * 30_000_000, 25_000_000, "Guest-1")
+        return transcript.to_text()
+
+    assert accumulate().endswith("number 19999.")
+    benchmark("transcript_append_20k", accumulate, threshold_seconds=0.1)
+
+
+def test_recognition_callbacks(benchmark):
+    backend = FakeSpeechBackend(
+        [f"Segment {index} of the call." for index in range(2000)],
+        partial_results=0,
+    )
+
+    def transcribe():
+        with backend.install():
+            return SpeechCoreTranslator().transcribe_speech_from_file_continuous(
+                file_path="call.wav"
+            )
+
+    assert transcribe().endswith("Segment 1999 of the call.")
+    benchmark("recognition_callbacks_2k", transcribe, threshold_seconds=1.5)
+
+
+def test_intent_aggregation(benchmark):
+    intent_ids = np.random.default_rng(0).choice(
+        ["TurnOn", "TurnOff", "CheckBalance", "BlockCard", ""], size=200000
+    )
+    recognized_intents = [
+        {"intent_id": intent_id, "text": "..."} for intent_id in intent_ids
+    ]
+
+    counts = IntentRecognizer.aggregate_and_determine_intent(recognized_intents)
+    assert sum(counts.values()) == int((intent_ids != "").sum())
+    benchmark(
+        "intent_aggregation_200k",
+        lambda: IntentRecognizer.aggregate_and_determine_intent(recognized_intents),
+        threshold_seconds=0.15,
+    )
+
+
+def test_pdf_text_extraction(benchmark, pdf_bytes):
+    helper = PDFHelper()
+
+    text = helper.extract_text_from_pdf_bytes(pdf_bytes)
+    assert text is not None and "blocked card" in text
+    benchmark(
+        "pdf_text_extraction_30_pages",
+        lambda: helper.extract_text_from_pdf_bytes(pdf_bytes),
+        threshold_seconds=0.3,
+    )
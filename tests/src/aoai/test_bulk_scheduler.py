@@ -0,0 +1,118 @@
+import random
+import threading
+import time
+
+from src.aoai.bulk_scheduler import (
+    RateLimitedScheduler,
+    TokenBucket,
+    error_headers,
+    is_retryable_error,
+    retry_after_seconds,
+)
+from utils.fake_backends import FakeRateLimitError
+
+
+def test_retry_after_headers():
+    assert retry_after_seconds({"retry-after-ms": "250"}) == 0.25
+    assert retry_after_seconds({"retry-after": "2"}) == 2.0
+    assert retry_after_seconds({"retry-after": "soon"}) is None
+    assert error_headers(FakeRateLimitError("429", 3)) == {"retry-after": "3"}
+
+
+def test_is_retryable_error_recognizes_errors_without_a_status():
+    class Timeout(Exception):
+        pass
+
+    class APIConnectionError(Exception):
+        pass
+
+    class InvalidRequestError(Exception):
+        http_status = 400
+
+    class ServiceError(Exception):
+        http_status = 503
+
+    assert is_retryable_error(Timeout("Request timed out"))
+    assert is_retryable_error(APIConnectionError("Connection reset"))
+    assert is_retryable_error(ServiceError("Unavailable"))
+    assert is_retryable_error(FakeRateLimitError("429", 1))
+    assert not is_retryable_error(InvalidRequestError("Bad request"))
+    assert not is_retryable_error(ValueError("Bad input"))
+
+
+def test_token_bucket_paces_and_pauses():
+    bucket = TokenBucket(rate_per_minute=1200, capacity=1)
+
+    start_time = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    # One token up front, then one every 50ms
+    assert 0.15 < time.monotonic() - start_time < 0.5
+
+    bucket.pause(0.2)
+    start_time = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start_time >= 0.2
+
+
+def test_token_bucket_charges_amounts_above_capacity_in_full():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)
+
+    # Granted at once from a full bucket, but leaves two tokens of debt
+    assert bucket.acquire(3) == 0.0
+    start_time = time.monotonic()
+    bucket.acquire()
+    # The debt and the next token refill at ten tokens per second
+    assert 0.25 < time.monotonic() - start_time < 0.6
+
+
+def test_scheduler_retries_throttled_requests_and_keeps_input_order():
+    throttled = set()
+    lock = threading.Lock()
+
+    def request(text):
+        with lock:
+            first_attempt = text not in throttled
+            throttled.add(text)
+        time.sleep(random.uniform(0, 0.01))
+        if first_attempt and text.endswith("3"):
+            raise FakeRateLimitError("Too many requests", retry_after_seconds=0.05)
+        return text.upper()
+
+    scheduler = RateLimitedScheduler(
+        request,
+        tokens_per_minute=1_000_000,
+        requests_per_minute=60_000,
+        max_in_flight=4,
+        seed=0,
+    )
+    texts = [f"transcript {index}" for index in range(20)]
+    records = list(scheduler.map(iter(texts)))
+
+    assert [record["index"] for record in records] == list(range(20))
+    assert [record["result"] for record in records] == [text.upper() for text in texts]
+    assert records[3]["attempts"] == 2
+    stats = scheduler.get_stats()
+    assert stats["throttled"] == stats["retries"] == 2
+    assert stats["succeeded"] == 20
+
+
+def test_scheduler_skips_cached_inputs_and_fails_fast_on_other_errors():
+    calls = []
+
+    def request(text):
+        calls.append(text)
+        raise ValueError("bad request")
+
+    scheduler = RateLimitedScheduler(
+        request,
+        tokens_per_minute=1_000_000,
+        requests_per_minute=60_000,
+        cached=lambda text: "cached" if text == "known" else None,
+    )
+    records = list(scheduler.map(["known", "unknown"]))
+
+    assert records[0]["result"] == "cached"
+    assert records[1]["status"] == "error"
+    assert calls == ["unknown"]
+    assert scheduler.get_stats()["retries"] == 0
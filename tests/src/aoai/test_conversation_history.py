@@ -0,0 +1,41 @@
+from src.aoai.conversation_history import SUMMARY_PREFIX, ConversationHistory
+
+
+def test_history_stays_within_budget_and_folds_old_turns():
+    history = ConversationHistory(max_tokens=100, summary_max_tokens=40)
+
+    for turn in range(50):
+        history.add_turn(f"question number {turn} " * 4, f"answer number {turn} " * 4)
+        assert history.token_count <= 100 + 40 + 4
+
+    stats = history.get_stats()
+    assert stats["turns"] == 50
+    assert stats["folded_turns"] + stats["window_turns"] == 50
+    assert stats["summarizations"] < stats["folded_turns"]
+    assert history.messages[-1]["content"].startswith("answer number 49")
+
+
+def test_build_messages_puts_summary_after_system_message():
+    summaries = []
+
+    def summarizer(previous_summary, messages):
+        summaries.append(len(messages))
+        return "the caller lost a card"
+
+    history = ConversationHistory(max_turns=2, summarizer=summarizer)
+    for turn in range(3):
+        history.add_turn(f"prompt {turn}", f"reply {turn}")
+
+    messages = history.build_messages("Be concise.", "latest")
+
+    assert summaries == [4]
+    assert [message["role"] for message in messages] == [
+        "system",
+        "system",
+        "user",
+        "assistant",
+        "user",
+    ]
+    assert messages[1]["content"] == SUMMARY_PREFIX + "the caller lost a card"
+    assert messages[2]["content"] == "prompt 2"
+    assert messages[-1]["content"] == "latest"
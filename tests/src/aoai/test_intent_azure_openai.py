@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+from src.aoai.response_cache import ResponseCache
+from utils.fake_backends import FakeChatCompletion, LatencyProfile
+
+
+class MidStreamFailure(FakeChatCompletion):
+    """
+    Fails after the first streamed token.
+    """
+
+    def _stream(self, reply, is_chat):
+        yield next(super()._stream(reply, is_chat))
+        raise self._rate_limit_error()
+
+    async def acreate(self, *args, **kwargs):
+        stream = await super().acreate(*args, **kwargs)
+
+        async def failing_stream():
+            yield await stream.__anext__()
+            raise self._rate_limit_error()
+
+        return failing_stream()
+
+
+@pytest.fixture
+def assistant_class(monkeypatch):
+    for name, value in (
+        ("SPEECH_KEY", "key"),
+        ("SPEECH_REGION", "region"),
+        ("OPENAI_KEY", "key"),
+        ("OPENAI_API_BASE", "https://example.openai.azure.com/"),
+        ("OPENAI_API_VERSION", "2023-12-01-preview"),
+        ("COMPLETION_MODEL", "completion"),
+        ("CHAT_MODEL", "chat"),
+    ):
+        monkeypatch.setenv(name, value)
+    from src.aoai.intent_azure_openai import AzureOpenAIAssistant
+
+    return AzureOpenAIAssistant
+
+
+def test_summaries_are_served_from_the_response_cache(assistant_class):
+    assistant = assistant_class(response_cache=ResponseCache())
+    chat = FakeChatCompletion("Summary: card blocked. Intent: unblock card.")
+
+    with chat.install():
+        first = assistant.summarize_and_classify_intent("I want to unblock my card.")
+        second = assistant.summarize_and_classify_intent("i want to UNBLOCK my card")
+
+    assert first == second == "Summary: card blocked. Intent: unblock card."
+    assert chat.get_stats()["calls"] == 1
+
+
+def test_failed_summaries_are_not_cached(assistant_class):
+    assistant = assistant_class(response_cache=ResponseCache())
+    failing = FakeChatCompletion(latency=LatencyProfile(failure_rate=1.0))
+    chat = FakeChatCompletion("Summary: card blocked. Intent: unblock card.")
+
+    with failing.install():
+        assert assistant.summarize_and_classify_intent("Unblock my card.") is None
+    with chat.install():
+        response = assistant.summarize_and_classify_intent("Unblock my card.")
+
+    assert response == "Summary: card blocked. Intent: unblock card."
+    assert failing.get_stats()["failures"] == 1
+    assert chat.get_stats()["calls"] == 1
+
+
+def test_chat_stream_yields_tokens_in_order_and_appends_the_reply(assistant_class):
+    assistant = assistant_class()
+    history = []
+
+    with FakeChatCompletion("Your card is unblocked.").install() as chat:
+        tokens = list(
+            assistant.generate_text_with_contextual_history_stream(
+                history, "Unblock my card."
+            )
+        )
+
+    assert tokens == ["Your", " card", " is", " unblocked."]
+    assert chat.get_stats()["stream_calls"] == 1
+    assert history[-2:] == [
+        {"role": "user", "content": "Unblock my card."},
+        {"role": "system", "content": "Your card is unblocked."},
+    ]
+
+
+def test_async_chat_stream_yields_tokens_in_order_and_appends_the_reply(
+    assistant_class,
+):
+    assistant = assistant_class()
+    history = []
+
+    async def collect():
+        return [
+            token
+            async for token in assistant.generate_text_with_contextual_history_stream_async(
+                history, "Unblock my card."
+            )
+        ]
+
+    with FakeChatCompletion("Your card is unblocked.").install():
+        tokens = asyncio.run(collect())
+
+    assert tokens == ["Your", " card", " is", " unblocked."]
+    assert history[-1] == {"role": "system", "content": "Your card is unblocked."}
+
+
+def test_chat_streams_failing_mid_stream_leave_the_history_unchanged(
+    assistant_class,
+):
+    assistant = assistant_class()
+    history = []
+
+    async def collect():
+        return [
+            token
+            async for token in assistant.generate_text_with_contextual_history_stream_async(
+                history, "Unblock my card."
+            )
+        ]
+
+    with MidStreamFailure("Your card is unblocked.").install():
+        tokens = list(
+            assistant.generate_text_with_contextual_history_stream(
+                history, "Unblock my card."
+            )
+        )
+        async_tokens = asyncio.run(collect())
+
+    assert tokens == async_tokens == ["Your"]
+    assert [message["role"] for message in history] == ["system"]
+
+
+def test_completion_stream_yields_tokens_in_order(assistant_class):
+    assistant = assistant_class()
+
+    with FakeChatCompletion("Once upon a time.").install() as completion:
+        tokens = list(assistant.generate_text_completion_stream("Tell a story."))
+    with MidStreamFailure("Once upon a time.").install():
+        truncated = list(assistant.generate_text_completion_stream("Tell a story."))
+
+    assert tokens == ["Once", " upon", " a", " time."]
+    assert completion.get_stats()["stream_calls"] == 1
+    assert truncated == ["Once"]
+
+
+def test_async_completion_stream_yields_tokens_in_order(assistant_class):
+    assistant = assistant_class()
+
+    async def collect():
+        return [
+            token
+            async for token in assistant.generate_text_completion_stream_async(
+                "Tell a story."
+            )
+        ]
+
+    with FakeChatCompletion("Once upon a time.").install() as completion:
+        tokens = asyncio.run(collect())
+    with MidStreamFailure("Once upon a time.").install():
+        truncated = asyncio.run(collect())
+
+    assert tokens == ["Once", " upon", " a", " time."]
+    assert completion.get_stats()["stream_calls"] == 1
+    assert truncated == ["Once"]
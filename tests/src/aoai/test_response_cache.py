@@ -0,0 +1,32 @@
+import time
+
+from src.aoai.response_cache import ResponseCache, normalize_prompt
+
+
+def key(text, seed=42):
+    return ResponseCache.make_key(text, "Summarize.", "gpt-4", 0.7, seed, 300)
+
+
+def test_key_ignores_case_punctuation_and_whitespace():
+    assert normalize_prompt("  I want to BLOCK my card!! ") == "i want to block my card"
+    assert key("I want to block my card.") == key("i want to  block my card")
+    assert key("I want to block my card.") != key("I want to block my card.", seed=7)
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(ttl_seconds=0.05)
+    cache.set(key("hello"), "Summary: greeting")
+
+    assert cache.get(key("Hello!")) == "Summary: greeting"
+    time.sleep(0.1)
+    assert cache.get(key("Hello!")) is None
+    assert cache.get_stats()["expired"] == 1
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    ResponseCache(cache_directory=str(tmp_path)).set(key("hello"), "Summary: greeting")
+
+    other_process_cache = ResponseCache(cache_directory=str(tmp_path))
+
+    assert other_process_cache.get(key("hello")) == "Summary: greeting"
+    assert other_process_cache.get_stats()["disk_hits"] == 1
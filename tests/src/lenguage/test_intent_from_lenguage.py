@@ -0,0 +1,117 @@
+import wave
+
+from src.lenguage.intent_from_lenguage import IntentRecognizer
+from utils.fake_backends import FakeSpeechBackend, LatencyProfile, ScriptedUtterance
+
+INTENTS = [("What is the {weather}?", "queryMeteorology")]
+
+
+def write_wav(path, seconds=1, framerate=8000):
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(framerate)
+        wav_file.writeframes(b"\x00\x00" * framerate * seconds)
+    return str(path)
+
+
+def test_registry_builds_config_and_intents_once():
+    backend = FakeSpeechBackend(["Turn it on."])
+    with backend.install():
+        recognizer = IntentRecognizer("key", "region", "app")
+        first = recognizer.registry.get_intents(INTENTS)
+        second = recognizer.registry.get_intents(list(INTENTS))
+
+        assert first is second
+        assert [intent_id for _, intent_id in first[:2]] == [
+            "HomeAutomation.TurnOn",
+            "HomeAutomation.TurnOff",
+        ]
+        assert first[2:] == INTENTS
+        assert recognizer.registry.speech_config is recognizer.registry.speech_config
+
+
+def test_recognize_intent_batch(tmp_path):
+    files = [write_wav(tmp_path / f"{i}.wav", seconds=2) for i in range(4)]
+    backend = FakeSpeechBackend(
+        [
+            ScriptedUtterance("Turn on the lights.", intent_id="HomeAutomation.TurnOn"),
+            ScriptedUtterance("Turn them off.", intent_id="HomeAutomation.TurnOff"),
+            ScriptedUtterance("And on again.", intent_id="HomeAutomation.TurnOn"),
+        ],
+        partial_results=0,
+    )
+    with backend.install():
+        recognizer = IntentRecognizer("key", "region", "app")
+        summary = recognizer.recognize_intent_batch(
+            files + [str(tmp_path / "missing.wav")], INTENTS, max_workers=3
+        )
+
+    assert [record["file"] for record in summary["files"]][:4] == files
+    assert summary["files"][0]["intents"] == {
+        "HomeAutomation.TurnOn": 2,
+        "HomeAutomation.TurnOff": 1,
+    }
+    assert summary["intents"] == {
+        "HomeAutomation.TurnOn": 8,
+        "HomeAutomation.TurnOff": 4,
+    }
+    assert summary["succeeded"] == 4
+    assert summary["failed"] == 1
+    assert summary["audio_seconds"] == 8.0
+    assert summary["latency"]["count"] == 4
+
+
+def test_recognize_intent_batch_reports_canceled_sessions_as_failed(tmp_path):
+    files = [write_wav(tmp_path / "0.wav")]
+    backend = FakeSpeechBackend(
+        [ScriptedUtterance("Turn on the lights.", intent_id="HomeAutomation.TurnOn")],
+        latency=LatencyProfile(failure_rate=1.0),
+    )
+    with backend.install():
+        recognizer = IntentRecognizer("key", "region", "app")
+        summary = recognizer.recognize_intent_batch(files, INTENTS)
+
+    assert summary["succeeded"] == 0
+    assert summary["failed"] == 1
+    assert summary["intents"] == {}
+    assert "Injected recognition failure." in summary["files"][0]["error"]
+
+
+def test_merge_intent_counts_orders_by_frequency():
+    merged = IntentRecognizer.merge_intent_counts([{"a": 1, "b": 2}, {"a": 3}])
+
+    assert list(merged.items()) == [("a", 4), ("b", 2)]
+
+
+def test_recognize_intent_from_text_prefers_local_patterns():
+    recognizer = IntentRecognizer("key", "region", "app")
+    fallback_calls = []
+
+    def fallback(text):
+        fallback_calls.append(text)
+        return {"intent_id": "bookTable", "entities": {}}
+
+    local = recognizer.recognize_intent_from_text(
+        "What is the weather?", INTENTS, fallback
+    )
+    remote = recognizer.recognize_intent_from_text(
+        "Book a table for two", INTENTS, fallback
+    )
+
+    assert local["source"] == "local"
+    assert local["entities"] == {"weather": "weather"}
+    assert remote["source"] == "fallback"
+    assert remote["intent_id"] == "bookTable"
+    assert fallback_calls == ["Book a table for two"]
+    assert recognizer.get_match_stats()["local_ratio"] == 0.5
+
+
+def test_get_matcher_accepts_unhashable_intent_lists():
+    recognizer = IntentRecognizer("key", "region", "app")
+    intents = [["What is the {weather}?", "queryMeteorology"]]
+
+    result = recognizer.recognize_intent_from_text("What is the forecast?", intents)
+
+    assert result["intent_id"] == "queryMeteorology"
+    assert result["entities"] == {"weather": "forecast"}
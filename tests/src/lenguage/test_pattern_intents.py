@@ -0,0 +1,46 @@
+from src.lenguage.pattern_intents import PatternIntentMatcher, normalize_utterance
+
+PATTERNS = [
+    ("What is the {weather}?", "queryMeteorology"),
+    ("What is the date [today]?", "queryDate"),
+    ("Turn {state} the [kitchen] lights", "switchLights"),
+    ("{anything}", "catchAll"),
+]
+
+
+def test_normalize_utterance():
+    assert normalize_utterance("  What is   the Date?! ") == "what is the date"
+
+
+def test_match_extracts_entities_and_prefers_specific_patterns():
+    matcher = PatternIntentMatcher(PATTERNS)
+
+    lights = matcher.match("Turn off the kitchen lights.")
+    assert lights.intent_id == "switchLights"
+    assert lights.entities == {"state": "off"}
+
+    assert matcher.match("what is the date today").intent_id == "queryDate"
+    assert matcher.match("What is the date?").confidence == 1.0
+
+    weather = matcher.match("What is the forecast?")
+    assert weather.intent_id == "queryMeteorology"
+    assert weather.entities == {"weather": "forecast"}
+
+
+def test_match_rejects_low_confidence_and_unmatched_text():
+    matcher = PatternIntentMatcher(PATTERNS)
+
+    # Only the catch-all pattern matches, and it is all slot
+    assert matcher.match("Book a table for two") is None
+    assert PatternIntentMatcher(PATTERNS[:1]).match("Hello there") is None
+    assert PatternIntentMatcher([]).match("anything") is None
+
+
+def test_match_numbers_repeated_entities():
+    matcher = PatternIntentMatcher(
+        [("Fly from {city} to {city}", "bookFlight")] + PATTERNS
+    )
+
+    flight = matcher.match("Fly from Rome to Oslo")
+    assert flight.intent_id == "bookFlight"
+    assert flight.entities == {"city": "rome", "city_2": "oslo"}
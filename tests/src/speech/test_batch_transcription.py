@@ -0,0 +1,94 @@
+import json
+import wave
+
+from src.speech.batch_transcription import (
+    BatchTranscriptionRunner,
+    collect_audio_items,
+    load_completed_items,
+)
+from src.speech.speech_to_text import SpeechTranscriber
+from utils.fake_backends import FakeSpeechBackend, LatencyProfile
+
+
+class FakeTranscriber:
+    def __init__(self, fail_on=()):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def transcribe_speech_from_file_continuous(
+        self, file_path=None, blob_url=None, transcript=None, **kwargs
+    ):
+        item = file_path or blob_url
+        self.calls.append(item)
+        if item in self.fail_on:
+            raise RuntimeError("boom")
+        if transcript is not None:
+            transcript.append("text", offset=5_000_000, duration=25_000_000)
+        return f"text of {item}"
+
+
+def write_wav(path, seconds=1, framerate=8000):
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(framerate)
+        wav_file.writeframes(b"\x00\x00" * framerate * seconds)
+    return str(path)
+
+
+def test_collect_audio_items_from_directory_and_manifest(tmp_path):
+    first = write_wav(tmp_path / "a.wav")
+    second = write_wav(tmp_path / "b.wav")
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(json.dumps({"file_path": second}) + "\n# comment\n" + first)
+
+    assert collect_audio_items(str(tmp_path)) == [first, second]
+    assert collect_audio_items(str(manifest)) == [second, first]
+
+
+def test_runner_writes_results_and_resumes(tmp_path):
+    items = [write_wav(tmp_path / f"{i}.wav", seconds=2) for i in range(5)]
+    output = str(tmp_path / "results.jsonl")
+
+    transcriber = FakeTranscriber(fail_on={items[3]})
+    summary = BatchTranscriptionRunner(transcriber, max_workers=2).run(items, output)
+
+    assert summary["succeeded"] == 4
+    assert summary["failed"] == 1
+    assert summary["audio_seconds"] == 8.0
+    assert load_completed_items(output) == set(items) - {items[3]}
+
+    transcriber = FakeTranscriber()
+    summary = BatchTranscriptionRunner(transcriber, max_workers=2).run(items, output)
+
+    assert transcriber.calls == [items[3]]
+    assert summary["skipped"] == 4
+    assert load_completed_items(output) == set(items)
+
+
+def test_runner_records_canceled_sessions_as_failed(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPEECH_KEY", "key")
+    monkeypatch.setenv("SPEECH_REGION", "region")
+    item = write_wav(tmp_path / "call.wav")
+    output = str(tmp_path / "results.jsonl")
+
+    backend = FakeSpeechBackend(["Hello."], latency=LatencyProfile(failure_rate=1.0))
+    with backend.install():
+        summary = BatchTranscriptionRunner(SpeechTranscriber()).run([item], output)
+
+    assert summary["failed"] == 1
+    with open(output) as results:
+        record = json.loads(results.readline())
+    assert record["status"] == "error"
+    assert "Injected recognition failure." in record["error"]
+    # The failed item is retried on the next run
+    assert load_completed_items(output) == set()
+
+
+def test_blob_audio_duration_comes_from_the_last_segment():
+    blob_url = "https://account.blob.core.windows.net/audio/call.wav"
+
+    record = BatchTranscriptionRunner(FakeTranscriber()).transcribe_item(blob_url)
+
+    assert record["status"] == "ok"
+    assert record["audio_seconds"] == 3.0
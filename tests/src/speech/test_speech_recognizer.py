@@ -0,0 +1,45 @@
+from src.speech.speech_recognizer import SpeechRecognizer
+from utils.fake_backends import FakeSpeechBackend, LatencyProfile
+
+
+def test_latency_stats_separate_warm_and_cold_sessions():
+    recognizer = SpeechRecognizer(key="key", region="region", persistent=True)
+
+    recognizer._record_latency(0.4, 0.9, warm=False)
+    recognizer._record_latency(0.0, 0.3, warm=True)
+    recognizer._record_latency(0.0, 0.5, warm=True)
+    recognizer._record_latency(0.0, None, warm=True)
+
+    stats = recognizer.get_latency_stats()
+    assert stats["cold"] == {
+        "setup_mean_seconds": 0.4,
+        "setup_max_seconds": 0.4,
+        "count": 1,
+        "mean_seconds": 0.9,
+        "p50_seconds": 0.9,
+        "max_seconds": 0.9,
+    }
+    assert stats["warm"]["count"] == 2
+    assert stats["warm"]["p50_seconds"] == 0.4
+    assert stats["warm"]["setup_mean_seconds"] == 0.0
+
+
+def test_latency_is_measured_from_the_end_of_speech():
+    # The one-second utterance takes 0.2s to speak
+    backend = FakeSpeechBackend(
+        [{"text": "Hello.", "duration_seconds": 1.0}],
+        latency=LatencyProfile(0.05),
+        realtime_factor=0.2,
+    )
+    with backend.install():
+        recognizer = SpeechRecognizer(key="key", region="region", persistent=True)
+        recognizer.recognize_from_microphone()
+        recognizer.recognize_from_microphone()
+
+    stats = recognizer.get_latency_stats()
+    assert stats["cold"]["count"] + stats["warm"]["count"] == 2
+    assert stats["cold"]["count"] >= 1
+    assert stats["cold"]["setup_mean_seconds"] is not None
+    # The 0.2s of speaking time is left out
+    latencies = [stats[session]["max_seconds"] for session in ("cold", "warm")]
+    assert all(latency is None or 0.05 <= latency < 0.15 for latency in latencies)
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.speech.speech_to_text import (
+    AudioBlockPullCallback,
+    SpeechCoreTranslator,
+    append_recognition_result,
+)
+from src.speech.utils_audio import SpeechRegionMap
+from src.speech.utils_blob import blob_client_pool
+from src.speech.utils_transcript import Transcript
+from utils.fake_backends import (
+    FakeBlobStore,
+    FakeSpeechBackend,
+    LatencyProfile,
+    silent_wav,
+)
+
+
+def test_pull_callback_spans_blocks_and_signals_end_of_stream():
+    blocks = iter([np.arange(5, dtype=np.int16), np.arange(5, 8, dtype=np.int16)])
+    callback = AudioBlockPullCallback(blocks)
+    buffer = bytearray(6)
+
+    received = b""
+    while True:
+        n_bytes = callback.read(memoryview(buffer))
+        if not n_bytes:
+            break
+        received += bytes(buffer[:n_bytes])
+
+    np.testing.assert_array_equal(np.frombuffer(received, dtype=np.int16), np.arange(8))
+
+
+def test_pull_callback_ends_the_stream_and_keeps_source_errors():
+    def blocks():
+        yield np.arange(3, dtype=np.int16)
+        raise ValueError("Unsupported WAV format tag 6")
+
+    callback = AudioBlockPullCallback(blocks())
+    buffer = bytearray(16)
+
+    assert callback.read(memoryview(buffer)) == 6
+    assert callback.read(memoryview(buffer)) == 0
+    with pytest.raises(ValueError, match="format tag 6"):
+        callback.raise_if_failed()
+
+
+def test_unthrottled_push_stream_reports_unsupported_formats(tmp_path, caplog):
+    audio = bytearray(silent_wav(1, 16000))
+    audio[20:22] = (6).to_bytes(2, "little")  # A-law
+    audio_file = tmp_path / "alaw.wav"
+    audio_file.write_bytes(bytes(audio))
+
+    with FakeSpeechBackend(["Hello."]).install():
+        text = SpeechCoreTranslator().speech_recognition_with_push_stream(
+            str(audio_file), pacing="unthrottled"
+        )
+
+    assert text == ""
+    assert "Unsupported WAV format tag 6" in caplog.text
+
+
+def recognition_result(
+    text, offset, duration, speaker_id=None, language="", words=None
+):
+    detail = {"DisplayText": text}
+    if words is not None:
+        detail["NBest"] = [
+            {
+                "Words": [
+                    {"Word": word, "Offset": word_offset, "Duration": word_duration}
+                    for word, word_offset, word_duration in words
+                ]
+            }
+        ]
+    return SimpleNamespace(
+        text=text,
+        offset=offset,
+        duration=duration,
+        speaker_id=speaker_id,
+        json=json.dumps(detail),
+        properties=SimpleNamespace(get_property=lambda property_id: language),
+    )
+
+
+def test_append_recognition_result_maps_offsets_to_the_original_recording():
+    # One second of silence was trimmed before the speech region
+    region_map = SpeechRegionMap(np.array([[16000, 48000]]), 16000, 64000)
+    transcript = Transcript(diarization=True)
+
+    append_recognition_result(
+        transcript,
+        recognition_result("Hello.", 5_000_000, 10_000_000, "Guest-1", "en-US"),
+        region_map,
+    )
+
+    segment = transcript[0]
+    assert segment.offset == 15_000_000
+    assert segment.duration == 10_000_000
+    assert segment.language == "en-US"
+    assert str(transcript) == "Speaker Guest-1: Hello.\n"
+
+
+def test_append_recognition_result_reads_word_timings():
+    region_map = SpeechRegionMap(np.array([[16000, 48000]]), 16000, 64000)
+    transcript = Transcript()
+    result = recognition_result(
+        "Hi there.",
+        5_000_000,
+        6_000_000,
+        words=[("hi", 5_000_000, 2_000_000), ("there", 8_000_000, 3_000_000)],
+    )
+
+    append_recognition_result(transcript, result, region_map, with_words=True)
+    append_recognition_result(transcript, result)
+
+    assert transcript[0].words == [
+        ("hi", 15_000_000, 2_000_000),
+        ("there", 18_000_000, 3_000_000),
+    ]
+    assert transcript[1].words is None
+
+
+class CountingLatency(LatencyProfile):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def wait(self, *args, **kwargs):
+        self.calls += 1
+        return super().wait(*args, **kwargs)
+
+
+def test_blob_stream_is_pulled_from_the_download_on_demand(monkeypatch):
+    monkeypatch.setenv("SPEECH_KEY", "key")
+    monkeypatch.setenv("SPEECH_REGION", "westus")
+    monkeypatch.setenv("AZURE_STORAGE_CONNECTION_STRING", "fake")
+    audio = silent_wav(2.0, sample_rate=16000)
+    latency = CountingLatency()
+    store = FakeBlobStore(latency=latency, chunk_size=4096)
+    store.put("calls", "call.wav", audio)
+    url = "https://account.blob.core.windows.net/calls/call.wav"
+
+    with store.install(blob_client_pool):
+        audio_config, pull_callback = SpeechCoreTranslator()._open_blob_audio_stream(
+            url
+        )
+        opened_calls = latency.calls
+        buffer = bytearray(4096)
+        received = bytes(buffer[: pull_callback.read(memoryview(buffer))])
+
+        # One buffer of audio only pulls the next chunk of the download
+        assert latency.calls - opened_calls == 1
+        while True:
+            n_bytes = pull_callback.read(memoryview(buffer))
+            if not n_bytes:
+                break
+            received += bytes(buffer[:n_bytes])
+        pull_callback.close()
+
+    assert received == audio[44:]
+
+
+def write_tone_between_silences(path, rate=16000):
+    t = np.arange(rate) / rate
+    audio = np.concatenate(
+        [np.zeros(2 * rate), 8000 * np.sin(2 * np.pi * 300 * t), np.zeros(2 * rate)]
+    ).astype(np.int16)
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(audio.tobytes())
+    return str(path)
+
+
+def test_transcribe_async_trims_silence_of_local_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPEECH_KEY", "key")
+    monkeypatch.setenv("SPEECH_REGION", "region")
+    audio_file = write_tone_between_silences(tmp_path / "call.wav")
+    transcript = Transcript()
+
+    with FakeSpeechBackend(["Hello."], partial_results=0).install():
+        text = asyncio.run(
+            SpeechCoreTranslator().transcribe_async(
+                file_path=audio_file, trim_silence=True, transcript=transcript
+            )
+        )
+
+    assert text == "Hello."
+    # Offsets refer to the original recording, where speech starts after two seconds of silence
+    assert transcript[0].offset > 15_000_000
+
+
+def test_trim_silence_rejects_blob_urls(monkeypatch):
+    monkeypatch.setenv("SPEECH_KEY", "key")
+    monkeypatch.setenv("SPEECH_REGION", "region")
+    translator = SpeechCoreTranslator()
+    blob_url = "https://account.blob.core.windows.net/calls/call.wav"
+
+    with pytest.raises(ValueError, match="local files"):
+        translator.transcribe_speech_from_file_continuous(
+            blob_url=blob_url, trim_silence=True
+        )
+    with pytest.raises(ValueError, match="local files"):
+        asyncio.run(translator.transcribe_async(blob_url=blob_url, trim_silence=True))
+
+
+def test_cancelled_transcription_stops_the_session(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPEECH_KEY", "key")
+    monkeypatch.setenv("SPEECH_REGION", "region")
+    audio_file = tmp_path / "call.wav"
+    audio_file.write_bytes(silent_wav(1, 16000))
+    backend = FakeSpeechBackend(["Hello."] * 100, latency=LatencyProfile(0.05))
+    recognizers = []
+    create_recognizer = backend.create_recognizer
+
+    def recording_create_recognizer(**kwargs):
+        recognizers.append(create_recognizer(**kwargs))
+        return recognizers[-1]
+
+    backend.create_recognizer = recording_create_recognizer
+
+    async def cancel_mid_session():
+        task = asyncio.create_task(
+            SpeechCoreTranslator().transcribe_async(file_path=str(audio_file))
+        )
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with backend.install():
+        asyncio.run(cancel_mid_session())
+
+    assert recognizers and all(
+        recognizer._stop.is_set() and not recognizer._session.is_alive()
+        for recognizer in recognizers
+    )
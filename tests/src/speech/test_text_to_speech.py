@@ -0,0 +1,135 @@
+import azure.cognitiveservices.speech as speechsdk
+
+from src.speech import text_to_speech
+from src.speech.text_to_speech import (
+    CachedSpeechSynthesisResult,
+    SentenceSpeechPipeline,
+    SpeechSynthesizer,
+    iter_sentences,
+)
+from utils.cache import TieredCache
+
+
+class FakeResult:
+    reason = speechsdk.ResultReason.SynthesizingAudioCompleted
+    cancellation_details = None
+
+    def __init__(self, text):
+        self.audio_data = f"audio for {text}".encode()
+
+
+class FakeFuture:
+    def __init__(self, result):
+        self.result = result
+
+    def get(self):
+        return self.result
+
+
+class FakeSdkSynthesizer:
+    def __init__(self):
+        self.spoken = []
+
+    def speak_text_async(self, text):
+        self.spoken.append(text)
+        return FakeFuture(FakeResult(text))
+
+
+def make_synthesizer(monkeypatch, cache, can_play=True):
+    sdk_synthesizer = FakeSdkSynthesizer()
+    monkeypatch.setattr(
+        SpeechSynthesizer,
+        "create_speech_synthesizer",
+        lambda self, use_default_speaker=True: sdk_synthesizer,
+    )
+    played = []
+
+    def play_wav_bytes(audio_data):
+        if can_play:
+            played.append(audio_data)
+        return can_play
+
+    monkeypatch.setattr(text_to_speech, "play_wav_bytes", play_wav_bytes)
+    return (
+        SpeechSynthesizer(key="key", region="region", cache=cache),
+        sdk_synthesizer,
+        played,
+    )
+
+
+def test_synthesize_speech_serves_repeated_phrases_from_cache(monkeypatch):
+    synthesizer, sdk_synthesizer, played = make_synthesizer(monkeypatch, TieredCache())
+
+    synthesizer.synthesize_speech("Goodbye.")
+    result = synthesizer.synthesize_speech("Goodbye.")
+
+    assert sdk_synthesizer.spoken == ["Goodbye."]
+    assert isinstance(result, CachedSpeechSynthesisResult)
+    assert played == [b"audio for Goodbye."]
+
+
+def test_cached_phrases_fall_back_to_the_service_without_local_playback(
+    monkeypatch,
+):
+    synthesizer, sdk_synthesizer, played = make_synthesizer(
+        monkeypatch, TieredCache(), can_play=False
+    )
+
+    synthesizer.synthesize_speech("Goodbye.")
+    result = synthesizer.synthesize_speech("Goodbye.")
+    synthesizer.synthesize_speech("Goodbye.")
+
+    assert sdk_synthesizer.spoken == ["Goodbye."] * 3
+    assert not isinstance(result, CachedSpeechSynthesisResult)
+    assert played == []
+
+
+def test_prewarm_cache_synthesizes_only_missing_prompts(monkeypatch):
+    synthesizer, sdk_synthesizer, played = make_synthesizer(monkeypatch, TieredCache())
+
+    assert synthesizer.prewarm_cache(["Hello.", "Goodbye."]) == 2
+    assert synthesizer.prewarm_cache(["Hello.", "Goodbye."]) == 0
+    synthesizer.synthesize_speech("Hello.")
+
+    assert sdk_synthesizer.spoken == ["Hello.", "Goodbye."]
+    assert played == [b"audio for Hello."]
+
+
+def test_iter_sentences_across_chunks():
+    chunks = [
+        "Sure. I can help",
+        " with that! Dr. Smith is",
+        " available at 10 a.m.",
+        " today",
+    ]
+
+    assert list(iter_sentences(chunks)) == [
+        "Sure. I can help with that!",
+        "Dr. Smith is available at 10 a.m.",
+        "today",
+    ]
+
+
+def test_sentence_pipeline_speaks_sentences_in_order(monkeypatch):
+    synthesizer, sdk_synthesizer, _ = make_synthesizer(monkeypatch, None)
+    pipeline = SentenceSpeechPipeline(synthesizer)
+
+    metrics = pipeline.speak(["The card is blocked. ", "A new one ships today."])
+
+    assert sdk_synthesizer.spoken == ["The card is blocked.", "A new one ships today."]
+    assert metrics["sentences"] == 2
+    assert metrics["time_to_first_audio_seconds"] is not None
+
+
+def test_sentence_pipeline_does_not_cache_generated_sentences(monkeypatch):
+    cache = TieredCache()
+    synthesizer, sdk_synthesizer, played = make_synthesizer(monkeypatch, cache)
+    synthesizer.prewarm_cache(["Anything else?"])
+    pipeline = SentenceSpeechPipeline(synthesizer)
+
+    pipeline.speak(["The card is blocked. ", "Anything else?"])
+    pipeline.speak(["The card is blocked. ", "Anything else?"])
+
+    assert sdk_synthesizer.spoken == ["Anything else?"] + ["The card is blocked."] * 2
+    assert played == [b"audio for Anything else?"] * 2
+    assert cache.get_stats()["stores"] == 1
@@ -0,0 +1,108 @@
+from src.speech.transcript_cache import CachedTranscriber
+from src.speech.utils_transcript import Transcript
+
+
+class FakeBlobProperties:
+    etag = '"0x8DB"'
+
+
+class FakeBlobClient:
+    def get_blob_properties(self):
+        return FakeBlobProperties()
+
+
+class FakeTranscriber:
+    supported_languages = ["en-US", "es-ES"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_blob_client_from_url(self, blob_url):
+        return FakeBlobClient()
+
+    def transcribe_speech_from_file_continuous(self, transcript=None, **kwargs):
+        self.calls += 1
+        if transcript is not None:
+            transcript.append(
+                f"transcript {self.calls}",
+                offset=1_000_000,
+                duration=2_000_000,
+                speaker_id="Guest-1",
+                words=[("transcript", 1_000_000, 1_000_000)],
+            )
+        return f"transcript {self.calls}"
+
+
+def test_cached_transcriber_keys_by_content_and_settings(tmp_path):
+    first = tmp_path / "first.wav"
+    copy = tmp_path / "copy.wav"
+    first.write_bytes(b"RIFF audio")
+    copy.write_bytes(b"RIFF audio")
+    transcriber = FakeTranscriber()
+    cached = CachedTranscriber(transcriber)
+
+    assert cached.transcribe_speech_from_file_continuous(file_path=str(first)) == (
+        "transcript 1"
+    )
+    assert cached.transcribe_speech_from_file_continuous(file_path=str(copy)) == (
+        "transcript 1"
+    )
+    assert cached.transcribe_speech_from_file_continuous(
+        file_path=str(copy), diarization=True
+    ) == ("transcript 2")
+    assert transcriber.calls == 2
+    assert cached.get_stats()["memory_hits"] == 1
+
+
+def test_cached_transcriber_uses_blob_etag_and_disk_tier(tmp_path):
+    url = "https://account.blob.core.windows.net/audio/call.wav?sig=abc"
+    transcriber = FakeTranscriber()
+    CachedTranscriber(
+        transcriber, cache_directory=str(tmp_path)
+    ).transcribe_speech_from_file_continuous(blob_url=url)
+
+    restarted = CachedTranscriber(transcriber, cache_directory=str(tmp_path))
+    transcript = restarted.transcribe_speech_from_file_continuous(
+        blob_url=url.replace("sig=abc", "sig=rotated")
+    )
+
+    assert transcript == "transcript 1"
+    assert transcriber.calls == 1
+    assert restarted.get_stats()["disk_hits"] == 1
+
+
+def test_cached_transcriber_replays_segments_into_the_callers_transcript(tmp_path):
+    audio_file = tmp_path / "call.wav"
+    audio_file.write_bytes(b"RIFF audio")
+    transcriber = FakeTranscriber()
+    cached = CachedTranscriber(transcriber, cache_directory=str(tmp_path / "cache"))
+    cached.transcribe_speech_from_file_continuous(file_path=str(audio_file))
+
+    transcript = Transcript()
+    restarted = CachedTranscriber(transcriber, cache_directory=str(tmp_path / "cache"))
+    text = restarted.transcribe_speech_from_file_continuous(
+        file_path=str(audio_file), transcript=transcript
+    )
+
+    assert text == "transcript 1"
+    assert transcriber.calls == 1
+    assert transcript.to_records() == [
+        {
+            "offset": 1_000_000,
+            "duration": 2_000_000,
+            "speaker_id": "Guest-1",
+            "language": None,
+            "text": "transcript 1",
+            "words": [("transcript", 1_000_000, 1_000_000)],
+        }
+    ]
+
+
+def test_cached_transcriber_bounds_the_file_digests(tmp_path):
+    cached = CachedTranscriber(FakeTranscriber(), max_file_digests=2)
+    for index in range(3):
+        audio_file = tmp_path / f"{index}.wav"
+        audio_file.write_bytes(f"RIFF audio {index}".encode())
+        cached.transcribe_speech_from_file_continuous(file_path=str(audio_file))
+
+    assert len(cached._file_digests) == 2
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from src.speech.transcript_export import (
+    TranscriptExporter,
+    create_exporter,
+    format_timestamp,
+    split_into_cues,
+)
+from src.speech.utils_transcript import Transcript, TranscriptSegment
+
+
+def seconds(value):
+    return int(value * 10_000_000)
+
+
+def test_format_timestamp():
+    assert format_timestamp(seconds(3723.456), ",") == "01:02:03,456"
+    assert format_timestamp(seconds(0.5)) == "00:00:00.500"
+
+
+def test_split_into_cues_uses_word_timings_and_display_text():
+    words = [
+        ("hello", seconds(0.0), seconds(0.4)),
+        ("world", seconds(0.5), seconds(0.4)),
+        ("again", seconds(9.0), seconds(0.5)),
+    ]
+    segment = TranscriptSegment(
+        seconds(0.0), seconds(9.5), None, None, "Hello, world again.", words
+    )
+
+    cues = split_into_cues(segment, max_chars=84, max_seconds=7.0)
+
+    assert cues == [
+        (seconds(0.0), seconds(0.9), "Hello, world"),
+        (seconds(9.0), seconds(9.5), "again."),
+    ]
+
+
+def test_exporters_stream_segments_without_keeping_them(tmp_path):
+    paths = [tmp_path / "out.jsonl", tmp_path / "out.srt", tmp_path / "out.vtt"]
+    exporters = [create_exporter(str(path)) for path in paths]
+    transcript = Transcript(exporters=exporters, keep_segments=False)
+
+    transcript.append("Hello.", seconds(1.0), seconds(1.5), "Guest-1", "en-US")
+    # Each segment is on disk as soon as it is appended
+    assert json.loads(paths[0].read_text())["text"] == "Hello."
+    transcript.append("Bye.", seconds(3.0), seconds(0.5))
+    for exporter in exporters:
+        exporter.close()
+
+    assert len(transcript) == 0
+    assert transcript.appended_segments == 2
+    records = [json.loads(line) for line in paths[0].read_text().splitlines()]
+    assert records[0] == {
+        "start": 1.0,
+        "end": 2.5,
+        "speaker_id": "Guest-1",
+        "language": "en-US",
+        "text": "Hello.",
+    }
+    assert paths[1].read_text() == (
+        "1\n00:00:01,000 --> 00:00:02,500\nGuest-1: Hello.\n\n"
+        "2\n00:00:03,000 --> 00:00:03,500\nBye.\n\n"
+    )
+    assert paths[2].read_text() == (
+        "WEBVTT\n\n00:00:01.000 --> 00:00:02.500\n<v Guest-1>Hello.\n\n"
+        "00:00:03.000 --> 00:00:03.500\nBye.\n\n"
+    )
+
+
+def test_create_exporter_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        create_exporter(str(tmp_path / "out.txt"))
+
+
+def test_base_exporter_cannot_be_instantiated(tmp_path):
+    path = tmp_path / "out.txt"
+    with pytest.raises(TypeError):
+        TranscriptExporter(str(path))
+    assert not path.exists()
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+from src.speech.utils_async import await_sdk_future, session_end_future
+
+
+class FakeSignal:
+    def __init__(self):
+        self.callbacks = []
+
+    def connect(self, callback):
+        self.callbacks.append(callback)
+
+    def fire(self, evt):
+        for callback in self.callbacks:
+            callback(evt)
+
+
+class FakeRecognizer:
+    def __init__(self):
+        self.session_stopped = FakeSignal()
+        self.canceled = FakeSignal()
+
+
+class FakeResultFuture:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def test_session_end_future_resolves_from_sdk_thread():
+    async def run():
+        recognizer = FakeRecognizer()
+        future = session_end_future(recognizer)
+        threading.Timer(0.01, recognizer.session_stopped.fire, ["stopped"]).start()
+        return await asyncio.wait_for(future, timeout=1)
+
+    assert asyncio.run(run()) == "stopped"
+
+
+def test_session_end_future_keeps_first_event():
+    async def run():
+        recognizer = FakeRecognizer()
+        future = session_end_future(recognizer)
+        recognizer.canceled.fire("canceled")
+        recognizer.session_stopped.fire("stopped")
+        return await future
+
+    assert asyncio.run(run()) == "canceled"
+
+
+def test_await_sdk_future_returns_result():
+    assert asyncio.run(await_sdk_future(FakeResultFuture(42))) == 42
@@ -0,0 +1,185 @@
+import io
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+from src.speech.utils_audio import (
+    WAVE_FORMAT_PCM,
+    PolyphaseResampler,
+    SpeechRegionMap,
+    check_audio_file,
+    decode_pcm_frames,
+    detect_speech_regions_in_file,
+    iter_trimmed_blocks,
+    normalize_audio_file,
+    parse_wav_header,
+    plan_segment_boundaries,
+    write_audio_segments,
+)
+
+
+def make_wav_bytes(framerate=16000, n_channels=1, sampwidth=2, n_frames=160):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(n_channels)
+        wav_file.setsampwidth(sampwidth)
+        wav_file.setframerate(framerate)
+        wav_file.writeframes(b"\x00" * n_frames * n_channels * sampwidth)
+    return buffer.getvalue()
+
+
+def test_parse_wav_header():
+    data = make_wav_bytes(framerate=8000, n_channels=2)
+    assert parse_wav_header(data) == (WAVE_FORMAT_PCM, 8000, 16, 2, 44)
+
+
+def test_parse_wav_header_needs_more_bytes():
+    data = make_wav_bytes()
+    assert parse_wav_header(data[:20]) is None
+
+
+def test_parse_wav_header_skips_extra_chunks():
+    data = make_wav_bytes()
+    extra = b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+    data = data[:36] + extra + data[36:]
+    assert parse_wav_header(data)[-1] == 44 + len(extra)
+
+
+def test_parse_wav_header_rejects_non_wav():
+    with pytest.raises(ValueError):
+        parse_wav_header(b"\x00" * 64)
+
+
+def write_wav(path, samples, framerate, sampwidth=2):
+    n_channels = samples.shape[1] if samples.ndim > 1 else 1
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(n_channels)
+        wav_file.setsampwidth(sampwidth)
+        wav_file.setframerate(framerate)
+        wav_file.writeframes(samples.tobytes())
+    return str(path)
+
+
+def test_decode_pcm_frames_24_bit():
+    values = np.array([0, 1, -1, 2**23 - 1, -(2**23)], dtype=np.int32)
+    raw = b"".join(int(v).to_bytes(3, "little", signed=True) for v in values)
+
+    decoded = decode_pcm_frames(raw, 24, 1)
+
+    np.testing.assert_allclose(decoded[:, 0], values / 2.0**23)
+
+
+def test_polyphase_resampler_is_block_size_invariant():
+    signal = np.random.default_rng(0).standard_normal(44100).astype(np.float32)
+
+    whole = PolyphaseResampler(44100, 16000)
+    expected = np.concatenate([whole.process(signal), whole.flush()])
+    blocked = PolyphaseResampler(44100, 16000)
+    blocks = np.split(signal, range(1000, len(signal), 1000))
+    parts = [blocked.process(block) for block in blocks]
+    actual = np.concatenate(parts + [blocked.flush()])
+
+    assert len(expected) == 16000
+    np.testing.assert_allclose(actual, expected, atol=1e-5)
+
+
+def test_polyphase_resampler_preserves_in_band_tone():
+    t = np.arange(48000) / 48000
+    signal = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+    resampler = PolyphaseResampler(48000, 16000)
+    output = np.concatenate([resampler.process(signal), resampler.flush()])
+    reference = 0.5 * np.sin(2 * np.pi * 440 * np.arange(len(output)) / 16000)
+
+    np.testing.assert_allclose(output[100:-100], reference[100:-100], atol=1e-3)
+
+
+def test_normalize_audio_file_stereo_8_khz(tmp_path):
+    t = np.arange(8000) / 8000
+    tone = (0.25 * 32767 * np.sin(2 * np.pi * 300 * t)).astype(np.int16)
+    source = write_wav(tmp_path / "stereo.wav", np.stack([tone, tone], axis=1), 8000)
+
+    output = normalize_audio_file(source, str(tmp_path / "normalized.wav"))
+
+    assert check_audio_file(output)
+    with wave.open(output, "rb") as wav_file:
+        assert wav_file.getframerate() == 16000
+        assert wav_file.getnframes() == 16000
+
+
+def make_speech_like_signal(sample_rate=16000):
+    rng = np.random.default_rng(0)
+    t = np.arange(sample_rate) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+    silence = 0.0005 * rng.standard_normal(2 * sample_rate)
+    signal = np.concatenate((silence, tone, silence, tone[: sample_rate // 2], silence))
+    return (signal * 32767).astype(np.int16)
+
+
+def test_detect_speech_regions_in_file(tmp_path):
+    path = str(tmp_path / "speech.wav")
+    write_wav(path, make_speech_like_signal(), 16000)
+
+    region_map = detect_speech_regions_in_file(path)
+
+    assert len(region_map.regions) == 2
+    starts = region_map.regions[:, 0] / 16000
+    ends = region_map.regions[:, 1] / 16000
+    assert np.all(np.abs(starts - [2.0, 5.0]) < 0.3)
+    assert np.all(np.abs(ends - [3.0, 5.5]) < 0.3)
+    assert region_map.report()["dropped_ratio"] > 0.5
+
+
+def test_speech_region_map_to_original_seconds():
+    region_map = SpeechRegionMap(
+        np.array([[16000, 32000], [48000, 56000]]), 16000, 64000
+    )
+
+    assert region_map.to_original_seconds(0.5) == pytest.approx(1.5)
+    assert region_map.to_original_seconds(1.25) == pytest.approx(3.25)
+    assert region_map.to_original_ticks(12_500_000) == 32_500_000
+    assert region_map.report()["speech_seconds"] == 1.5
+
+
+def test_iter_trimmed_blocks_across_block_boundaries():
+    samples = np.arange(100)
+    blocks = np.split(samples, range(30, 100, 30))
+    regions = np.array([[10, 40], [55, 65], [95, 100]])
+
+    trimmed = np.concatenate(list(iter_trimmed_blocks(blocks, regions)))
+
+    expected = np.concatenate((samples[10:40], samples[55:65], samples[95:100]))
+    assert np.array_equal(trimmed, expected)
+
+
+def test_plan_segment_boundaries_cuts_in_silences():
+    regions = np.array([[0, 9], [11, 19], [21, 40], [42, 50]]) * 16000
+    region_map = SpeechRegionMap(regions, 16000, 50 * 16000)
+
+    cuts = plan_segment_boundaries(region_map, target_seconds=20, max_seconds=25)
+
+    assert list(cuts // 16000) == [0, 20, 41, 50]
+
+
+def test_plan_segment_boundaries_hard_cut_without_silence():
+    region_map = SpeechRegionMap(np.array([[0, 50 * 16000]]), 16000, 50 * 16000)
+
+    cuts = plan_segment_boundaries(region_map, target_seconds=20, max_seconds=25)
+
+    assert list(cuts // 16000) == [0, 25, 50]
+
+
+def test_write_audio_segments_with_overlap(tmp_path):
+    samples = (np.arange(100000) % 3000).astype(np.int16)
+    path = write_wav(tmp_path / "long.wav", samples, 16000)
+    segments = np.array([[0, 40000], [30000, 100000]])
+    outputs = [str(tmp_path / "a.wav"), str(tmp_path / "b.wav")]
+
+    write_audio_segments(path, segments, outputs)
+
+    for (start, end), output in zip(segments, outputs):
+        with wave.open(output, "rb") as wav_file:
+            data = np.frombuffer(wav_file.readframes(wav_file.getnframes()), np.int16)
+        assert np.array_equal(data, samples[start:end])
@@ -0,0 +1,35 @@
+import base64
+
+from src.speech.utils_blob import BlobServiceClientPool
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=testaccount;"
+    f"AccountKey={base64.b64encode(b'key').decode()};EndpointSuffix=core.windows.net"
+)
+
+
+def test_service_client_is_created_once_per_connection_string():
+    pool = BlobServiceClientPool()
+
+    first = pool.get_service_client(CONNECTION_STRING)
+    second = pool.get_service_client(CONNECTION_STRING)
+
+    assert first is second
+    stats = pool.get_stats()
+    assert stats["service_clients_created"] == 1
+    assert stats["service_clients_reused"] == 1
+
+
+def test_container_clients_are_cached():
+    pool = BlobServiceClientPool()
+
+    first = pool.get_blob_client(CONNECTION_STRING, "audio", "a.wav")
+    second = pool.get_blob_client(CONNECTION_STRING, "audio", "b.wav")
+
+    assert first.container_name == second.container_name == "audio"
+    assert second.blob_name == "b.wav"
+    stats = pool.get_stats()
+    assert stats["container_clients_created"] == 1
+    assert stats["container_clients_reused"] == 1
+    assert stats["connections_created"] == 0
+    pool.close()
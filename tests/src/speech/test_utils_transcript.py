@@ -0,0 +1,169 @@
+from src.speech.utils_transcript import (
+    Transcript,
+    normalize_for_comparison,
+    stitch_segment_transcripts,
+)
+
+
+def record(start_seconds, duration_seconds, text, speaker_id="Guest-1", **kwargs):
+    return dict(
+        {
+            "offset": int(start_seconds * 1e7),
+            "duration": int(duration_seconds * 1e7),
+            "speaker_id": speaker_id,
+            "text": text,
+        },
+        **kwargs,
+    )
+
+
+def test_normalize_for_comparison():
+    assert normalize_for_comparison("Hello, World!") == "hello world"
+
+
+def test_stitch_keeps_overlap_utterance_once_and_links_speakers():
+    segments = [
+        {
+            "audio_start": 0.0,
+            "start": 0.0,
+            "end": 10.0,
+            "records": [
+                record(1.0, 2.0, "Good morning.", "Guest-1"),
+                record(5.0, 2.0, "How can I help?", "Guest-2"),
+                record(8.0, 0.8, "Sure.", "Guest-2"),
+                record(9.0, 2.0, "I lost my card.", "Guest-1"),
+            ],
+        },
+        {
+            "audio_start": 7.0,
+            "start": 10.0,
+            "end": 20.0,
+            "records": [
+                record(1.0, 0.8, "Sure.", "Guest-1"),
+                record(2.0, 2.0, "I lost my card.", "Guest-2"),
+                record(5.0, 3.0, "Let me block it.", "Guest-1", language="en-GB"),
+            ],
+        },
+    ]
+
+    utterances = stitch_segment_transcripts(segments)
+
+    assert [u["text"] for u in utterances] == [
+        "Good morning.",
+        "How can I help?",
+        "Sure.",
+        "I lost my card.",
+        "Let me block it.",
+    ]
+    assert [u["speaker_id"] for u in utterances] == [
+        "Guest-1",
+        "Guest-2",
+        "Guest-2",
+        "Guest-1",
+        "Guest-2",
+    ]
+    assert utterances[4]["start"] == 12.0
+    assert utterances[4]["language"] == "en-GB"
+
+
+def test_stitch_deduplicates_phrase_cut_at_join():
+    segments = [
+        {
+            "audio_start": 0.0,
+            "start": 0.0,
+            "end": 10.0,
+            "records": [record(8.0, 1.5, "Thank you for")],
+        },
+        {
+            "audio_start": 8.0,
+            "start": 10.0,
+            "end": 20.0,
+            "records": [record(0.0, 3.0, "Thank you for calling.")],
+        },
+    ]
+
+    utterances = stitch_segment_transcripts(segments)
+
+    assert [u["text"] for u in utterances] == ["Thank you for calling."]
+
+
+def test_stitch_shifts_word_timings_to_the_original_recording():
+    transcript = Transcript()
+    transcript.append(
+        "Block it.",
+        10_000_000,
+        8_000_000,
+        "Guest-1",
+        "en-US",
+        [
+            ("block", 10_000_000, 4_000_000),
+            ("it", 15_000_000, 3_000_000),
+        ],
+    )
+    segments = [
+        {
+            "audio_start": 7.0,
+            "start": 0.0,
+            "end": 20.0,
+            "records": transcript.to_records(),
+        }
+    ]
+
+    utterances = stitch_segment_transcripts(segments)
+
+    assert utterances[0]["start"] == 8.0
+    assert utterances[0]["words"] == [
+        ("block", 80_000_000, 4_000_000),
+        ("it", 85_000_000, 3_000_000),
+    ]
+
+
+def test_stitch_gives_unlinked_speakers_new_ids():
+    segments = [
+        {
+            "audio_start": 0.0,
+            "start": 0.0,
+            "end": 10.0,
+            "records": [record(1.0, 2.0, "Hello.", "Guest-1")],
+        },
+        {
+            "audio_start": 10.0,
+            "start": 10.0,
+            "end": 20.0,
+            "records": [record(1.0, 2.0, "Hi there.", "Guest-1")],
+        },
+    ]
+
+    utterances = stitch_segment_transcripts(segments)
+
+    assert [u["speaker_id"] for u in utterances] == ["Guest-1", "Guest-2"]
+
+
+def test_transcript_string_is_a_view_of_the_segments():
+    transcript = Transcript()
+    transcript.append("Hello.", 0, 10_000_000, "Guest-1", "en-US")
+    transcript.append("How are you?", 12_000_000, 8_000_000, "Guest-2")
+
+    assert len(transcript) == 2
+    assert str(transcript) == "Hello. How are you?"
+    assert transcript.to_text(diarization=True) == (
+        "Speaker Guest-1: Hello.\nSpeaker Guest-2: How are you?\n"
+    )
+    assert transcript[1].offset == 12_000_000
+    assert transcript[0].language == "en-US"
+
+    transcript.append("Fine.", 21_000_000, 5_000_000, "Guest-1")
+    assert transcript.text == "Hello. How are you? Fine."
+    assert [segment.speaker_id for segment in transcript] == [
+        "Guest-1",
+        "Guest-2",
+        "Guest-1",
+    ]
+    assert transcript.to_records()[2] == {
+        "offset": 21_000_000,
+        "duration": 5_000_000,
+        "speaker_id": "Guest-1",
+        "language": None,
+        "text": "Fine.",
+        "words": None,
+    }
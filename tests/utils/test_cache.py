@@ -0,0 +1,60 @@
+from utils.cache import DiskCache, MemoryLRUCache, TieredCache, make_cache_key
+
+
+def test_make_cache_key_depends_on_every_part():
+    assert make_cache_key("a", None) == make_cache_key("a", None)
+    assert make_cache_key("a", None) != make_cache_key("a", False)
+    assert make_cache_key("ab", "c") != make_cache_key("a", "bc")
+
+
+def test_memory_lru_evicts_least_recently_used():
+    cache = MemoryLRUCache(max_items=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.evictions == 1
+
+
+def test_disk_cache_respects_budget_and_survives_restart(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10)
+    cache.set("a", b"12345")
+    cache.set("b", b"12345")
+    cache.get("a")
+    cache.set("c", b"12345")
+
+    assert cache.get("b") is None
+    assert cache.size_bytes == 10
+
+    reopened = DiskCache(str(tmp_path), max_bytes=10)
+    assert reopened.get("a") == b"12345"
+    assert reopened.get("c") == b"12345"
+
+
+def test_disk_cache_budget_holds_across_processes(tmp_path):
+    # Two instances on one directory stand in for two processes with their own size index
+    first = DiskCache(str(tmp_path), max_bytes=20)
+    second = DiskCache(str(tmp_path), max_bytes=20)
+    for index in range(4):
+        first.set(f"first-{index}", b"12345")
+        second.set(f"second-{index}", b"12345")
+
+    on_disk = sum(entry.stat().st_size for entry in tmp_path.iterdir())
+    assert on_disk <= 20
+    assert second.get("second-3") == b"12345"
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    TieredCache(disk_directory=str(tmp_path)).set("key", b"value")
+    cache = TieredCache(disk_directory=str(tmp_path))
+
+    assert cache.get("key") == b"value"
+    assert cache.get("key") == b"value"
+    assert cache.get("other") is None
+
+    stats = cache.get_stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_ratio"] == round(2 / 3, 4)
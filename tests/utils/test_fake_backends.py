@@ -0,0 +1,146 @@
+import asyncio
+
+import azure.cognitiveservices.speech as speechsdk
+import pytest
+
+from src.speech.speech_to_text import SpeechCoreTranslator, SpeechTranscriber
+from src.speech.utils_blob import blob_client_pool
+from src.speech.utils_transcript import Transcript
+from utils.fake_backends import (
+    FakeBlobStore,
+    FakeChatCompletion,
+    FakeSpeechBackend,
+    FakeSpeechConfig,
+    LatencyProfile,
+    ScriptedUtterance,
+)
+
+
+def test_latency_profile_sampling_and_failures():
+    assert LatencyProfile(0.2, distribution="constant").sample() == 0.2
+    samples = [LatencyProfile(0.1, 0.05, "uniform", seed=1).sample() for _ in range(50)]
+    assert all(0.05 <= sample <= 0.15 for sample in samples)
+    assert LatencyProfile(failure_rate=1.0).should_fail()
+    assert not LatencyProfile().should_fail()
+    with pytest.raises(ValueError):
+        LatencyProfile(distribution="pareto")
+
+
+def test_fake_speech_backend_drives_the_transcriber():
+    backend = FakeSpeechBackend(
+        [
+            ScriptedUtterance("Hello, how can I help?", speaker_id="Guest-1"),
+            {"text": "My card was blocked.", "speaker_id": "Guest-2"},
+        ]
+    )
+    with backend.install():
+        transcriber = SpeechTranscriber()
+        transcript = Transcript()
+        text = transcriber.transcribe_speech_from_file_continuous(
+            file_path="call.wav", diarization=True, transcript=transcript
+        )
+
+    assert text == (
+        "Speaker Guest-1: Hello, how can I help?\n"
+        "Speaker Guest-2: My card was blocked.\n"
+    )
+    assert transcript[1].offset > transcript[0].offset
+    assert backend.get_stats()["recognized"] == 2
+    # The SDK is restored once the block exits
+    assert speechsdk.SpeechConfig is not FakeSpeechConfig
+
+
+def test_fake_speech_backend_injects_failures():
+    backend = FakeSpeechBackend(
+        ["Hello."], latency=LatencyProfile(failure_rate=1.0, seed=0)
+    )
+    with backend.install():
+        text = SpeechCoreTranslator().transcribe_speech_from_file_continuous(
+            file_path="call.wav"
+        )
+
+    assert text == ""
+    assert backend.get_stats()["failures"] == 1
+
+
+def test_fake_recognizer_stops_the_session_after_a_cancellation():
+    backend = FakeSpeechBackend(
+        ["Hello."], latency=LatencyProfile(failure_rate=1.0, seed=0)
+    )
+    events = []
+    with backend.install():
+        recognizer = speechsdk.SpeechRecognizer(
+            speech_config=speechsdk.SpeechConfig(subscription="key", region="region")
+        )
+        recognizer.canceled.connect(lambda evt: events.append("canceled"))
+        recognizer.session_stopped.connect(lambda evt: events.append("stopped"))
+        recognizer.start_continuous_recognition()
+        recognizer._session.join(timeout=5)
+
+    assert events == ["canceled", "stopped"]
+
+
+def test_fake_blob_store_serves_blob_downloads(monkeypatch):
+    monkeypatch.setenv("AZURE_STORAGE_CONNECTION_STRING", "fake")
+    store = FakeBlobStore(chunk_size=4)
+    store.put("audio", "call.wav", b"RIFF-not-really")
+    with FakeSpeechBackend(["Hello."]).install(), store.install(blob_client_pool):
+        transcriber = SpeechCoreTranslator()
+        text = transcriber.transcribe_speech_from_file_continuous(
+            blob_url="https://fake.blob.core.windows.net/audio/call.wav"
+        )
+        etag = (
+            transcriber.get_blob_client_from_url(
+                "https://fake.blob.core.windows.net/audio/call.wav"
+            )
+            .get_blob_properties()
+            .etag
+        )
+
+    assert text == "Hello."
+    assert etag.startswith('"0x')
+    assert store.get_stats()["reads"] == 1
+
+
+def test_fake_chat_completion_streams_and_fails():
+    chat = FakeChatCompletion("Sure. Your card is unblocked.")
+    with chat.install():
+        import openai
+
+        response = openai.ChatCompletion.create(
+            engine="chat", messages=[{"role": "user", "content": "Help"}]
+        )
+        chunks = list(
+            openai.ChatCompletion.create(
+                engine="chat",
+                messages=[{"role": "user", "content": "Help"}],
+                stream=True,
+            )
+        )
+
+        async def stream_async():
+            stream = await openai.ChatCompletion.acreate(
+                engine="chat",
+                messages=[{"role": "user", "content": "Help"}],
+                stream=True,
+            )
+            return [chunk async for chunk in stream]
+
+        async_chunks = asyncio.run(stream_async())
+
+    assert response["choices"][0]["message"]["content"] == (
+        "Sure. Your card is unblocked."
+    )
+    assert response.choices[0].message.content == "Sure. Your card is unblocked."
+    deltas = [chunk["choices"][0]["delta"].get("content") for chunk in chunks]
+    assert "".join(filter(None, deltas)) == "Sure. Your card is unblocked."
+    assert len(async_chunks) == len(chunks)
+    assert chat.get_stats()["stream_calls"] == 2
+
+    failing = FakeChatCompletion(latency=LatencyProfile(failure_rate=1.0))
+    with failing.install():
+        import openai
+
+        with pytest.raises(Exception) as error:
+            openai.ChatCompletion.create(engine="chat", messages=[])
+    assert "Retry-After" in error.value.headers
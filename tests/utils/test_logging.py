@@ -1,8 +1,21 @@
+import asyncio
+import io
 import logging
+import threading
+import time
 
 import pytest
 
-from utils.ml_logging import KEYINFO_LEVEL_NUM, get_logger
+from utils.ml_logging import (
+    KEYINFO_LEVEL_NUM,
+    DeferredQueueHandler,
+    LogRateLimiter,
+    _stop_queue_listeners,
+    get_function_call_stats,
+    get_logger,
+    log_function_call,
+    reset_function_call_stats,
+)
 
 
 # Patch the logging module during the tests to capture log records
@@ -43,3 +56,90 @@ def test_get_logger_keyinfo_level(caplog):
     assert len(caplog.records) == 1
     assert caplog.records[0].levelname == "KEYINFO"
     assert caplog.records[0].msg == test_message
+
+
+def test_log_function_call_samples_and_aggregates(caplog):
+    reset_function_call_stats()
+
+    @log_function_call("sampled", log_inputs=True, sample_every=3, aggregate=True)
+    def add(a, b=0):
+        return a + b
+
+    for value in range(6):
+        assert add(value, b=1) == value + 1
+
+    called = [r.getMessage() for r in caplog.records if "called with" in r.msg]
+    assert called == [
+        "Function add called with arguments: 0 and keyword arguments: b=1",
+        "Function add called with arguments: 3 and keyword arguments: b=1",
+    ]
+    assert all(
+        r.func_name_override == "add" for r in caplog.records if r.name == "sampled"
+    )
+    stats = get_function_call_stats()[f"{__name__}.{add.__qualname__}"]
+    assert stats["calls"] == 6
+    assert stats["errors"] == 0
+
+
+def test_log_function_call_does_not_format_when_disabled():
+    class Unprintable:
+        def __str__(self):
+            raise AssertionError("arguments were formatted")
+
+    @log_function_call("quiet", log_inputs=True)
+    def identity(value):
+        return value
+
+    get_logger("quiet").setLevel(logging.WARNING)
+    identity(Unprintable())
+
+
+def test_log_function_call_supports_coroutines(caplog):
+    reset_function_call_stats()
+
+    @log_function_call("async_calls", aggregate=True)
+    async def double(value):
+        await asyncio.sleep(0)
+        return 2 * value
+
+    assert asyncio.run(double(21)) == 42
+    assert [r.getMessage() for r in caplog.records if r.name == "async_calls"][-1] == (
+        "Function double completed"
+    )
+    assert get_function_call_stats()[f"{__name__}.{double.__qualname__}"]["calls"] == 1
+
+
+def test_log_rate_limiter_counts_suppressed_events(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    limiter = LogRateLimiter(min_interval_seconds=1.0)
+
+    decisions = []
+    for step in range(5):
+        now[0] = step * 0.4
+        decisions.append(limiter.allow())
+
+    assert decisions == [(True, 0), (False, 1), (False, 2), (True, 2), (False, 1)]
+
+
+def test_get_logger_queue_mode_writes_on_listener_thread():
+    stream = io.StringIO()
+    logger = logging.getLogger("queued")
+    logger.addHandler(logging.StreamHandler(stream))
+    threads = []
+
+    class ThreadRecordingFilter(logging.Filter):
+        def filter(self, record):
+            threads.append(threading.current_thread())
+            return True
+
+    logger.handlers[0].addFilter(ThreadRecordingFilter())
+    logger = get_logger("queued", use_queue=True)
+    assert [type(h) for h in logger.handlers] == [DeferredQueueHandler]
+    assert get_logger("queued", use_queue=True).handlers == logger.handlers
+
+    logger.info("queued message")
+    _stop_queue_listeners()
+
+    assert stream.getvalue() == "queued message\n"
+    assert threads and threads[0] is not threading.current_thread()
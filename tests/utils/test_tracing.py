@@ -0,0 +1,42 @@
+import json
+
+from utils.tracing import EXPORT_PROMETHEUS, LatencyHistogram, Tracer
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram(window=100)
+    for millisecond in range(1, 101):
+        histogram.record(millisecond / 1000)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["count"] == 100
+    assert snapshot["p50_seconds"] == 0.051
+    assert snapshot["p95_seconds"] == 0.096
+    assert snapshot["p99_seconds"] == 0.1
+    assert snapshot["max_seconds"] == 0.1
+
+
+def test_tracer_turn_groups_spans_and_exports(tmp_path):
+    tracer = Tracer(name="test_loop")
+
+    with tracer.turn() as spans:
+        with tracer.span("stt"):
+            pass
+        assert list(tracer.trace_iterator("llm", ["a", "b"])) == ["a", "b"]
+
+    assert set(spans) == {"stt", "llm_first", "llm"}
+    assert tracer.snapshot()["turn"]["count"] == 1
+
+    jsonl_path = tmp_path / "latency.jsonl"
+    tracer.export(str(jsonl_path))
+    tracer.export(str(jsonl_path))
+    lines = jsonl_path.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["stages"]["stt"]["count"] == 1
+
+    prometheus_path = tmp_path / "latency.prom"
+    tracer.export(str(prometheus_path), EXPORT_PROMETHEUS)
+    text = prometheus_path.read_text()
+    assert "# TYPE test_loop_stage_latency_seconds summary" in text
+    assert 'test_loop_stage_latency_seconds_count{stage="llm"} 1' in text
@@ -0,0 +1,332 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+
+def make_cache_key(*parts) -> str:
+    """
+    Builds a stable cache key from any number of parts by hashing their string representations.
+
+    Parameters:
+    *parts: The values that identify the cached entry.
+
+    Returns:
+    str: A SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class MemoryLRUCache:
+    """
+    A thread-safe in-memory least-recently-used cache of byte values, bounded by entry count and total size.
+    """
+
+    def __init__(self, max_items: int = 256, max_bytes: Optional[int] = None):
+        """
+        Parameters:
+        max_items (int): The maximum number of entries.
+        max_bytes (int, optional): The maximum total size of the values. Unbounded if None.
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while len(self._entries) > self.max_items or (
+                self.max_bytes is not None and self._size > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                self._size -= len(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+
+class DiskCache:
+    """
+    A directory of cached byte values, one file per key, bounded by a total size budget.
+
+    Files are written atomically (a temporary file renamed into place), so several processes can share
+    the directory. Reads refresh a file's modification time, and the least recently used files are
+    evicted once the budget is exceeded.
+
+    The size index only sees the writes of this process, so the directory is re-scanned before evicting
+    and after every rescan_bytes written. Eviction then follows the modification times of all the files,
+    whichever process wrote or read them, and the directory stays within about max_bytes plus
+    rescan_bytes per process instead of max_bytes per process.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        rescan_bytes: Optional[int] = None,
+    ):
+        """
+        Parameters:
+        directory (str): The cache directory. Created if it does not exist.
+        max_bytes (int): The size budget of the directory.
+        rescan_bytes (int, optional): The bytes written between two scans of the directory. Defaults to a
+            sixteenth of max_bytes.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rescan_bytes = (
+            rescan_bytes if rescan_bytes is not None else max_bytes // 16
+        )
+        self._lock = threading.Lock()
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._sizes: Dict[str, int] = {}
+        self._size = 0
+        self._written_since_scan = 0
+        self._scan()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def _scan(self):
+        """
+        Rebuilds the index from the files in the directory, including those written by a previous run or
+        another process, in modification time order. Files modified within the same clock tick keep the
+        order this process last saw them in.
+        """
+        local_order = {key: rank for rank, key in enumerate(self._sizes)}
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".bin"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                key = entry.name[:-4]
+                entries.append(
+                    (stat.st_mtime_ns, local_order.get(key, -1), key, stat.st_size)
+                )
+        self._sizes = {key: size for _, _, key, size in sorted(entries)}
+        self._size = sum(self._sizes.values())
+        self._written_since_scan = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cached:
+                value = cached.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(key)
+            return None
+        with self._lock:
+            # Keep the index in recency order
+            if key in self._sizes:
+                self._sizes[key] = self._sizes.pop(key)
+        return value
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                temp_file.write(value)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {key}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self._lock:
+            self._forget(key)
+            self._sizes[key] = len(value)
+            self._size += len(value)
+            self._written_since_scan += len(value)
+            if (
+                self._size > self.max_bytes
+                or self._written_since_scan >= self.rescan_bytes
+            ):
+                self._scan()
+            self._evict()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._forget(key)
+            self._remove_file(key)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._sizes):
+                self._remove_file(key)
+            self._sizes.clear()
+            self._size = 0
+
+    def _forget(self, key: str):
+        size = self._sizes.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def _remove_file(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._sizes:
+            key = next(iter(self._sizes))
+            self._forget(key)
+            self._remove_file(key)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+
+class TieredCache:
+    """
+    A two-tier cache of byte values: an in-memory LRU in front of an optional size-bounded disk store.
+    Disk hits are promoted to memory. Hit and miss counters are kept per tier.
+    """
+
+    def __init__(
+        self,
+        memory_items: int = 256,
+        memory_bytes: Optional[int] = None,
+        disk_directory: Optional[str] = None,
+        disk_bytes: int = 512 * 1024 * 1024,
+    ):
+        """
+        Parameters:
+        memory_items (int): The maximum number of entries kept in memory.
+        memory_bytes (int, optional): The maximum total size of the entries kept in memory.
+        disk_directory (str, optional): The directory of the disk tier. No disk tier if None.
+        disk_bytes (int): The size budget of the disk tier.
+        """
+        self.memory = MemoryLRUCache(memory_items, memory_bytes)
+        self.disk = DiskCache(disk_directory, disk_bytes) if disk_directory else None
+        self._stats_lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Looks a key up in memory, then on disk.
+
+        Parameters:
+        key (str): The cache key.
+
+        Returns:
+        bytes: The cached value, or None on a miss.
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+                self._count("disk_hits")
+                return value
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: bytes):
+        """
+        Stores a value in both tiers.
+
+        Parameters:
+        key (str): The cache key.
+        value (bytes): The value to cache.
+        """
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+        self._count("stores")
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get_stats(self) -> dict:
+        """
+        Reports hits per tier, misses, the hit ratio and the size of each tier.
+
+        Returns:
+        dict: The cache statistics.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = (
+            round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4)
+            if lookups
+            else 0.0
+        )
+        stats["memory_items"] = len(self.memory)
+        stats["memory_bytes"] = self.memory.size_bytes
+        stats["memory_evictions"] = self.memory.evictions
+        if self.disk is not None:
+            stats["disk_items"] = len(self.disk)
+            stats["disk_bytes"] = self.disk.size_bytes
+            stats["disk_evictions"] = self.disk.evictions
+        return stats
@@ -0,0 +1,1227 @@
+import io
+import itertools
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+import wave
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import azure.cognitiveservices.speech as speechsdk
+
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+TICKS_PER_SECOND = 10_000_000
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal")
+_MISSING = object()
+
+
+class FakeServiceError(Exception):
+    """
+    Raised by the fake backends when a failure is injected and the real client library has no
+    matching exception type.
+    """
+
+
+class FakeRateLimitError(FakeServiceError):
+    """
+    An injected rate-limit failure, with the status and Retry-After header of the service's 429 responses.
+    """
+
+    def __init__(self, message: str, retry_after_seconds: float = 1.0):
+        super().__init__(message)
+        self.http_status = 429
+        self.headers = {"Retry-After": str(retry_after_seconds)}
+
+
+class LatencyProfile:
+    """
+    A latency distribution and a failure rate for a fake backend call.
+    """
+
+    def __init__(
+        self,
+        mean_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        distribution: str = "normal",
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Parameters:
+        mean_seconds (float): The mean latency.
+        jitter_seconds (float): The spread of the latency: the half-width for "uniform", the standard
+            deviation for "normal" and "lognormal". Ignored for "constant".
+        distribution (str): "constant", "uniform", "normal" or "lognormal".
+        failure_rate (float): The probability, between 0 and 1, that a call fails.
+        seed (int, optional): Seeds the random generator, for reproducible runs.
+        """
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution: {distribution}. "
+                f"Expected one of {', '.join(LATENCY_DISTRIBUTIONS)}."
+            )
+        if not 0.0 <= failure_rate <= 1.0:
+            raise ValueError("failure_rate must be between 0 and 1.")
+        self.mean_seconds = mean_seconds
+        self.jitter_seconds = jitter_seconds
+        self.distribution = distribution
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """
+        Draws one latency.
+
+        Returns:
+        float: The latency in seconds, never negative.
+        """
+        mean, jitter = self.mean_seconds, self.jitter_seconds
+        with self._lock:
+            if self.distribution == "constant" or jitter <= 0:
+                latency = mean
+            elif self.distribution == "uniform":
+                latency = self._random.uniform(mean - jitter, mean + jitter)
+            elif self.distribution == "normal":
+                latency = self._random.gauss(mean, jitter)
+            else:
+                # Parameters of the underlying normal for the given mean and standard deviation
+                sigma = math.sqrt(math.log(1 + (jitter / mean) ** 2)) if mean > 0 else 0
+                mu = math.log(mean) - sigma**2 / 2 if mean > 0 else -math.inf
+                latency = self._random.lognormvariate(mu, sigma) if mean > 0 else 0.0
+        return max(latency, 0.0)
+
+    def wait(self, stop_event: Optional[threading.Event] = None) -> float:
+        """
+        Sleeps for one sampled latency, or until stop_event is set.
+
+        Parameters:
+        stop_event (threading.Event, optional): Interrupts the wait when set.
+
+        Returns:
+        float: The sampled latency in seconds.
+        """
+        latency = self.sample()
+        if latency > 0:
+            if stop_event is not None:
+                stop_event.wait(latency)
+            else:
+                time.sleep(latency)
+        return latency
+
+    def should_fail(self) -> bool:
+        """
+        Decides whether the current call fails.
+
+        Returns:
+        bool: True with probability failure_rate.
+        """
+        if self.failure_rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.failure_rate
+
+
+@contextmanager
+def _patched_attributes(patches: List[Tuple[object, str, object]]) -> Iterator[None]:
+    """
+    Sets attributes for the duration of the block and restores (or removes) them afterwards.
+    """
+    originals = [
+        (target, name, getattr(target, name, _MISSING)) for target, name, _ in patches
+    ]
+    for target, name, value in patches:
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for target, name, original in reversed(originals):
+            if original is _MISSING:
+                delattr(target, name)
+            else:
+                setattr(target, name, original)
+
+
+def _rebound_names(
+    replacements: Dict[object, object],
+) -> List[Tuple[object, str, object]]:
+    """
+    Finds the names the repository modules imported directly from a patched module (e.g.
+    "from azure.cognitiveservices.speech import SpeechConfig"), so they are patched too.
+    """
+    patches = []
+    for module_name, module in list(sys.modules.items()):
+        if not (module_name.startswith("src.") or module_name.startswith("utils.")):
+            continue
+        for name, value in list(vars(module).items()):
+            try:
+                replacement = replacements.get(value)
+            except TypeError:
+                continue
+            if replacement is not None:
+                patches.append((module, name, replacement))
+    return patches
+
+
+# Speech
+
+
+class FakeEventSignal:
+    """
+    Stands in for an SDK EventSignal: callbacks are connected and fired in order.
+    """
+
+    def __init__(self):
+        self._callbacks: List[Callable] = []
+
+    def connect(self, callback: Callable):
+        self._callbacks.append(callback)
+
+    def disconnect_all(self):
+        self._callbacks.clear()
+
+    def fire(self, evt):
+        for callback in list(self._callbacks):
+            try:
+                callback(evt)
+            except Exception as e:
+                # The SDK also keeps delivering events when a callback raises
+                logger.error(f"Callback {callback} raised: {e}")
+
+
+class FakePropertyCollection(dict):
+    """
+    Stands in for an SDK PropertyCollection.
+    """
+
+    def get_property(self, property_id, default_value: str = "") -> str:
+        return self.get(property_id, default_value)
+
+    def set_property(self, property_id, value: str):
+        self[property_id] = value
+
+
+class FakeSdkFuture:
+    """
+    Stands in for an SDK ResultFuture: the work runs on a thread and get() waits for its result.
+    """
+
+    def __init__(self, function: Callable, *args):
+        self._result = None
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, args=(function,) + args, daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, function: Callable, *args):
+        try:
+            self._result = function(*args)
+        except BaseException as e:
+            self._error = e
+
+    def get(self):
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class FakeSpeechConfig:
+    """
+    Stands in for SpeechConfig. Accepts any credentials and never connects anywhere.
+    """
+
+    def __init__(self, subscription=None, region=None, **kwargs):
+        self.subscription = subscription
+        self.region = region
+        self.properties = FakePropertyCollection()
+        self.speech_recognition_language = "en-US"
+        self.speech_synthesis_voice_name = None
+        self.speech_synthesis_output_format = None
+        self.output_format = speechsdk.OutputFormat.Simple
+        self.word_level_timestamps = False
+
+    def set_property(self, property_id, value: str):
+        self.properties.set_property(property_id, value)
+
+    def get_property(self, property_id) -> str:
+        return self.properties.get_property(property_id)
+
+    def request_word_level_timestamps(self):
+        self.word_level_timestamps = True
+
+    def set_speech_synthesis_output_format(self, output_format):
+        self.speech_synthesis_output_format = output_format
+
+
+class FakeAudioConfig:
+    """
+    Stands in for AudioConfig and AudioOutputConfig. The audio itself is never read.
+    """
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+class ScriptedUtterance:
+    """
+    One utterance a fake recognizer reports.
+    """
+
+    __slots__ = ("text", "duration_seconds", "speaker_id", "language", "intent_id")
+
+    def __init__(
+        self,
+        text: str,
+        duration_seconds: Optional[float] = None,
+        speaker_id: Optional[str] = "Guest-1",
+        language: Optional[str] = None,
+        intent_id: Optional[str] = None,
+    ):
+        """
+        Parameters:
+        text (str): The recognized text.
+        duration_seconds (float, optional): The length of the utterance. Defaults to 0.3 seconds per word.
+        speaker_id (str, optional): The speaker reported by conversation transcription.
+        language (str, optional): The language reported by source language auto-detection.
+        intent_id (str, optional): The intent reported by intent recognition.
+        """
+        self.text = text
+        self.duration_seconds = (
+            duration_seconds
+            if duration_seconds is not None
+            else 0.3 * max(len(text.split()), 1)
+        )
+        self.speaker_id = speaker_id
+        self.language = language
+        self.intent_id = intent_id
+
+    @classmethod
+    def from_value(cls, value: Union[str, dict, "ScriptedUtterance"]):
+        if isinstance(value, ScriptedUtterance):
+            return value
+        if isinstance(value, str):
+            return cls(value)
+        return cls(**value)
+
+
+class FakeRecognitionResult:
+    """
+    Stands in for the SDK recognition results (speech, conversation transcription and intent).
+    """
+
+    def __init__(
+        self,
+        reason: speechsdk.ResultReason,
+        text: str = "",
+        offset: int = 0,
+        duration: int = 0,
+        speaker_id: Optional[str] = None,
+        language: Optional[str] = None,
+        intent_id: str = "",
+        latency_seconds: float = 0.0,
+        cancellation_details=None,
+    ):
+        self.result_id = uuid.uuid4().hex
+        self.reason = reason
+        self.text = text
+        self.offset = offset
+        self.duration = duration
+        self.speaker_id = speaker_id
+        self.intent_id = intent_id
+        self.cancellation_details = cancellation_details
+        self.no_match_details = (
+            "No speech in the script."
+            if reason == speechsdk.ResultReason.NoMatch
+            else None
+        )
+        self.properties = FakePropertyCollection()
+        self.properties.set_property(
+            speechsdk.PropertyId.SpeechServiceResponse_RecognitionLatencyMs,
+            str(int(latency_seconds * 1000)),
+        )
+        if language:
+            self.properties.set_property(
+                speechsdk.PropertyId.SpeechServiceConnection_AutoDetectSourceLanguageResult,
+                language,
+            )
+        self.json = json.dumps(self._detail())
+
+    def _detail(self) -> dict:
+        """
+        The detailed result JSON, with evenly spread word timings.
+        """
+        words = self.text.split()
+        word_ticks = self.duration // max(len(words), 1)
+        return {
+            "RecognitionStatus": "Success",
+            "Offset": self.offset,
+            "Duration": self.duration,
+            "DisplayText": self.text,
+            "NBest": [
+                {
+                    "Display": self.text,
+                    "Words": [
+                        {
+                            "Word": word.strip(".,!?;:").lower(),
+                            "Offset": self.offset + index * word_ticks,
+                            "Duration": word_ticks,
+                        }
+                        for index, word in enumerate(words)
+                    ],
+                }
+            ],
+        }
+
+
+def _cancellation(message: str):
+    return SimpleNamespace(
+        reason=speechsdk.CancellationReason.Error,
+        code=speechsdk.CancellationErrorCode.ServiceError,
+        error_details=message,
+    )
+
+
+class FakeRecognizer:
+    """
+    Stands in for SpeechRecognizer, ConversationTranscriber and IntentRecognizer. A continuous session
+    plays the backend's script on a worker thread: session_started, then for each utterance a few
+    recognizing/transcribing partial results and one recognized/transcribed result, then
+    session_stopped. An injected failure fires canceled instead and ends the session.
+    """
+
+    def __init__(
+        self,
+        backend: "FakeSpeechBackend",
+        speech_config=None,
+        audio_config=None,
+        **kwargs,
+    ):
+        self.backend = backend
+        self.speech_config = speech_config
+        self.audio_config = audio_config
+        self.properties = FakePropertyCollection()
+        self.session_id = uuid.uuid4().hex
+        self.intents: List = []
+        for name in (
+            "recognizing",
+            "recognized",
+            "transcribing",
+            "transcribed",
+            "session_started",
+            "session_stopped",
+            "canceled",
+            "speech_start_detected",
+            "speech_end_detected",
+        ):
+            setattr(self, name, FakeEventSignal())
+        self._stop = threading.Event()
+        self._session: Optional[threading.Thread] = None
+
+    def add_intents(self, intents: List):
+        self.intents.extend(intents)
+
+    def _event(self, result=None, **kwargs):
+        return SimpleNamespace(session_id=self.session_id, result=result, **kwargs)
+
+    def _result(
+        self, utterance: ScriptedUtterance, offset: int, latency_seconds: float
+    ) -> FakeRecognitionResult:
+        reason = (
+            speechsdk.ResultReason.RecognizedIntent
+            if utterance.intent_id
+            else speechsdk.ResultReason.RecognizedSpeech
+        )
+        return FakeRecognitionResult(
+            reason,
+            utterance.text,
+            offset,
+            int(utterance.duration_seconds * TICKS_PER_SECOND),
+            utterance.speaker_id,
+            utterance.language,
+            utterance.intent_id or "",
+            latency_seconds,
+        )
+
+    def _run_session(self):
+        backend = self.backend
+        self.session_started.fire(self._event())
+        offset = 0
+        for utterance in backend.script:
+            if self._stop.is_set():
+                break
+            if backend.realtime_factor > 0:
+                self._stop.wait(utterance.duration_seconds * backend.realtime_factor)
+            latency = backend.latency.wait(self._stop)
+            if backend.latency.should_fail():
+                backend._count("failures")
+                details = _cancellation("Injected recognition failure.")
+                self.canceled.fire(
+                    self._event(
+                        FakeRecognitionResult(
+                            speechsdk.ResultReason.Canceled,
+                            cancellation_details=details,
+                        ),
+                        reason=details.reason,
+                        cancellation_details=details,
+                        error_details=details.error_details,
+                    )
+                )
+                # Like the SDK, a canceled session still ends with session_stopped
+                break
+
+            words = utterance.text.split()
+            for count in range(1, min(backend.partial_results, len(words)) + 1):
+                partial = FakeRecognitionResult(
+                    speechsdk.ResultReason.RecognizingSpeech,
+                    " ".join(
+                        words[: max(len(words) * count // backend.partial_results, 1)]
+                    ),
+                    offset,
+                )
+                self.recognizing.fire(self._event(partial))
+                self.transcribing.fire(self._event(partial))
+
+            result = self._result(utterance, offset, latency)
+            self.recognized.fire(self._event(result))
+            self.transcribed.fire(self._event(result))
+            backend._count("recognized")
+            offset += result.duration + int(0.2 * TICKS_PER_SECOND)
+        self.session_stopped.fire(self._event())
+
+    def start_continuous_recognition(self):
+        self.backend._count("sessions")
+        self._stop.clear()
+        self._session = threading.Thread(target=self._run_session, daemon=True)
+        self._session.start()
+
+    def start_continuous_recognition_async(self) -> FakeSdkFuture:
+        self.start_continuous_recognition()
+        return FakeSdkFuture(lambda: None)
+
+    def stop_continuous_recognition(self):
+        self._stop.set()
+        if (
+            self._session is not None
+            and self._session is not threading.current_thread()
+        ):
+            self._session.join()
+
+    def stop_continuous_recognition_async(self) -> FakeSdkFuture:
+        return FakeSdkFuture(self.stop_continuous_recognition)
+
+    start_transcribing_async = start_continuous_recognition_async
+    stop_transcribing_async = stop_continuous_recognition_async
+
+    def recognize_once(self) -> FakeRecognitionResult:
+        """
+        Recognizes the next utterance of the script (cycling through it), after one sampled latency. The
+        utterance is framed by speech_start_detected and speech_end_detected, and lasts its duration
+        scaled by the realtime factor.
+        """
+        backend = self.backend
+        utterance = backend.next_utterance()
+        if utterance is not None:
+            self.speech_start_detected.fire(self._event(offset=0))
+            if backend.realtime_factor > 0:
+                time.sleep(utterance.duration_seconds * backend.realtime_factor)
+            self.speech_end_detected.fire(
+                self._event(offset=int(utterance.duration_seconds * TICKS_PER_SECOND))
+            )
+        latency = backend.latency.wait()
+        if backend.latency.should_fail():
+            backend._count("failures")
+            return FakeRecognitionResult(
+                speechsdk.ResultReason.Canceled,
+                cancellation_details=_cancellation("Injected recognition failure."),
+            )
+        if utterance is None:
+            return FakeRecognitionResult(speechsdk.ResultReason.NoMatch)
+        backend._count("recognized")
+        return self._result(utterance, 0, latency)
+
+    def recognize_once_async(self) -> FakeSdkFuture:
+        return FakeSdkFuture(self.recognize_once)
+
+
+class FakeConnection:
+    """
+    Stands in for Connection: opening and closing always succeed.
+    """
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self.connected = FakeEventSignal()
+        self.disconnected = FakeEventSignal()
+
+    @classmethod
+    def from_recognizer(cls, recognizer) -> "FakeConnection":
+        return cls(recognizer)
+
+    def open(self, for_continuous_recognition: bool = False):
+        self.connected.fire(SimpleNamespace(session_id=uuid.uuid4().hex))
+
+    def close(self):
+        self.disconnected.fire(SimpleNamespace(session_id=uuid.uuid4().hex))
+
+
+class FakeSynthesisResult:
+    """
+    Stands in for SpeechSynthesisResult: silent 16-bit mono WAV audio sized to the text.
+    """
+
+    def __init__(
+        self,
+        reason,
+        audio_data: bytes = b"",
+        latency_seconds: float = 0.0,
+        cancellation_details=None,
+    ):
+        self.result_id = uuid.uuid4().hex
+        self.reason = reason
+        self.audio_data = audio_data
+        self.audio_duration = None
+        self.cancellation_details = cancellation_details
+        self.properties = FakePropertyCollection()
+        self.properties.set_property(
+            speechsdk.PropertyId.SpeechServiceResponse_SynthesisFirstByteLatencyMs,
+            str(int(latency_seconds * 1000)),
+        )
+
+
+def silent_wav(seconds: float, sample_rate: int = 24000) -> bytes:
+    """
+    Builds a silent 16-bit mono WAV file.
+
+    Parameters:
+    seconds (float): The length of the audio.
+    sample_rate (int): The sample rate.
+
+    Returns:
+    bytes: The WAV file.
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x00\x00" * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+class FakeSynthesizer:
+    """
+    Stands in for SpeechSynthesizer. Each synthesis waits one sampled latency and returns silent audio
+    of about 60 ms per character.
+    """
+
+    def __init__(
+        self,
+        backend: "FakeSpeechBackend",
+        speech_config=None,
+        audio_config=None,
+        **kwargs,
+    ):
+        self.backend = backend
+        self.speech_config = speech_config
+        self.audio_config = audio_config
+        self.properties = FakePropertyCollection()
+        self.synthesis_started = FakeEventSignal()
+        self.synthesizing = FakeEventSignal()
+        self.synthesis_completed = FakeEventSignal()
+        self.synthesis_canceled = FakeEventSignal()
+
+    def _speak(self, text: str) -> FakeSynthesisResult:
+        backend = self.backend
+        latency = backend.synthesis_latency.wait()
+        if backend.synthesis_latency.should_fail():
+            backend._count("failures")
+            result = FakeSynthesisResult(
+                speechsdk.ResultReason.Canceled,
+                cancellation_details=_cancellation("Injected synthesis failure."),
+            )
+            self.synthesis_canceled.fire(SimpleNamespace(result=result))
+            return result
+        backend._count("syntheses")
+        result = FakeSynthesisResult(
+            speechsdk.ResultReason.SynthesizingAudioCompleted,
+            silent_wav(0.06 * len(text)),
+            latency,
+        )
+        self.synthesis_completed.fire(SimpleNamespace(result=result))
+        return result
+
+    def speak_text_async(self, text: str) -> FakeSdkFuture:
+        return FakeSdkFuture(self._speak, text)
+
+    def speak_ssml_async(self, ssml: str) -> FakeSdkFuture:
+        return FakeSdkFuture(self._speak, ssml)
+
+    def speak_text(self, text: str) -> FakeSynthesisResult:
+        return self._speak(text)
+
+    def stop_speaking_async(self) -> FakeSdkFuture:
+        return FakeSdkFuture(lambda: None)
+
+
+class _BackendStats:
+    """
+    Thread-safe call counters shared by the fake backends.
+    """
+
+    def __init__(self, *names: str):
+        self._stats_lock = threading.Lock()
+        self._stats = {name: 0 for name in names}
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[name] = self._stats.get(name, 0) + amount
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            return dict(self._stats)
+
+
+class FakeSpeechBackend(_BackendStats):
+    """
+    A local stand-in for the Speech service. While installed, the SDK's SpeechConfig, AudioConfig,
+    SpeechRecognizer, ConversationTranscriber, IntentRecognizer, SpeechSynthesizer and Connection are
+    replaced with fakes, so SpeechTranscriber, SpeechRecognizer, IntentRecognizer and SpeechSynthesizer
+    run unchanged without network access or credentials.
+
+    Usage:
+        backend = FakeSpeechBackend(["Hello.", "How can I help?"], latency=LatencyProfile(0.2, 0.05))
+        with backend.install():
+            text = SpeechTranscriber().transcribe_speech_from_file_continuous(file_path="call.wav")
+    """
+
+    def __init__(
+        self,
+        script: Optional[Sequence[Union[str, dict, ScriptedUtterance]]] = None,
+        latency: Optional[LatencyProfile] = None,
+        synthesis_latency: Optional[LatencyProfile] = None,
+        partial_results: int = 2,
+        realtime_factor: float = 0.0,
+    ):
+        """
+        Parameters:
+        script (Sequence): The utterances every session reports, as texts, dicts of ScriptedUtterance
+            arguments or ScriptedUtterance objects.
+        latency (LatencyProfile, optional): The delay and failure rate of each recognized utterance.
+        synthesis_latency (LatencyProfile, optional): The delay and failure rate of each synthesis.
+        partial_results (int): The number of partial results fired before each utterance.
+        realtime_factor (float): Also waits this fraction of each utterance's duration before reporting
+            it, to simulate audio being consumed in real time. 0 reports as fast as possible.
+        """
+        super().__init__("sessions", "recognized", "syntheses", "failures")
+        self.script = [ScriptedUtterance.from_value(value) for value in script or []]
+        self.latency = latency or LatencyProfile()
+        self.synthesis_latency = synthesis_latency or LatencyProfile()
+        self.partial_results = partial_results
+        self.realtime_factor = realtime_factor
+        self._cursor = itertools.cycle(self.script) if self.script else None
+        self._cursor_lock = threading.Lock()
+
+    def next_utterance(self) -> Optional[ScriptedUtterance]:
+        if self._cursor is None:
+            return None
+        with self._cursor_lock:
+            return next(self._cursor)
+
+    def create_recognizer(self, **kwargs) -> FakeRecognizer:
+        return FakeRecognizer(self, **kwargs)
+
+    def create_synthesizer(self, **kwargs) -> FakeSynthesizer:
+        return FakeSynthesizer(self, **kwargs)
+
+    @contextmanager
+    def install(self) -> Iterator["FakeSpeechBackend"]:
+        """
+        Replaces the Speech SDK entry points with the fakes for the duration of the block.
+        """
+        intent = SimpleNamespace(
+            IntentRecognizer=self.create_recognizer,
+            LanguageUnderstandingModel=lambda **kwargs: SimpleNamespace(**kwargs),
+            IntentRecognitionEventArgs=SimpleNamespace,
+        )
+        replacements = {
+            speechsdk.SpeechConfig: FakeSpeechConfig,
+            speechsdk.audio.AudioConfig: FakeAudioConfig,
+            speechsdk.audio.AudioOutputConfig: FakeAudioConfig,
+            speechsdk.SpeechRecognizer: self.create_recognizer,
+            speechsdk.transcription.ConversationTranscriber: self.create_recognizer,
+            speechsdk.SpeechSynthesizer: self.create_synthesizer,
+            speechsdk.Connection: FakeConnection,
+        }
+        patches = [
+            (speechsdk, "SpeechConfig", FakeSpeechConfig),
+            (speechsdk, "AudioConfig", FakeAudioConfig),
+            (speechsdk.audio, "AudioConfig", FakeAudioConfig),
+            (speechsdk.audio, "AudioOutputConfig", FakeAudioConfig),
+            (speechsdk, "SpeechRecognizer", self.create_recognizer),
+            (
+                speechsdk.transcription,
+                "ConversationTranscriber",
+                self.create_recognizer,
+            ),
+            (speechsdk, "SpeechSynthesizer", self.create_synthesizer),
+            (speechsdk, "Connection", FakeConnection),
+            (speechsdk, "intent", intent),
+        ] + _rebound_names(replacements)
+        with _patched_attributes(patches):
+            yield self
+
+
+# OpenAI
+
+
+class FakeOpenAIObject(dict):
+    """
+    A dict that also allows attribute access, like the legacy OpenAIObject responses.
+    """
+
+    def __getattr__(self, name: str):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def _openai_object(value):
+    if isinstance(value, dict):
+        return FakeOpenAIObject(
+            {key: _openai_object(item) for key, item in value.items()}
+        )
+    if isinstance(value, list):
+        return [_openai_object(item) for item in value]
+    return value
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(math.ceil(len(text) / 4), 1) if text else 0
+
+
+class FakeChatCompletion(_BackendStats):
+    """
+    A local stand-in for the (legacy) openai.ChatCompletion and openai.Completion APIs, including
+    streaming and acreate. While installed, AzureOpenAIAssistant runs unchanged without network access.
+    """
+
+    def __init__(
+        self,
+        responder: Union[None, str, Sequence[str], Callable[[List[dict]], str]] = None,
+        latency: Optional[LatencyProfile] = None,
+        token_latency: Optional[LatencyProfile] = None,
+        retry_after_seconds: float = 1.0,
+    ):
+        """
+        Parameters:
+        responder (str, Sequence[str] or Callable): The replies: a fixed text, texts returned in turn, or
+            a function of the request messages. Defaults to echoing the last user message.
+        latency (LatencyProfile, optional): The delay until the response (or the first streamed token)
+            and the failure rate. Failures raise a rate-limit error with a Retry-After header.
+        token_latency (LatencyProfile, optional): The delay between streamed tokens.
+        retry_after_seconds (float): The Retry-After value of injected rate-limit errors.
+        """
+        super().__init__(
+            "calls", "stream_calls", "failures", "prompt_tokens", "completion_tokens"
+        )
+        self.responder = responder
+        self.latency = latency or LatencyProfile()
+        self.token_latency = token_latency or LatencyProfile()
+        self.retry_after_seconds = retry_after_seconds
+        self.requests: List[dict] = []
+        self._replies = None
+        if isinstance(responder, (list, tuple)):
+            self._replies = itertools.cycle(responder)
+        self._lock = threading.Lock()
+
+    def _reply(self, messages: List[dict]) -> str:
+        if callable(self.responder):
+            return self.responder(messages)
+        if self._replies is not None:
+            with self._lock:
+                return next(self._replies)
+        if isinstance(self.responder, str):
+            return self.responder
+        last_user = next(
+            (m["content"] for m in reversed(messages) if m.get("role") == "user"), ""
+        )
+        return f"This is a fake reply to: {last_user}"
+
+    def _rate_limit_error(self) -> Exception:
+        message = "Injected rate limit."
+        try:
+            import openai
+
+            return openai.error.RateLimitError(
+                message, headers={"Retry-After": str(self.retry_after_seconds)}
+            )
+        except (ImportError, AttributeError, TypeError):
+            return FakeRateLimitError(message, self.retry_after_seconds)
+
+    def _start(self, messages: List[dict], stream: bool, request: dict):
+        with self._lock:
+            self.requests.append(request)
+        self._count("stream_calls" if stream else "calls")
+        self.latency.wait()
+        if self.latency.should_fail():
+            self._count("failures")
+            raise self._rate_limit_error()
+        reply = self._reply(messages)
+        prompt_text = " ".join(str(message.get("content", "")) for message in messages)
+        self._count("prompt_tokens", _estimate_tokens(prompt_text))
+        self._count("completion_tokens", _estimate_tokens(reply))
+        return reply
+
+    @staticmethod
+    def _messages(messages: Optional[List[dict]], prompt: Optional[str]) -> List[dict]:
+        if messages is not None:
+            return messages
+        return [{"role": "user", "content": prompt or ""}]
+
+    def _response(self, reply: str, messages: List[dict], is_chat: bool):
+        choice = (
+            {"index": 0, "message": {"role": "assistant", "content": reply}}
+            if is_chat
+            else {"index": 0, "text": reply}
+        )
+        choice["finish_reason"] = "stop"
+        prompt_tokens = _estimate_tokens(
+            " ".join(str(message.get("content", "")) for message in messages)
+        )
+        completion_tokens = _estimate_tokens(reply)
+        return _openai_object(
+            {
+                "id": f"fake-{uuid.uuid4().hex}",
+                "object": "chat.completion" if is_chat else "text_completion",
+                "created": int(time.time()),
+                "choices": [choice],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+        )
+
+    @staticmethod
+    def _tokens(reply: str) -> List[str]:
+        # Words with their leading space, close enough to model tokens for pacing
+        return [token for token in reply.replace(" ", "\x00 ").split("\x00") if token]
+
+    def _chunk(self, token: Optional[str], is_chat: bool, finish_reason=None):
+        if is_chat:
+            choice = {"index": 0, "delta": {"content": token} if token else {}}
+        else:
+            choice = {"index": 0, "text": token or ""}
+        choice["finish_reason"] = finish_reason
+        return _openai_object({"choices": [choice]})
+
+    def _stream(self, reply: str, is_chat: bool) -> Iterator[FakeOpenAIObject]:
+        for index, token in enumerate(self._tokens(reply)):
+            if index:
+                self.token_latency.wait()
+            yield self._chunk(token, is_chat)
+        yield self._chunk(None, is_chat, "stop")
+
+    def create(self, messages=None, prompt=None, stream: bool = False, **kwargs):
+        """
+        Returns a chat completion (if messages are given) or a text completion (if a prompt is given).
+        """
+        is_chat = messages is not None
+        messages = self._messages(messages, prompt)
+        reply = self._start(messages, stream, dict(kwargs, messages=messages))
+        if stream:
+            return self._stream(reply, is_chat)
+        return self._response(reply, messages, is_chat)
+
+    async def acreate(self, messages=None, prompt=None, stream: bool = False, **kwargs):
+        """
+        Asynchronous version of create. The latencies are awaited instead of slept.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        is_chat = messages is not None
+        messages = self._messages(messages, prompt)
+        reply = await loop.run_in_executor(
+            None, self._start, messages, stream, dict(kwargs, messages=messages)
+        )
+        if not stream:
+            return self._response(reply, messages, is_chat)
+
+        async def stream_chunks():
+            for index, token in enumerate(self._tokens(reply)):
+                if index:
+                    await asyncio.sleep(self.token_latency.sample())
+                yield self._chunk(token, is_chat)
+            yield self._chunk(None, is_chat, "stop")
+
+        return stream_chunks()
+
+    @contextmanager
+    def install(self) -> Iterator["FakeChatCompletion"]:
+        """
+        Replaces openai.ChatCompletion and openai.Completion with this fake for the duration of the block.
+        If the installed openai package has no legacy openai.error module, one is provided with
+        FakeServiceError-based OpenAIError and RateLimitError types.
+        """
+        import openai
+
+        patches = [(openai, "ChatCompletion", self), (openai, "Completion", self)]
+        if not hasattr(openai, "error"):
+            patches.append(
+                (
+                    openai,
+                    "error",
+                    SimpleNamespace(
+                        OpenAIError=FakeServiceError,
+                        RateLimitError=FakeRateLimitError,
+                        APIError=FakeServiceError,
+                        Timeout=FakeServiceError,
+                        ServiceUnavailableError=FakeServiceError,
+                    ),
+                )
+            )
+        with _patched_attributes(patches):
+            yield self
+
+
+# Blob storage
+
+
+class FakeBlobDownloader:
+    """
+    Stands in for StorageStreamDownloader: the content is served in chunks, each after one sampled latency.
+    """
+
+    def __init__(self, data: bytes, chunk_size: int, latency: LatencyProfile):
+        self._data = data
+        self._chunk_size = chunk_size
+        self._latency = latency
+        self.size = len(data)
+
+    def chunks(self) -> Iterator[bytes]:
+        for start in range(0, len(self._data), self._chunk_size):
+            end = start + self._chunk_size
+            self._latency.wait()
+            yield self._data[start:end]
+
+    def readall(self) -> bytes:
+        return b"".join(self.chunks())
+
+    def content_as_bytes(self) -> bytes:
+        return self.readall()
+
+    def readinto(self, stream) -> int:
+        for chunk in self.chunks():
+            stream.write(chunk)
+        return self.size
+
+
+class FakeBlobClient:
+    """
+    Stands in for BlobClient, backed by a FakeBlobStore.
+    """
+
+    def __init__(self, store: "FakeBlobStore", container_name: str, blob_name: str):
+        self.store = store
+        self.container_name = container_name
+        self.blob_name = blob_name
+        self.url = f"https://fake.blob.core.windows.net/{container_name}/{blob_name}"
+
+    def download_blob(self, **kwargs) -> FakeBlobDownloader:
+        data, _ = self.store._get(self.container_name, self.blob_name)
+        return FakeBlobDownloader(data, self.store.chunk_size, self.store.latency)
+
+    def upload_blob(self, data, overwrite: bool = False, **kwargs) -> dict:
+        if hasattr(data, "read"):
+            data = data.read()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        etag = self.store._put(
+            self.container_name, self.blob_name, bytes(data), overwrite
+        )
+        return {"etag": etag}
+
+    def get_blob_properties(self, **kwargs):
+        data, etag = self.store._get(
+            self.container_name, self.blob_name, download=False
+        )
+        return SimpleNamespace(
+            name=self.blob_name,
+            container=self.container_name,
+            size=len(data),
+            etag=etag,
+        )
+
+    def exists(self, **kwargs) -> bool:
+        return self.store.exists(self.container_name, self.blob_name)
+
+    def delete_blob(self, **kwargs):
+        self.store._delete(self.container_name, self.blob_name)
+
+
+class FakeContainerClient:
+    """
+    Stands in for ContainerClient, backed by a FakeBlobStore.
+    """
+
+    def __init__(self, store: "FakeBlobStore", container_name: str):
+        self.store = store
+        self.container_name = container_name
+
+    def get_blob_client(self, blob: str) -> FakeBlobClient:
+        return FakeBlobClient(self.store, self.container_name, blob)
+
+    def upload_blob(
+        self, name: str, data, overwrite: bool = False, **kwargs
+    ) -> FakeBlobClient:
+        blob_client = self.get_blob_client(name)
+        blob_client.upload_blob(data, overwrite=overwrite)
+        return blob_client
+
+    def list_blobs(self, name_starts_with: Optional[str] = None, **kwargs):
+        return [
+            SimpleNamespace(name=name, size=size, container=self.container_name)
+            for name, size in self.store.list(self.container_name, name_starts_with)
+        ]
+
+    def delete_blob(self, blob: str, **kwargs):
+        self.store._delete(self.container_name, blob)
+
+
+class FakeBlobStore(_BackendStats):
+    """
+    An in-memory stand-in for Azure Blob Storage. While installed on the shared blob client pool, it hands
+    out fake container and blob clients, so blob transcription and uploads run without network access. The
+    transcribers still need AZURE_STORAGE_CONNECTION_STRING to be set, to any value.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyProfile] = None,
+        chunk_size: int = 4 * 1024 * 1024,
+    ):
+        """
+        Parameters:
+        latency (LatencyProfile, optional): The delay of each request and downloaded chunk, and the
+            failure rate of each request. Failures raise azure.core ServiceRequestError.
+        chunk_size (int): The size of the chunks downloads are served in.
+        """
+        super().__init__("reads", "writes", "failures")
+        self.latency = latency or LatencyProfile()
+        self.chunk_size = chunk_size
+        self._blobs: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def _request(self):
+        from azure.core.exceptions import ServiceRequestError
+
+        self.latency.wait()
+        if self.latency.should_fail():
+            self._count("failures")
+            raise ServiceRequestError("Injected blob storage failure.")
+
+    def put(self, container_name: str, blob_name: str, data: bytes) -> str:
+        """
+        Stores a blob directly, without latency or failures, e.g. to set up a benchmark.
+
+        Returns:
+        str: The ETag of the blob.
+        """
+        etag = f'"0x{uuid.uuid4().hex[:16].upper()}"'
+        with self._lock:
+            self._blobs[(container_name, blob_name)] = (data, etag)
+        return etag
+
+    def _put(
+        self, container_name: str, blob_name: str, data: bytes, overwrite: bool
+    ) -> str:
+        from azure.core.exceptions import ResourceExistsError
+
+        self._request()
+        if not overwrite and self.exists(container_name, blob_name):
+            raise ResourceExistsError(
+                f"The blob {container_name}/{blob_name} already exists."
+            )
+        self._count("writes")
+        return self.put(container_name, blob_name, data)
+
+    def _get(
+        self, container_name: str, blob_name: str, download: bool = True
+    ) -> Tuple[bytes, str]:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        self._request()
+        with self._lock:
+            blob = self._blobs.get((container_name, blob_name))
+        if blob is None:
+            raise ResourceNotFoundError(
+                f"The blob {container_name}/{blob_name} does not exist."
+            )
+        if download:
+            self._count("reads")
+        return blob
+
+    def _delete(self, container_name: str, blob_name: str):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        self._request()
+        with self._lock:
+            if self._blobs.pop((container_name, blob_name), None) is None:
+                raise ResourceNotFoundError(
+                    f"The blob {container_name}/{blob_name} does not exist."
+                )
+
+    def exists(self, container_name: str, blob_name: str) -> bool:
+        with self._lock:
+            return (container_name, blob_name) in self._blobs
+
+    def list(
+        self, container_name: str, prefix: Optional[str] = None
+    ) -> List[Tuple[str, int]]:
+        with self._lock:
+            return sorted(
+                (name, len(data))
+                for (container, name), (data, _) in self._blobs.items()
+                if container == container_name
+                and (not prefix or name.startswith(prefix))
+            )
+
+    def get_container_client(
+        self, connection_string: str, container_name: str
+    ) -> FakeContainerClient:
+        return FakeContainerClient(self, container_name)
+
+    def get_blob_client(
+        self, connection_string: str, container_name: str, blob_name: str
+    ) -> FakeBlobClient:
+        return FakeBlobClient(self, container_name, blob_name)
+
+    @contextmanager
+    def install(self, pool) -> Iterator["FakeBlobStore"]:
+        """
+        Makes a blob client pool hand out fake clients for the duration of the block.
+
+        Parameters:
+        pool: The pool to patch, e.g. src.speech.utils_blob.blob_client_pool. Anything with
+            get_container_client and get_blob_client methods taking the same arguments.
+        """
+        with _patched_attributes(
+            [
+                (pool, "get_container_client", self.get_container_client),
+                (pool, "get_blob_client", self.get_blob_client),
+            ]
+        ):
+            yield self
@@ -1,7 +1,14 @@
+import atexit
 import functools
+import inspect
+import itertools
 import logging
+import logging.handlers
+import os
+import queue
+import threading
 import time
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional, Tuple
 
 # Define a new logging level named "KEYINFO" with a level of 25
 KEYINFO_LEVEL_NUM = 25
@@ -36,10 +43,36 @@ class CustomFormatter(logging.Formatter):  # type: ignore
         return super().format(record)
 
 
+class DeferredQueueHandler(logging.handlers.QueueHandler):  # type: ignore
+    """
+    A QueueHandler that enqueues records as they are, so that formatting happens on the listener
+    thread together with the I/O, instead of on the thread that logged.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:  # type: ignore
+        return record
+
+
+_queue_listeners: Dict[str, logging.handlers.QueueListener] = {}  # type: ignore
+
+
+def _stop_queue_listeners():
+    """
+    Flushes and stops the background logging threads, so no queued record is lost at exit.
+    """
+    for listener in _queue_listeners.values():
+        listener.stop()
+    _queue_listeners.clear()
+
+
+atexit.register(_stop_queue_listeners)
+
+
 def get_logger(
     name: str = "micro",
     level: Optional[int] = None,
     include_stream_handler: bool = True,
+    use_queue: Optional[bool] = None,
 ) -> logging.Logger:  # type: ignore
     """
     Returns a configured logger with a custom name, level, and formatter.
@@ -48,6 +81,9 @@ def get_logger(
     name (str): Name of the logger.
     level (int, optional): Initial logging level. Defaults to INFO if not provided.
     include_stream_handler (bool): Whether to include a stream handler. Defaults to True.
+    use_queue (bool, optional): Whether the stream handler runs on a background QueueListener thread, so
+        that logging calls only enqueue the record. Defaults to the ML_LOGGING_QUEUE environment variable
+        ("1" or "true" to enable).
 
     Returns:
     logging.Logger: Configured logger instance.
@@ -57,12 +93,34 @@ def get_logger(
         "%(levelname)-8s %(message)s (%(filename)s:%(funcName)s:%(lineno)d)"
     )
     logger = logging.getLogger(name)  # type: ignore
+    if use_queue is None:
+        use_queue = os.getenv("ML_LOGGING_QUEUE", "").lower() in ("1", "true")
 
     # Set the logging level if it's specified or if the logger has no level set
     if level is not None or logger.level == 0:
         logger.setLevel(level or logging.INFO)  # type: ignore
 
-    if include_stream_handler and not any(isinstance(h, logging.StreamHandler) for h in logger.handlers):  # type: ignore
+    if not include_stream_handler:
+        return logger
+
+    has_queue_handler = any(isinstance(h, DeferredQueueHandler) for h in logger.handlers)  # type: ignore
+    if use_queue and not has_queue_handler:
+        # Move any stream handler behind the queue
+        stream_handlers = [h for h in logger.handlers if isinstance(h, logging.StreamHandler)]  # type: ignore
+        for handler in stream_handlers:
+            logger.removeHandler(handler)
+        if not stream_handlers:
+            sh = logging.StreamHandler()  # type: ignore
+            sh.setFormatter(formatter)
+            stream_handlers = [sh]
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(  # type: ignore
+            log_queue, *stream_handlers, respect_handler_level=True
+        )
+        listener.start()
+        _queue_listeners[name] = listener
+        logger.addHandler(DeferredQueueHandler(log_queue))
+    elif not has_queue_handler and not any(isinstance(h, logging.StreamHandler) for h in logger.handlers):  # type: ignore
         sh = logging.StreamHandler()  # type: ignore
         sh.setFormatter(formatter)
         logger.addHandler(sh)
@@ -70,47 +128,212 @@ def get_logger(
     return logger
 
 
+class LogRateLimiter:
+    """
+    Decides whether a high-frequency event (e.g. RECOGNIZING partial results) should be logged, allowing
+    at most one record per interval and, optionally, one in every N events. The number of events skipped
+    since the last logged one is returned with each decision, so it can be included in the message.
+    """
+
+    def __init__(self, min_interval_seconds: float = 1.0, sample_every: int = 1):
+        """
+        Parameters:
+        min_interval_seconds (float): The minimum time between two logged events.
+        sample_every (int): Only every sample_every-th event is considered for logging.
+        """
+        self.min_interval_seconds = min_interval_seconds
+        self.sample_every = sample_every
+        self._lock = threading.Lock()
+        self._events = 0
+        self._suppressed = 0
+        self._last_logged = -float("inf")
+
+    def allow(self) -> Tuple[bool, int]:
+        """
+        Registers an event.
+
+        Returns:
+        Tuple[bool, int]: Whether to log this event, and how many events were suppressed since the last logged one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._events += 1
+            if (
+                self._events % self.sample_every
+                or now - self._last_logged < self.min_interval_seconds
+            ):
+                self._suppressed += 1
+                return False, self._suppressed
+            suppressed, self._suppressed = self._suppressed, 0
+            self._last_logged = now
+            return True, suppressed
+
+
+class _LazyArguments:
+    """
+    Formats call arguments only if a log record is actually emitted.
+    """
+
+    __slots__ = ("args", "kwargs")
+
+    def __init__(self, args: tuple, kwargs: dict):
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        args_str = ", ".join(map(str, self.args))
+        kwargs_str = ", ".join(f"{k}={v}" for k, v in self.kwargs.items())
+        return f"{args_str} and keyword arguments: {kwargs_str}"
+
+
+_function_call_stats: Dict[str, Dict[str, float]] = {}
+_function_call_stats_lock = threading.Lock()
+
+
+def _record_function_call(name: str, duration: float, failed: bool):
+    with _function_call_stats_lock:
+        stats = _function_call_stats.get(name)
+        if stats is None:
+            stats = _function_call_stats[name] = {
+                "calls": 0,
+                "errors": 0,
+                "total_seconds": 0.0,
+                "max_seconds": 0.0,
+            }
+        stats["calls"] += 1
+        stats["errors"] += failed
+        stats["total_seconds"] += duration
+        if duration > stats["max_seconds"]:
+            stats["max_seconds"] = duration
+
+
+def get_function_call_stats() -> Dict[str, dict]:
+    """
+    Returns the call counts and durations aggregated by log_function_call(aggregate=True).
+
+    Returns:
+    Dict[str, dict]: For each decorated function (by qualified name): calls, errors, total_seconds,
+    mean_seconds and max_seconds.
+    """
+    with _function_call_stats_lock:
+        snapshot = {name: dict(stats) for name, stats in _function_call_stats.items()}
+    for stats in snapshot.values():
+        stats["mean_seconds"] = (
+            stats["total_seconds"] / stats["calls"] if stats["calls"] else 0.0
+        )
+    return snapshot
+
+
+def reset_function_call_stats():
+    """
+    Clears the aggregated call statistics.
+    """
+    with _function_call_stats_lock:
+        _function_call_stats.clear()
+
+
 def log_function_call(
-    logger_name: str, log_inputs: bool = False, log_output: bool = False
+    logger_name: str,
+    log_inputs: bool = False,
+    log_output: bool = False,
+    sample_every: int = 1,
+    aggregate: bool = False,
 ) -> Callable:
     """
     Decorator to log function calls, input arguments, output, execution duration, and completion message.
 
+    The logger is resolved once, when the function is decorated. Messages are only formatted if the
+    logger is enabled for INFO, and argument and output strings only when a record is emitted, so the
+    decorator can stay on hot paths. Coroutine functions are supported.
+
     Parameters:
     logger_name (str): The name for the logger.
-    log_inputs (bool): Whether to log input arguments. Defaults to True.
-    log_output (bool): Whether to log the function's output. Defaults to True.
+    log_inputs (bool): Whether to log input arguments. Defaults to False.
+    log_output (bool): Whether to log the function's output. Defaults to False.
+    sample_every (int): Log only one in every sample_every calls. Defaults to 1 (every call).
+    aggregate (bool): Whether to count every call and its duration in memory, whether or not it is
+        logged. See get_function_call_stats. Defaults to False.
 
     Returns:
     Callable: The decorated function.
     """
+    if sample_every < 1:
+        raise ValueError("sample_every must be at least 1.")
 
     def decorator_log_function_call(func):
-        @functools.wraps(func)
-        def wrapper_log_function_call(*args, **kwargs):
-            logger = get_logger(logger_name)
-            func_name = func.__name__
+        logger = get_logger(logger_name)
+        func_name = func.__name__
+        qualified_name = f"{func.__module__}.{func.__qualname__}"
+        # Attribute the records to the decorated function rather than to this wrapper
+        extra = {
+            "func_name_override": func_name,
+            "file_name_override": os.path.basename(func.__code__.co_filename),
+        }
+        call_counter = itertools.count()
+
+        def should_log() -> bool:
+            return next(call_counter) % sample_every == 0 and logger.isEnabledFor(
+                logging.INFO
+            )
 
+        def log_start(args, kwargs):
             if log_inputs:
-                args_str = ", ".join(map(str, args))
-                kwargs_str = ", ".join(f"{k}={v}" for k, v in kwargs.items())
                 logger.info(
-                    f"Function {func_name} called with arguments: {args_str} and keyword arguments: {kwargs_str}"
+                    "Function %s called with arguments: %s",
+                    func_name,
+                    _LazyArguments(args, kwargs),
+                    extra=extra,
                 )
             else:
-                logger.info(f"Function {func_name} called")
-
-            start_time = time.time()
-            result = func(*args, **kwargs)
-            duration = time.time() - start_time
+                logger.info("Function %s called", func_name, extra=extra)
 
+        def log_end(result, duration):
             if log_output:
-                logger.info(f"Function {func_name} output: {result}")
+                logger.info("Function %s output: %s", func_name, result, extra=extra)
+            logger.info(
+                "Function %s executed in %.2f seconds", func_name, duration, extra=extra
+            )
+            logger.info("Function %s completed", func_name, extra=extra)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper_log_function_call(*args, **kwargs):
+                logged = should_log()
+                if logged:
+                    log_start(args, kwargs)
+                start_time = time.perf_counter()
+                failed = True
+                try:
+                    result = await func(*args, **kwargs)
+                    failed = False
+                finally:
+                    duration = time.perf_counter() - start_time
+                    if aggregate:
+                        _record_function_call(qualified_name, duration, failed)
+                if logged:
+                    log_end(result, duration)
+                return result
 
-            logger.info(f"Function {func_name} executed in {duration:.2f} seconds")
-            logger.info(f"Function {func_name} completed")
+        else:
 
-            return result
+            @functools.wraps(func)
+            def wrapper_log_function_call(*args, **kwargs):
+                logged = should_log()
+                if logged:
+                    log_start(args, kwargs)
+                start_time = time.perf_counter()
+                failed = True
+                try:
+                    result = func(*args, **kwargs)
+                    failed = False
+                finally:
+                    duration = time.perf_counter() - start_time
+                    if aggregate:
+                        _record_function_call(qualified_name, duration, failed)
+                if logged:
+                    log_end(result, duration)
+                return result
 
         return wrapper_log_function_call
 
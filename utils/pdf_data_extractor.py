@@ -1,6 +1,6 @@
 import io
 
-from PyPDF2 import PdfFileReader
+from PyPDF2 import PdfReader
 
 # load logging
 from utils.ml_logging import get_logger
@@ -54,11 +54,8 @@ class PDFHelper:
         :return: Extracted text from the PDF as a string, or None if extraction fails.
         """
         try:
-            pdf_reader = PdfFileReader(file_stream)
-            text = []
-            for page_num in range(pdf_reader.getNumPages()):
-                page = pdf_reader.getPage(page_num)
-                text.append(page.extractText())
+            pdf_reader = PdfReader(file_stream)
+            text = [page.extract_text() for page in pdf_reader.pages]
 
             extracted_text = "\n".join(text)
             logger.info("Text extraction from PDF was successful.")
@@ -78,16 +75,16 @@ class PDFHelper:
         """
         try:
             with io.BytesIO(pdf_bytes) as pdf_stream:
-                pdf = PdfFileReader(pdf_stream)
-                information = pdf.getDocumentInfo()
-                number_of_pages = pdf.getNumPages()
+                pdf = PdfReader(pdf_stream)
+                information = pdf.metadata
+                number_of_pages = len(pdf.pages)
 
                 metadata = {
-                    "Author": information.author,
-                    "Creator": information.creator,
-                    "Producer": information.producer,
-                    "Subject": information.subject,
-                    "Title": information.title,
+                    "Author": getattr(information, "author", None),
+                    "Creator": getattr(information, "creator", None),
+                    "Producer": getattr(information, "producer", None),
+                    "Subject": getattr(information, "subject", None),
+                    "Title": getattr(information, "title", None),
                     "Number of pages": number_of_pages,
                 }
 
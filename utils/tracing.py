@@ -0,0 +1,280 @@
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterable, Iterator, List, Optional
+
+from utils.ml_logging import get_logger
+
+logger = get_logger()
+
+QUANTILES = (0.5, 0.95, 0.99)
+EXPORT_JSONL = "jsonl"
+EXPORT_PROMETHEUS = "prometheus"
+
+
+class LatencyHistogram:
+    """
+    Rolling latency statistics for one stage: the most recent samples for percentiles, plus lifetime
+    count and sum. Recording is an append to a bounded deque; percentiles are only computed on snapshot.
+    """
+
+    def __init__(self, window: int = 1024):
+        """
+        Parameters:
+        window (int): The number of most recent samples the percentiles are computed over.
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total_seconds = 0.0
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+        self.total_seconds += seconds
+
+    def snapshot(self) -> dict:
+        """
+        Computes the rolling percentiles.
+
+        Returns:
+        dict: count, sum_seconds and p50/p95/p99/max in seconds over the rolling window.
+        """
+        samples = sorted(self._samples)
+        snapshot = {"count": self.count, "sum_seconds": round(self.total_seconds, 6)}
+        for quantile in QUANTILES:
+            key = f"p{int(quantile * 100)}_seconds"
+            if samples:
+                index = min(int(quantile * len(samples)), len(samples) - 1)
+                snapshot[key] = round(samples[index], 6)
+            else:
+                snapshot[key] = None
+        snapshot["max_seconds"] = round(samples[-1], 6) if samples else None
+        return snapshot
+
+
+class Tracer:
+    """
+    Records latency spans per pipeline stage (e.g. stt, llm, tts) and per turn, keeps rolling
+    percentiles per stage, and can export them periodically as JSON lines or as a Prometheus text file.
+    Everything stays in process, so it works offline.
+    """
+
+    def __init__(self, name: str = "voice_loop", window: int = 1024):
+        """
+        Parameters:
+        name (str): The tracer name, used as the metric prefix.
+        window (int): The number of recent samples per stage used for percentiles.
+        """
+        self.name = name
+        self.window = window
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._turn_ids = itertools.count(1)
+        self._local = threading.local()
+        self._exporter: Optional[threading.Thread] = None
+        self._stop_export = threading.Event()
+
+    def record(self, stage: str, seconds: float):
+        """
+        Records one latency sample for a stage, and adds it to the current turn if one is open.
+
+        Parameters:
+        stage (str): The stage name.
+        seconds (float): The measured latency.
+        """
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram(self.window)
+            histogram.record(seconds)
+        spans = getattr(self._local, "spans", None)
+        if spans is not None:
+            spans[stage] = spans.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """
+        Times the enclosed block as one sample of a stage.
+
+        Parameters:
+        stage (str): The stage name.
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start_time)
+
+    def trace_iterator(self, stage: str, iterable: Iterable) -> Iterator:
+        """
+        Wraps a stream (e.g. streamed model tokens) and records the time to its first item as
+        "<stage>_first" and the time until it is exhausted as "<stage>".
+
+        Parameters:
+        stage (str): The stage name.
+        iterable (Iterable): The stream to wrap.
+
+        Yields:
+        The items of the stream, unchanged.
+        """
+        start_time = time.perf_counter()
+        first = True
+        try:
+            for item in iterable:
+                if first:
+                    self.record(f"{stage}_first", time.perf_counter() - start_time)
+                    first = False
+                yield item
+        finally:
+            self.record(stage, time.perf_counter() - start_time)
+
+    @contextmanager
+    def turn(self) -> Iterator[dict]:
+        """
+        Groups the spans recorded on this thread into one turn. The total turn time is recorded as the
+        "turn" stage, and the per-stage breakdown is logged when the turn ends.
+
+        Yields:
+        dict: The spans of the turn so far, by stage.
+        """
+        turn_id = next(self._turn_ids)
+        self._local.spans = spans = {}
+        start_time = time.perf_counter()
+        try:
+            yield spans
+        finally:
+            self._local.spans = None
+            total = time.perf_counter() - start_time
+            self.record("turn", total)
+            breakdown = ", ".join(
+                f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in spans.items()
+            )
+            logger.info(f"Turn {turn_id} took {total * 1000:.0f}ms: {breakdown}")
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Returns the rolling statistics of every stage.
+
+        Returns:
+        Dict[str, dict]: The histogram snapshot of each stage.
+        """
+        with self._lock:
+            return {
+                stage: histogram.snapshot()
+                for stage, histogram in self._histograms.items()
+            }
+
+    def write_jsonl(self, path: str):
+        """
+        Appends the current statistics to a JSON lines file, one line per export.
+
+        Parameters:
+        path (str): The output file.
+        """
+        record = {
+            "timestamp": time.time(),
+            "tracer": self.name,
+            "stages": self.snapshot(),
+        }
+        with open(path, "a", encoding="utf-8") as output:
+            output.write(json.dumps(record) + "\n")
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the current statistics in the Prometheus text exposition format, as summaries.
+
+        Returns:
+        str: The metrics text.
+        """
+        metric = f"{self.name}_stage_latency_seconds"
+        lines: List[str] = [
+            f"# HELP {metric} Latency of each {self.name} stage.",
+            f"# TYPE {metric} summary",
+        ]
+        for stage, snapshot in sorted(self.snapshot().items()):
+            for quantile in QUANTILES:
+                value = snapshot[f"p{int(quantile * 100)}_seconds"]
+                if value is not None:
+                    lines.append(
+                        f'{metric}{{stage="{stage}",quantile="{quantile}"}} {value}'
+                    )
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {snapshot["sum_seconds"]}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {snapshot["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """
+        Writes the current statistics to a Prometheus text file (e.g. for the node exporter textfile
+        collector). The file is replaced atomically.
+
+        Parameters:
+        path (str): The output file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as output:
+            output.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+    def export(self, path: str, export_format: str = EXPORT_JSONL):
+        """
+        Writes the current statistics in the given format.
+
+        Parameters:
+        path (str): The output file.
+        export_format (str): "jsonl" or "prometheus".
+        """
+        if export_format == EXPORT_JSONL:
+            self.write_jsonl(path)
+        elif export_format == EXPORT_PROMETHEUS:
+            self.write_prometheus(path)
+        else:
+            raise ValueError(f"Unknown export format: {export_format}")
+
+    def start_periodic_export(
+        self,
+        path: str,
+        interval_seconds: float = 60.0,
+        export_format: str = EXPORT_JSONL,
+    ):
+        """
+        Starts a daemon thread that exports the statistics every interval_seconds.
+
+        Parameters:
+        path (str): The output file.
+        interval_seconds (float): The time between exports.
+        export_format (str): "jsonl" or "prometheus".
+        """
+        if export_format not in (EXPORT_JSONL, EXPORT_PROMETHEUS):
+            raise ValueError(f"Unknown export format: {export_format}")
+        if self._exporter is not None:
+            self.stop_periodic_export()
+        self._stop_export.clear()
+
+        def export_periodically():
+            while not self._stop_export.wait(interval_seconds):
+                try:
+                    self.export(path, export_format)
+                except OSError as e:
+                    logger.warning(f"Could not export latency metrics to {path}: {e}")
+
+        self._exporter = threading.Thread(target=export_periodically, daemon=True)
+        self._exporter.start()
+
+    def stop_periodic_export(self):
+        """
+        Stops the periodic export thread.
+        """
+        if self._exporter is not None:
+            self._stop_export.set()
+            self._exporter.join()
+            self._exporter = None
+
+
+# Process-wide tracer for the voice loop
+tracer = Tracer()